@@ -1,14 +1,65 @@
 """
 Configuration for ML Service
 """
+import logging
 import os
+from functools import cached_property, lru_cache
+from typing import List
+
 import torch
 from pydantic_settings import BaseSettings
 
+logger = logging.getLogger(__name__)
+
 # Limit PyTorch CPU threads early (before any model creation)
 _torch_threads = int(os.getenv("TORCH_NUM_THREADS", "2"))
 torch.set_num_threads(_torch_threads)
 torch.set_num_interop_threads(1)
+# Input shapes are fixed per model (sequence_length × features), so cuDNN's
+# autotuner pays for itself after the first forward pass
+torch.backends.cudnn.benchmark = True
+# TF32 Tensor Core matmuls/convolutions on Ampere+ GPUs for the FP32 paths
+# (training, CPU-sized fallbacks); no effect on CPU or older GPUs. TF32 keeps
+# FP32's range with a 10-bit mantissa, well inside the noise of price models.
+if os.getenv("TORCH_ALLOW_TF32", "true").lower() == "true":
+    torch.set_float32_matmul_precision("high")
+    torch.backends.cudnn.allow_tf32 = True
+# Read by the caching allocator on first CUDA use. Predictors of different
+# sizes are loaded and evicted over the service's lifetime; expandable
+# segments let freed blocks be reused instead of fragmenting VRAM, and the GC
+# threshold reclaims unused cached blocks once 80 % of VRAM is reserved
+# instead of waiting for an allocation to fail first.
+os.environ.setdefault(
+    "PYTORCH_CUDA_ALLOC_CONF",
+    "expandable_segments:True,garbage_collection_threshold:0.8",
+)
+
+
+@lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """
+    Probe the CUDA runtime once per process. Deferred to first use so that
+    USE_CUDA=false deployments never pay for the driver probe.
+    """
+    return torch.cuda.is_available()
+
+
+@lru_cache(maxsize=1)
+def _cuda_device_properties() -> dict:
+    """
+    Static properties of CUDA device 0, queried once and then served from
+    memory so /health never goes through the CUDA runtime. A failing query
+    is cached as empty properties rather than failing every health check.
+    """
+    try:
+        return {
+            "cuda_device_name": torch.cuda.get_device_name(0),
+            "cuda_device_count": torch.cuda.device_count(),
+            "cuda_memory_total": f"{torch.cuda.get_device_properties(0).total_memory / 1e9:.2f} GB",
+        }
+    except Exception as e:
+        logger.warning(f"Could not query CUDA device properties: {e}")
+        return {}
 
 
 class Settings(BaseSettings):
@@ -23,16 +74,44 @@ class Settings(BaseSettings):
     # API settings
     api_prefix: str = "/api/ml"
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    # Comma-separated browser origins allowed by CORS ("*" = any), as in the backend
+    cors_origin: str = os.getenv("CORS_ORIGIN", "*")
     
     # Model settings
     model_dir: str = os.getenv("MODEL_DIR", "/app/models")
     sequence_length: int = int(os.getenv("SEQUENCE_LENGTH", "60"))
     forecast_days: int = int(os.getenv("FORECAST_DAYS", "14"))
+    # Store LSTM checkpoint weights as FP16 (inference autocasts on CUDA anyway)
+    checkpoint_fp16: bool = os.getenv("ML_CHECKPOINT_FP16", "true").lower() == "true"
+    # torch.compile predictor models for CUDA inference (first predict per shape compiles)
+    torch_compile: bool = os.getenv("ML_TORCH_COMPILE", "true").lower() == "true"
+    # ...with "inductor" (CUDA graphs) or "tensorrt" (FP16 engines, needs torch-tensorrt)
+    torch_compile_backend: str = os.getenv("ML_TORCH_COMPILE_BACKEND", "inductor")
+    # Max predictors kept in memory (LRU-evicted beyond this)
+    predictor_cache_size: int = int(os.getenv("ML_PREDICTOR_CACHE_SIZE", "16"))
+    # ...and at most this many MiB of model weights (0 = count limit only)
+    predictor_cache_max_mb: int = int(os.getenv("ML_PREDICTOR_CACHE_MAX_MB", "0"))
+    # Forecasts reused for identical (symbol, model type, candles) requests:
+    # how many / for how long in seconds (0 = never reused)
+    predict_cache_size: int = int(os.getenv("ML_PREDICT_CACHE_SIZE", "1024"))
+    predict_cache_ttl: float = float(os.getenv("ML_PREDICT_CACHE_TTL", "60"))
+    # Technical-indicator frames memoized by candle content (0 = off)
+    indicator_cache_size: int = int(os.getenv("ML_INDICATOR_CACHE_SIZE", "32"))
+    # Finished training jobs: how many / how long (seconds) their status is kept
+    training_status_max_jobs: int = int(os.getenv("ML_TRAINING_STATUS_MAX_JOBS", "1024"))
+    training_status_ttl: int = int(os.getenv("ML_TRAINING_STATUS_TTL", "86400"))
+    # Comma-separated symbols whose models are loaded and warmed up at startup
+    # ("*" = every checkpoint in MODEL_DIR, newest first, up to the cache size)
+    preload_models: str = os.getenv("ML_PRELOAD_MODELS", "")
     
     # Training settings
     epochs: int = int(os.getenv("EPOCHS", "100"))
     batch_size: int = int(os.getenv("BATCH_SIZE", "32"))
     learning_rate: float = float(os.getenv("LEARNING_RATE", "0.001"))
+    # Training jobs running at the same time; further jobs wait in "starting"
+    max_concurrent_trainings: int = int(os.getenv("ML_MAX_CONCURRENT_TRAININGS", "1"))
+    # Train in a dedicated spawned worker process instead of an API-process thread
+    training_subprocess: bool = os.getenv("ML_TRAINING_SUBPROCESS", "false").lower() == "true"
     
     # Default model type for new training ('lstm' or 'transformer')
     default_model_type: str = os.getenv("ML_DEFAULT_MODEL_TYPE", "lstm")
@@ -49,6 +128,21 @@ class Settings(BaseSettings):
     
     # FinBERT settings
     preload_finbert: bool = os.getenv("PRELOAD_FINBERT", "false").lower() == "true"
+    # Reduced-precision FinBERT: dynamic INT8 Linear layers on CPU, FP16 on CUDA
+    finbert_quantize: bool = os.getenv("FINBERT_QUANTIZE", "true").lower() == "true"
+    # Replay CUDA graphs for short FinBERT batches (<=128 tokens); captured when
+    # FinBERT is preloaded (PRELOAD_FINBERT or /api/ml/sentiment/load)
+    finbert_cuda_graphs: bool = os.getenv("FINBERT_CUDA_GRAPHS", "true").lower() == "true"
+    # Concurrent single-text requests are batched: up to this many texts...
+    finbert_microbatch_size: int = int(os.getenv("FINBERT_MICROBATCH_SIZE", "32"))
+    # ...collected for at most this long once an idle batcher gets a text
+    finbert_microbatch_wait_ms: float = float(os.getenv("FINBERT_MICROBATCH_WAIT_MS", "5"))
+    # Sentiment results memoized per normalized text
+    finbert_cache_size: int = int(os.getenv("FINBERT_CACHE_SIZE", "4096"))
+    # Answer short texts without any polarity cue as neutral, skipping FinBERT
+    finbert_neutral_prefilter: bool = os.getenv("FINBERT_NEUTRAL_PREFILTER", "false").lower() == "true"
+    # Classify on CPU with an INT8 ONNX Runtime export (needs onnxruntime + optimum)
+    finbert_onnx: bool = os.getenv("FINBERT_ONNX", "false").lower() == "true"
 
     # Cross-asset features
     use_cross_asset_features: bool = os.getenv("ML_CROSS_ASSET_FEATURES", "false").lower() == "true"
@@ -59,17 +153,32 @@ class Settings(BaseSettings):
     feature_selection_max_features: int = int(os.getenv("ML_MAX_FEATURES", "0"))  # 0 = auto
     feature_selection_correlation_threshold: float = float(os.getenv("ML_CORRELATION_THRESHOLD", "0.95"))
     
+    @property
+    def cors_origins(self) -> frozenset:
+        """CORS_ORIGIN as a set, so origin checks are a hash lookup"""
+        return frozenset(o.strip() for o in self.cors_origin.split(",") if o.strip())
+
+    @property
+    def preload_symbols(self) -> List[str]:
+        """ML_PRELOAD_MODELS as upper-case symbols, in the configured order"""
+        return [s.strip().upper() for s in self.preload_models.split(",") if s.strip()]
+
     @property
     def cuda_effective(self) -> bool:
         """Resolve USE_CUDA setting: auto -> detect, true/false -> explicit"""
         val = self.use_cuda.lower().strip()
         if val == "auto":
-            return torch.cuda.is_available()
+            return _cuda_available()
         return val == "true"
-    
+
     @property
+    def cuda_opted_out(self) -> bool:
+        """True when USE_CUDA=false, i.e. CUDA must not even be probed"""
+        return self.use_cuda.lower().strip() == "false"
+    
+    @cached_property
     def device(self) -> torch.device:
-        """Get the compute device (CUDA if available and enabled)"""
+        """Get the compute device (CUDA if available and enabled), resolved once"""
         if self.cuda_effective:
             return torch.device("cuda")
         return torch.device("cpu")
@@ -77,16 +186,15 @@ class Settings(BaseSettings):
     @property
     def device_info(self) -> dict:
         """Get device information"""
+        cuda_available = False if self.cuda_opted_out else _cuda_available()
         info = {
             "device": str(self.device),
-            "cuda_available": torch.cuda.is_available(),
+            "cuda_available": cuda_available,
             "cuda_enabled": self.cuda_effective,
             "cuda_mode": self.use_cuda,
         }
-        if torch.cuda.is_available():
-            info["cuda_device_name"] = torch.cuda.get_device_name(0)
-            info["cuda_device_count"] = torch.cuda.device_count()
-            info["cuda_memory_total"] = f"{torch.cuda.get_device_properties(0).total_memory / 1e9:.2f} GB"
+        if cuda_available:
+            info.update(_cuda_device_properties())
         return info
     
     class Config:
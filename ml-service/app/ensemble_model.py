@@ -13,9 +13,10 @@ LSTM and Transformer checkpoints.
 """
 
 import logging
-from typing import List, Optional
+from typing import Optional, Tuple
 
 from .model import StockPredictor
+from .ohlcv import OHLCVInput
 from .transformer_model import TransformerStockPredictor
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,9 @@ class EnsemblePredictor:
         self.lstm_predictor: Optional[StockPredictor] = None
         self.transformer_predictor: Optional[TransformerStockPredictor] = None
 
+        # (sub-model metadata dicts it was built from, merged metadata)
+        self._metadata_cache: Optional[Tuple[tuple, dict]] = None
+
     # ------------------------------------------------------------------
     # Properties
     # ------------------------------------------------------------------
@@ -55,20 +59,37 @@ class EnsemblePredictor:
         )
         return lstm_ok or transformer_ok
 
+    def _sub_metadata(self) -> tuple:
+        lstm_meta = (
+            self.lstm_predictor.model_metadata
+            if self.lstm_predictor and self.lstm_predictor.is_trained else None
+        )
+        transformer_meta = (
+            self.transformer_predictor.model_metadata
+            if self.transformer_predictor and self.transformer_predictor.is_trained else None
+        )
+        return lstm_meta, transformer_meta
+
     @property
     def model_metadata(self) -> dict:
         """Merged metadata from available sub-models."""
+        # Sub-models assign a fresh metadata dict on every train/load, so the
+        # merged view only needs rebuilding when one of those dicts changes.
+        sources = self._sub_metadata()
+        cached = self._metadata_cache
+        if cached is not None and all(a is b for a, b in zip(cached[0], sources)):
+            return dict(cached[1])
+
+        lstm_meta, transformer_meta = sources
         meta: dict = {"model_type": "ensemble", "symbol": self.symbol}
+        if lstm_meta is not None:
+            meta["lstm"] = lstm_meta
+        if transformer_meta is not None:
+            meta["transformer"] = transformer_meta
+        meta["ensemble_weights"] = self._compute_weights()
 
-        if self.lstm_predictor and self.lstm_predictor.is_trained:
-            meta["lstm"] = self.lstm_predictor.model_metadata
-
-        if self.transformer_predictor and self.transformer_predictor.is_trained:
-            meta["transformer"] = self.transformer_predictor.model_metadata
-
-        weights = self._compute_weights()
-        meta["ensemble_weights"] = weights
-        return meta
+        self._metadata_cache = (sources, meta)
+        return dict(meta)
 
     @property
     def device(self):
@@ -87,17 +108,23 @@ class EnsemblePredictor:
         """
         Try to load both LSTM and Transformer models from disk.
 
+        Sub-models that were already assigned (trained predictors shared with
+        the caller's cache) are kept instead of loading a second copy.
+
         Returns True when at least one model loaded successfully.
         *path* is ignored (models are always loaded from the default model
         directory based on the symbol).
         """
-        lstm_ok = False
-        transformer_ok = False
+        lstm_ok = self.lstm_predictor is not None and self.lstm_predictor.is_trained
+        transformer_ok = (
+            self.transformer_predictor is not None
+            and self.transformer_predictor.is_trained
+        )
 
         # LSTM
         try:
-            lstm = StockPredictor(self.symbol, use_cuda=self._use_cuda)
-            if lstm.load():
+            lstm = None if lstm_ok else StockPredictor(self.symbol, use_cuda=self._use_cuda)
+            if lstm is not None and lstm.load():
                 self.lstm_predictor = lstm
                 lstm_ok = True
                 logger.info(f"EnsemblePredictor: LSTM model loaded for {self.symbol}")
@@ -106,8 +133,11 @@ class EnsemblePredictor:
 
         # Transformer
         try:
-            transformer = TransformerStockPredictor(self.symbol, use_cuda=self._use_cuda)
-            if transformer.load():
+            transformer = (
+                None if transformer_ok
+                else TransformerStockPredictor(self.symbol, use_cuda=self._use_cuda)
+            )
+            if transformer is not None and transformer.load():
                 self.transformer_predictor = transformer
                 transformer_ok = True
                 logger.info(
@@ -173,7 +203,7 @@ class EnsemblePredictor:
     # Prediction
     # ------------------------------------------------------------------
 
-    def predict(self, ohlcv_data: List[dict]) -> dict:
+    def predict(self, ohlcv_data: OHLCVInput) -> dict:
         """
         Generate ensemble price predictions.
 
@@ -213,7 +243,8 @@ class EnsemblePredictor:
             return result
 
         # --- True ensemble path ---
-        weights = self._compute_weights()
+        model_info = self.model_metadata
+        weights = model_info["ensemble_weights"]
         lstm_weight = weights["lstm"]
         transformer_weight = weights["transformer"]
 
@@ -272,8 +303,8 @@ class EnsemblePredictor:
             "symbol": self.symbol,
             "current_price": current_price,
             "predictions": ensemble_predictions,
-            "model_info": self.model_metadata,
+            "model_info": model_info,
             "generated_at": lstm_result["generated_at"],
             "model_type": "ensemble",
-            "ensemble_weights": weights,
+            "ensemble_weights": dict(weights),
         }
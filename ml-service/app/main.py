@@ -9,76 +9,284 @@ Provides REST API endpoints for:
 - Health and status checks
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, StringConstraints, ValidationError
+from typing import TYPE_CHECKING, Annotated, List, Optional, Dict, Any, Union
 from datetime import datetime
 import asyncio
+import functools
+import logging
+import os
+import time
+import msgspec
+import numpy as np
+import orjson
 from contextlib import asynccontextmanager
+from functools import lru_cache
 
 from .config import settings
-from .model import StockPredictor
-from .transformer_model import TransformerStockPredictor
-from .ensemble_model import EnsemblePredictor
 from .drift_detector import DriftDetector
+from .warrant_pricing import (
+    CHAIN_FIELDS,
+    DEFAULT_EXPIRY_DAYS,
+    default_strikes,
+    implied_volatility,
+    price_warrant,
+    price_warrant_grids,
+    to_dict,
+)
+from .options_provider import fetch_options_chain
+from .prediction_cache import PredictionCache
+from .predictor_cache import PredictorCache
+from .ohlcv import (
+    MSGPACK_CONTENT_TYPE, OHLCVBatchBodyDecoder, OHLCVBodyDecoder, OHLCVInput, OHLCVRow,
+    synthetic_ohlcv,
+)
+from .training_events import TrainingEventBroker, TERMINAL_STATUSES
+from .training_status import TrainingStatusStore
+from .training_worker import TrainingProcess
 from . import sentiment as finbert
 from . import embeddings as rag_embeddings
 from . import vector_store as rag_store
 from . import news_features as rag_news_features
 
-# Store for active predictors (keyed by "SYMBOL" for LSTM, "SYMBOL_transformer" for Transformer)
-predictors: Dict[str, object] = {}  # StockPredictor | TransformerStockPredictor | EnsemblePredictor
-training_status: Dict[str, dict] = {}
+if TYPE_CHECKING:
+    from .ensemble_model import EnsemblePredictor
+
+# uvicorn only configures its own loggers; without a root handler the app's
+# INFO messages would be dropped
+logging.basicConfig(
+    level=logging.DEBUG if settings.debug else logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Repeated polls with an unchanged candle history reuse the last forecast
+prediction_cache = PredictionCache(
+    maxsize=settings.predict_cache_size, ttl=settings.predict_cache_ttl
+)
+# Store for active predictors, keyed "SYMBOL_modeltype" (e.g. "AAPL_lstm", "AAPL_transformer")
+predictors = PredictorCache(  # StockPredictor | TransformerStockPredictor | EnsemblePredictor
+    maxsize=settings.predictor_cache_size,
+    max_bytes=settings.predictor_cache_max_mb * 1024 ** 2,
+    on_discard=lambda key: prediction_cache.discard_symbol(key.rsplit("_", 1)[0]),
+)
+training_status = TrainingStatusStore(
+    maxsize=settings.training_status_max_jobs, ttl=settings.training_status_ttl
+)
+# Pushes training_status changes to /train/{symbol}/events subscribers
+training_events = TrainingEventBroker()
+
+# Trainings run in worker threads (or processes); this caps how many share the CPU/GPU at once
+_training_slots = asyncio.Semaphore(settings.max_concurrent_trainings)
+# Runs training jobs when ML_TRAINING_SUBPROCESS is set; started on first use
+training_process = TrainingProcess(max_workers=settings.max_concurrent_trainings)
 
 # Global concept drift detector
 drift_detector = DriftDetector()
 
 
+# The predictor modules pull in torch.nn, sklearn and the feature pipelines;
+# importing them on first use keeps worker start-up cheap for workers that
+# only serve sentiment, warrant or RAG requests.
+@lru_cache(maxsize=None)
+def _lstm_cls() -> type:
+    from .model import StockPredictor
+    return StockPredictor
+
+
+@lru_cache(maxsize=None)
+def _transformer_cls() -> type:
+    from .transformer_model import TransformerStockPredictor
+    return TransformerStockPredictor
+
+
+@lru_cache(maxsize=None)
+def _ensemble_cls() -> type:
+    from .ensemble_model import EnsemblePredictor
+    return EnsemblePredictor
+
+
+async def _preload_finbert() -> None:
+    if await asyncio.to_thread(finbert.preload_model):
+        logger.info("FinBERT model loaded successfully")
+    else:
+        logger.info("FinBERT model loading deferred (will load on first request)")
+
+
+# Checkpoint file name suffix per model type, as written by each predictor's save()
+_CHECKPOINT_SUFFIXES = {"lstm": "_model.pt", "transformer": "_transformer.pt"}
+
+
+def _checkpoint_path(symbol: str, model_type: str) -> str:
+    return os.path.join(settings.model_dir, symbol + _CHECKPOINT_SUFFIXES[model_type])
+
+
+def _checkpoint_symbols() -> List[str]:
+    """
+    Symbols with a checkpoint in the model directory, most recently trained
+    first, capped at the predictor cache size so preloading never evicts.
+    """
+    try:
+        entries = list(os.scandir(settings.model_dir))
+    except FileNotFoundError:
+        return []
+    newest: Dict[str, float] = {}
+    for entry in entries:
+        for suffix in _CHECKPOINT_SUFFIXES.values():
+            if entry.name.endswith(suffix) and entry.is_file():
+                symbol = entry.name[:-len(suffix)].upper()
+                newest[symbol] = max(newest.get(symbol, 0.0), entry.stat().st_mtime)
+    return sorted(newest, key=newest.get, reverse=True)[:predictors.maxsize]
+
+
+# torch.compile'd CUDA models compile on the first call per input shape and
+# record their CUDA graphs on the second; both belong in the warm-up
+_WARMUP_PREDICTIONS = 2
+
+
+async def _warm_predictor(symbol: str) -> None:
+    started = time.perf_counter()
+    try:
+        predictor, model_type = await _get_or_load_predictor(
+            symbol, None, ["ensemble", "transformer", "lstm"]
+        )
+        if predictor is None:
+            logger.warning("Preload: no trained model found for %s", symbol)
+            return
+        seq_len = _sequence_length(predictor, model_type)
+        # Rolling indicators (up to 50 candles) are dropped before windowing
+        data = synthetic_ohlcv(seq_len + 100)
+        async with predictors.inference_lock(symbol):
+            for _ in range(_WARMUP_PREDICTIONS):
+                await asyncio.to_thread(predictor.predict, data)
+        logger.info(
+            "Preload: %s (%s) warmed up in %.2fs", symbol, model_type, time.perf_counter() - started
+        )
+    except Exception as exc:
+        logger.warning("Preload: warm-up failed for %s: %s", symbol, exc)
+
+
+async def _warm_predictors(symbols: List[str]) -> None:
+    """
+    Load each symbol's predictor into the cache and run throwaway
+    predictions, so the first real request does not pay for checkpoint
+    loading, CUDA context creation, cuDNN autotuning and torch.compile.
+    ``*`` stands for every checkpoint in the model directory. Symbols load
+    concurrently.
+    """
+    if "*" in symbols:
+        found = await asyncio.to_thread(_checkpoint_symbols)
+        symbols = list(dict.fromkeys([s for s in symbols if s != "*"] + found))
+    await asyncio.gather(*map(_warm_predictor, symbols))
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
-    print(f"Starting {settings.service_name} v{settings.version}")
-    print(f"Device: {settings.device_info}")
+    logger.info("Starting %s v%s", settings.service_name, settings.version)
+    # device_info probes CUDA; under --reload lifespan reruns on every file change
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Device: %s", settings.device_info)
     
-    # Optionally preload FinBERT model
+    finbert.start_microbatching()
+
+    # Optionally preload FinBERT in the background so startup is not blocked;
+    # requests arriving earlier load it on demand, /health reports "loading"
+    preload_task = None
     if settings.preload_finbert:
-        print("Preloading FinBERT model...")
-        if finbert.preload_model():
-            print("FinBERT model loaded successfully")
-        else:
-            print("FinBERT model loading deferred (will load on first request)")
+        logger.info("Preloading FinBERT model in background...")
+        preload_task = asyncio.create_task(_preload_finbert())
+
+    warm_task = None
+    if settings.preload_symbols:
+        logger.info("Preloading models in background: %s", ", ".join(settings.preload_symbols))
+        warm_task = asyncio.create_task(_warm_predictors(settings.preload_symbols))
 
     # RAG stack: bootstrap Qdrant collections; embedder loads lazily on first /rag call
     try:
         rag_store.ensure_collections()
-        print(f"Qdrant ready: {rag_store.health()}")
+        logger.info("Qdrant ready: %s", rag_store.health())
     except Exception as exc:
-        print(f"Qdrant bootstrap failed (RAG endpoints will error until reachable): {exc}")
+        logger.warning("Qdrant bootstrap failed (RAG endpoints will error until reachable): %s", exc)
 
     yield
-    print("Shutting down ML Service")
+    for task in (preload_task, warm_task):
+        if task is not None and not task.done():
+            task.cancel()
+    await finbert.stop_microbatching()
+    training_process.shutdown()
+    logger.info("Shutting down ML Service")
+
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson (several times faster than stdlib json
+    on the large numeric payloads of /warrant/chain and batch sentiment).
+    Defined locally because FastAPI's own ORJSONResponse is deprecated.
+
+    Endpoints with large payloads return an instance directly: a returned
+    dict is first walked by FastAPI's pure-Python jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+class _CORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware with a fast path for requests without an Origin header:
+    the backend's server-to-server calls and health probes, i.e. almost all
+    traffic. Those only need the ``Vary: Origin`` header, appended as a raw
+    header instead of parsing request and response headers per request.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or any(name == b"origin" for name, _ in scope["headers"]):
+            await super().__call__(scope, receive, send)
+            return
+
+        async def send_with_vary(message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (b"vary", b"Origin")]
+            await send(message)
+
+        await self.app(scope, receive, send_with_vary)
 
 
 app = FastAPI(
     title="DayTrader ML Service",
     description="LSTM & Transformer stock price prediction and FinBERT sentiment analysis with CUDA acceleration",
     version=settings.version,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# CORS middleware
+# CORS middleware: only the methods/headers this API uses, and a day-long
+# preflight cache so browsers do not send an OPTIONS round trip before every call
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
+    _CORSMiddleware,
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=("GET", "POST", "DELETE"),
+    allow_headers=("content-type", "authorization"),
+    max_age=86400,
 )
 
 
 # ============== Pydantic Models ==============
 
+# Symbols are canonicalized (upper-cased) once while the body is validated,
+# so handlers and everything below them use request.symbol as-is
+Symbol = Annotated[str, StringConstraints(to_upper=True)]
+
+
 class OHLCVData(BaseModel):
     """Single OHLCV data point"""
     timestamp: int = Field(..., description="Unix timestamp in milliseconds")
@@ -89,10 +297,9 @@ class OHLCVData(BaseModel):
     volume: float
 
 
-class TrainRequest(BaseModel):
-    """Request to train a model"""
-    symbol: str = Field(..., description="Stock symbol (e.g., AAPL)")
-    data: List[OHLCVData] = Field(..., description="Historical OHLCV data")
+class TrainParams(BaseModel):
+    """Scalar fields of a training request (``data`` is decoded separately)"""
+    symbol: Symbol = Field(..., description="Stock symbol (e.g., AAPL)")
     epochs: Optional[int] = Field(None, description="Training epochs")
     learning_rate: Optional[float] = Field(None, description="Learning rate")
     sequence_length: Optional[int] = Field(None, description="Sequence length for LSTM input")
@@ -104,13 +311,93 @@ class TrainRequest(BaseModel):
     use_walk_forward: Optional[bool] = Field(True, description="3-fold purged walk-forward CV (default True). Applies to both LSTM and Transformer since parity sprint.")
 
 
-class PredictRequest(BaseModel):
-    """Request for price prediction"""
-    symbol: str = Field(..., description="Stock symbol")
-    data: List[OHLCVData] = Field(..., description="Recent OHLCV data")
+class TrainRequest(TrainParams):
+    """Request to train a model"""
+    data: List[Union[OHLCVData, OHLCVRow]] = Field(
+        ..., description="Historical OHLCV data (objects or [timestamp, open, high, low, close, volume] rows)"
+    )
+
+
+class PredictParams(BaseModel):
+    """Scalar fields of a prediction request (``data`` is decoded separately)"""
+    symbol: Symbol = Field(..., description="Stock symbol")
     model_type: Optional[str] = Field(None, description="Model type: 'lstm' or 'transformer' (auto-detect if not specified)")
 
 
+class PredictRequest(PredictParams):
+    """Request for price prediction"""
+    data: List[Union[OHLCVData, OHLCVRow]] = Field(
+        ..., description="Recent OHLCV data (objects or [timestamp, open, high, low, close, volume] rows)"
+    )
+
+
+# Each symbol has its own model, so a batch is one predict() per entry; the
+# cap keeps a single request from occupying every worker thread.
+_PREDICT_BATCH_MAX = 64
+
+
+class PredictBatchParams(BaseModel):
+    """Scalar fields of a batch prediction request (``data`` is decoded separately)"""
+    requests: List[PredictParams] = Field(..., min_length=1, max_length=_PREDICT_BATCH_MAX)
+
+
+class PredictBatchRequest(BaseModel):
+    """Request for price predictions on several symbols"""
+    requests: List[PredictRequest] = Field(
+        ..., min_length=1, max_length=_PREDICT_BATCH_MAX,
+        description="One prediction request per symbol",
+    )
+
+
+_train_body = OHLCVBodyDecoder(TrainParams.model_fields)
+_predict_body = OHLCVBodyDecoder(PredictParams.model_fields)
+_predict_batch_body = OHLCVBatchBodyDecoder(PredictParams.model_fields)
+
+
+def _inline_body_schema(model: type) -> dict:
+    """
+    OpenAPI ``requestBody`` for endpoints that read the raw body themselves,
+    with nested model references inlined so the docs stay self-contained.
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {k: resolve(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [resolve(v) for v in node]
+        return node
+
+    body = {"schema": resolve(schema)}
+    return {"requestBody": {"required": True, "content": {
+        "application/json": body, MSGPACK_CONTENT_TYPE: body,
+    }}}
+
+
+async def _parse_ohlcv_request(http_request: Request, params_model: type, decoder):
+    """
+    Decode the JSON or MessagePack body in one msgspec pass (``data``
+    straight into an (N, 6) array, or whatever ``decoder`` returns), then
+    validate the scalar fields with pydantic. Returns (params, data).
+    """
+    content_type = http_request.headers.get("content-type", "")
+    msgpack = content_type.split(";", 1)[0].strip().lower() == MSGPACK_CONTENT_TYPE
+    try:
+        fields, data = decoder.decode(await http_request.body(), msgpack=msgpack)
+    except msgspec.DecodeError as exc:
+        raise HTTPException(status_code=422, detail=f"Invalid OHLCV data: {exc}")
+    try:
+        params = params_model.model_validate(fields)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)]
+        )
+    return params, data
+
+
 class PredictionResult(BaseModel):
     """Single prediction result"""
     date: str
@@ -191,108 +478,195 @@ class SentimentBatchResponse(BaseModel):
 
 # ============== Endpoints ==============
 
-@app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint"""
+# Orchestrator probes hit /health many times per second; the payload is
+# rebuilt and rendered at most once per _HEALTH_TTL_S. Returning a Response
+# also skips the per-request response_model validation and encoding.
+_HEALTH_TTL_S = 1.0
+_health_cache: Dict[str, Any] = {"body": b"", "expires": 0.0}
+
+
+@functools.lru_cache(maxsize=1)
+def _health_base() -> Dict[str, Any]:
+    """The /health fields fixed for the process lifetime, device_info included."""
     return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
         "version": settings.version,
         "commit": settings.commit,
         "build_time": settings.build_time,
         "device_info": settings.device_info,
-        "finbert_status": finbert.get_model_status()
     }
 
 
-@app.get("/api/ml/version")
-async def get_version():
-    """Get service version and build info"""
-    return {
+def _json_response(body: bytes) -> Response:
+    return Response(body, media_type="application/json")
+
+
+@app.get("/health", response_model=HealthResponse)
+async def health_check():
+    """Health check endpoint"""
+    now = time.monotonic()
+    if now >= _health_cache["expires"]:
+        payload = {
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            **_health_base(),
+            "finbert_status": finbert.get_model_status(),
+        }
+        _health_cache["body"] = orjson.dumps(payload, option=_ORJSON_OPTIONS)
+        _health_cache["expires"] = now + _HEALTH_TTL_S
+    return _json_response(_health_cache["body"])
+
+
+@lru_cache(maxsize=1)
+def _version_body() -> bytes:
+    # Build info and device never change while the process runs
+    return orjson.dumps({
         "service": settings.service_name,
         "version": settings.version,
         "commit": settings.commit,
         "build_time": settings.build_time,
         "device": settings.device_info
-    }
+    })
+
+
+@app.get("/api/ml/version")
+async def get_version():
+    """Get service version and build info"""
+    return _json_response(_version_body())
+
+
+# (predictors.version, summary) of the last /api/ml/models response
+_models_summary_cache: Optional[tuple] = None
 
 
 @app.get("/api/ml/models")
 async def list_models():
     """List all loaded models (both LSTM and Transformer)"""
-    models = []
-    seen = set()
-    
-    for key, pred in predictors.items():
-        symbol = pred.symbol.upper()
-        model_type = getattr(pred, 'model_type', 'lstm')
-        entry_id = f"{symbol}_{model_type}"
-        if entry_id not in seen:
-            seen.add(entry_id)
-            models.append({
-                "symbol": symbol,
-                "model_type": model_type,
-                "is_trained": pred.is_trained,
-                "metadata": pred.model_metadata if pred.is_trained else None
-            })
+    global _models_summary_cache
+    # Cached predictors are never retrained in place (training caches a new
+    # instance), so the summary only changes when the cached set does.
+    if _models_summary_cache is not None and _models_summary_cache[0] == predictors.version:
+        return {"models": _models_summary_cache[1]}
+
+    # Cache keys are unique per (symbol, model_type), so no dedup is needed
+    models = [
+        {
+            "symbol": pred.symbol.upper(),
+            "model_type": key.rpartition("_")[2],
+            "is_trained": pred.is_trained,
+            "metadata": pred.model_metadata if pred.is_trained else None
+        }
+        for key, pred in predictors.items()
+    ]
     
+    _models_summary_cache = (predictors.version, models)
     return {"models": models}
 
 
 def _get_predictor_key(symbol: str, model_type: str) -> str:
-    """Get cache key for a predictor."""
-    symbol = symbol.upper()
-    if model_type == "transformer":
-        return f"{symbol}_transformer"
-    elif model_type == "ensemble":
-        return f"{symbol}_ensemble"
-    return symbol
+    """
+    Predictor cache and training-status key, e.g. ``AAPL_lstm``.
 
+    Endpoints upper-case the symbol once on entry; everything below them,
+    including this key, takes the canonical symbol as given.
+    """
+    return f"{symbol}_{model_type}"
 
-def _try_load_predictor(symbol: str, model_type: Optional[str] = None):
-    """Try to load a predictor from disk. Returns (predictor, model_type) or (None, None)."""
-    symbol = symbol.upper()
+
+def _find_status_key(symbol: str, model_type: str) -> Optional[str]:
+    """Training-status key for ``model_type``, falling back to the LSTM job."""
+    for mt in (model_type, "lstm"):
+        key = _get_predictor_key(symbol, mt)
+        if key in training_status:
+            return key
+    return None
+
+
+def _new_ensemble(symbol: str) -> "EnsemblePredictor":
+    """
+    EnsemblePredictor that shares already-cached LSTM/Transformer predictors
+    instead of loading a second copy of their weights onto the device.
+    """
+    ens = _ensemble_cls()(symbol)
+    lstm = predictors.get(_get_predictor_key(symbol, "lstm"))
+    if isinstance(lstm, _lstm_cls()) and lstm.is_trained:
+        ens.lstm_predictor = lstm
+    transformer = predictors.get(_get_predictor_key(symbol, "transformer"))
+    if isinstance(transformer, _transformer_cls()) and transformer.is_trained:
+        ens.transformer_predictor = transformer
+    return ens
+
+
+async def _refresh_ensemble(symbol: str, retrained: str) -> None:
+    """
+    Re-cache ``symbol``'s ensemble around its freshly ``retrained`` sub-model.
+
+    A cached ensemble would keep serving (and pinning) the replaced sub-model,
+    and merely dropping it would let auto-detect fall through to the single
+    retrained model while both checkpoints are still on disk.
+    """
+    ensemble_key = _get_predictor_key(symbol, "ensemble")
+    async with predictors.lock(symbol):
+        old = predictors.get(ensemble_key)
+        cached = old is not None
+        if not cached and not all(
+            os.path.exists(_checkpoint_path(symbol, mt)) for mt in _CHECKPOINT_SUFFIXES
+        ):
+            return
+        ens = _new_ensemble(symbol)
+        # Keep the untouched sub-model instead of loading its weights again
+        if cached and retrained != "transformer" and ens.transformer_predictor is None:
+            ens.transformer_predictor = old.transformer_predictor
+        if cached and retrained != "lstm" and ens.lstm_predictor is None:
+            ens.lstm_predictor = old.lstm_predictor
+        del old
+        if await asyncio.to_thread(ens.load):
+            predictors[ensemble_key] = ens
+        elif cached:
+            del predictors[ensemble_key]
+
+
+def _try_load_predictor(symbol: str, model_type: Optional[str], ens: "EnsemblePredictor"):
+    """
+    Try to load a predictor from disk. Returns (predictor, model_type) or (None, None).
+
+    Runs in a worker thread, so it never touches the predictor cache; ``ens``
+    is the (unloaded) ensemble built by :func:`_new_ensemble` on the event loop.
+    """
 
     def _safe_load(pred, detected: str):
         try:
             if pred.load():
                 return pred, detected
         except Exception as exc:
-            print(f"Model load failed for {symbol} ({detected}): {exc}")
+            logger.warning("Model load failed for %s (%s): %s", symbol, detected, exc)
         return None, None
 
     # If ensemble explicitly requested, try to build one
     if model_type == "ensemble":
-        ens = EnsemblePredictor(symbol)
         if ens.load():
             return ens, "ensemble"
         return None, None
 
     # If specific type requested, try that first
     if model_type == "transformer":
-        pred = TransformerStockPredictor(symbol)
+        pred = _transformer_cls()(symbol)
         return _safe_load(pred, "transformer")
     elif model_type == "lstm":
-        pred = StockPredictor(symbol)
+        pred = _lstm_cls()(symbol)
         return _safe_load(pred, "lstm")
 
     # Auto-detect: check whether both models exist → prefer ensemble
-    import os
-    lstm_path = os.path.join(settings.model_dir, f"{symbol}_model.pt")
-    transformer_path = os.path.join(settings.model_dir, f"{symbol}_transformer.pt")
-
-    if os.path.exists(lstm_path) and os.path.exists(transformer_path):
-        ens = EnsemblePredictor(symbol)
+    if all(os.path.exists(_checkpoint_path(symbol, mt)) for mt in _CHECKPOINT_SUFFIXES):
         if ens.load():
             return ens, "ensemble"
 
     # Fall back to single-model preference (transformer > lstm)
-    pred_t = TransformerStockPredictor(symbol)
+    pred_t = _transformer_cls()(symbol)
     loaded_pred, loaded_type = _safe_load(pred_t, "transformer")
     if loaded_pred:
         return loaded_pred, loaded_type
 
-    pred_l = StockPredictor(symbol)
+    pred_l = _lstm_cls()(symbol)
     loaded_pred, loaded_type = _safe_load(pred_l, "lstm")
     if loaded_pred:
         return loaded_pred, loaded_type
@@ -300,45 +674,49 @@ def _try_load_predictor(symbol: str, model_type: Optional[str] = None):
     return None, None
 
 
+def _lookup_cached_predictor(symbol: str, model_type: Optional[str], auto_order: List[str]):
+    """Return (predictor, model_type) of a trained cached predictor, or (None, None)."""
+    for mt in [model_type] if model_type else auto_order:
+        pred = predictors.get(_get_predictor_key(symbol, mt))
+        if pred is not None and pred.is_trained:
+            return pred, mt
+    return None, None
+
+
+async def _get_or_load_predictor(symbol: str, model_type: Optional[str], auto_order: List[str]):
+    """
+    Return (predictor, model_type) from the cache, loading from disk on a miss.
+    The per-symbol lock makes concurrent first requests share a single load.
+    """
+    pred, detected_type = _lookup_cached_predictor(symbol, model_type, auto_order)
+    if pred:
+        return pred, detected_type
+
+    async with predictors.lock(symbol):
+        # Another request may have finished loading while we waited
+        pred, detected_type = _lookup_cached_predictor(symbol, model_type, auto_order)
+        if pred:
+            return pred, detected_type
+
+        # torch.load is blocking disk I/O plus unpickling; keep the loop responsive
+        pred, detected_type = await asyncio.to_thread(
+            _try_load_predictor, symbol, model_type, _new_ensemble(symbol)
+        )
+        if pred:
+            predictors[_get_predictor_key(symbol, detected_type)] = pred
+        return pred, detected_type
+
+
 @app.get("/api/ml/models/{symbol}")
 async def get_model_info(symbol: str, model_type: Optional[str] = None):
     """Get info about a specific model. Tries transformer first, then LSTM."""
     symbol = symbol.upper()
-    
-    # Check cache first
-    if model_type:
-        key = _get_predictor_key(symbol, model_type)
-        if key in predictors:
-            pred = predictors[key]
-            return {
-                "symbol": symbol,
-                "model_type": getattr(pred, 'model_type', 'lstm'),
-                "is_trained": pred.is_trained,
-                "metadata": pred.model_metadata,
-                "device": str(pred.device)
-            }
-    else:
-        # Try transformer key first, then lstm key
-        for mt in ["transformer", "lstm"]:
-            key = _get_predictor_key(symbol, mt)
-            if key in predictors and predictors[key].is_trained:
-                pred = predictors[key]
-                return {
-                    "symbol": symbol,
-                    "model_type": getattr(pred, 'model_type', 'lstm'),
-                    "is_trained": pred.is_trained,
-                    "metadata": pred.model_metadata,
-                    "device": str(pred.device)
-                }
-    
-    # Try to load from disk
-    pred, detected_type = _try_load_predictor(symbol, model_type)
+
+    pred, detected_type = await _get_or_load_predictor(symbol, model_type, ["transformer", "lstm"])
     if pred:
-        key = _get_predictor_key(symbol, detected_type)
-        predictors[key] = pred
         return {
             "symbol": symbol,
-            "model_type": detected_type,
+            "model_type": getattr(pred, 'model_type', detected_type),
             "is_trained": pred.is_trained,
             "metadata": pred.model_metadata,
             "device": str(pred.device)
@@ -349,7 +727,7 @@ async def get_model_info(symbol: str, model_type: Optional[str] = None):
 
 async def train_model_background(
     symbol: str, 
-    data: List[dict], 
+    data: OHLCVInput, 
     epochs: int, 
     learning_rate: float,
     sequence_length: int,
@@ -361,96 +739,140 @@ async def train_model_background(
     use_walk_forward: bool = True,
 ):
     """Background task for model training (LSTM or Transformer)"""
-    status_key = f"{symbol}_{model_type}" if model_type == "transformer" else symbol
+    status_key = _get_predictor_key(symbol, model_type)
+    if _training_slots.locked() and status_key in training_status:
+        training_status[status_key]["message"] = (
+            f"{model_type.upper()} training queued, waiting for a free training slot "
+            f"(max {settings.max_concurrent_trainings} concurrent)"
+        )
+        training_events.publish(status_key, training_status[status_key])
+
+    async with _training_slots:
+        await _run_training(
+            status_key, symbol, data, epochs, learning_rate, sequence_length, forecast_days,
+            use_cuda, model_type, use_cross_asset_features, use_feature_selection, use_walk_forward,
+        )
+
+
+async def _run_training(
+    status_key: str,
+    symbol: str,
+    data: OHLCVInput,
+    epochs: int,
+    learning_rate: float,
+    sequence_length: int,
+    forecast_days: int,
+    use_cuda: Optional[bool],
+    model_type: str,
+    use_cross_asset_features: bool,
+    use_feature_selection: bool,
+    use_walk_forward: bool,
+):
+    status = training_status.update(status_key, {
+        "status": "training",
+        "progress": 0,
+        "model_type": model_type,
+        "message": f"Initializing {model_type.upper()} training...",
+        "result": None,
+    })
+    training_events.publish(status_key, status)
     try:
-        training_status[status_key] = {
-            "status": "training",
-            "progress": 0,
-            "model_type": model_type,
-            "message": f"Initializing {model_type.upper()} training..."
-        }
-        
         # Create predictor based on model_type
-        if model_type == "transformer":
-            predictor = TransformerStockPredictor(
-                symbol,
-                use_cuda=use_cuda,
-                use_cross_asset_features=use_cross_asset_features,
-                use_feature_selection=use_feature_selection,
-            )
-        else:
-            predictor = StockPredictor(
-                symbol,
-                use_cuda=use_cuda,
-                use_cross_asset_features=use_cross_asset_features,
-                use_feature_selection=use_feature_selection,
-            )
-        
-        # Convert data
-        ohlcv_data = [d for d in data]
+        predictor_kwargs = dict(
+            use_cuda=use_cuda,
+            use_cross_asset_features=use_cross_asset_features,
+            use_feature_selection=use_feature_selection,
+        )
+        predictor_cls = _transformer_cls() if model_type == "transformer" else _lstm_cls()
+        predictor = predictor_cls(symbol, **predictor_kwargs)
         
-        training_status[status_key]["message"] = f"Preparing data ({model_type.upper()}, device: {predictor.device})..."
-        training_status[status_key]["progress"] = 10
+        status.update(
+            progress=10,
+            message=f"Preparing data ({model_type.upper()}, device: {predictor.device})...",
+        )
+        training_events.publish(status_key, status)
         
-        # Progress callback to update training_status with epoch-level data
+        # Runs in the training (or progress drain) thread: mutate the status dict only, never the store
         def on_progress(epoch, total_epochs, train_loss, val_loss):
             # Map epoch progress to 10-90% range (10% = data prep, 90% = saving)
-            pct = 10 + int((epoch / total_epochs) * 80)
-            training_status[status_key]["progress"] = pct
-            training_status[status_key]["message"] = (
-                f"{model_type.upper()} Epoch {epoch}/{total_epochs} — "
-                f"Train Loss: {train_loss:.6f}, Val Loss: {val_loss:.6f}"
+            status.update(
+                progress=10 + int((epoch / total_epochs) * 80),
+                message=(
+                    f"{model_type.upper()} Epoch {epoch}/{total_epochs} — "
+                    f"Train Loss: {train_loss:.6f}, Val Loss: {val_loss:.6f}"
+                ),
             )
+            training_events.publish(status_key, status)
         
         train_kwargs = dict(
             epochs=epochs,
             learning_rate=learning_rate,
             sequence_length=sequence_length,
             forecast_days=forecast_days,
-            progress_callback=on_progress,
         )
         # Walk-forward CV now supported by both architectures — parity lock.
         train_kwargs["use_walk_forward"] = use_walk_forward
 
-        result = predictor.train(ohlcv_data, **train_kwargs)
-        
-        training_status[status_key]["progress"] = 90
-        training_status[status_key]["message"] = "Saving model..."
-        
-        # Save model
-        predictor.save()
+        if settings.training_subprocess:
+            # The worker process trains and saves; this process only loads the checkpoint
+            result = await training_process.run(
+                status_key, model_type, symbol, data, predictor_kwargs, train_kwargs, on_progress
+            )
+            if not await asyncio.to_thread(predictor.load):
+                raise RuntimeError(f"{model_type.upper()} model was trained but could not be loaded")
+        else:
+            # Worker thread keeps the event loop free to serve requests and stream progress
+            result = await asyncio.to_thread(
+                predictor.train, data, progress_callback=on_progress, **train_kwargs
+            )
+            
+            status.update(progress=90, message="Saving model...")
+            training_events.publish(status_key, status)
+            
+            # Save model
+            await asyncio.to_thread(predictor.save)
         
         # Store predictor with appropriate key
         cache_key = _get_predictor_key(symbol, model_type)
         predictors[cache_key] = predictor
+        await _refresh_ensemble(symbol, model_type)
         
-        training_status[status_key] = {
+        training_status.update(status_key, {
             "status": "completed",
             "progress": 100,
-            "model_type": model_type,
             "message": f"{model_type.upper()} training completed successfully",
-            "result": result
-        }
+            "result": result,
+        })
         
     except Exception as e:
-        training_status[status_key] = {
+        training_status.update(status_key, {
             "status": "failed",
             "progress": 0,
-            "model_type": model_type,
             "message": str(e),
-            "result": None
-        }
+            "result": None,
+        })
+    finally:
+        # A cancelled task would otherwise leave the job "training" and block retraining with 409
+        if status.get("status") not in TERMINAL_STATUSES:
+            training_status.update(status_key, {
+                "status": "failed",
+                "progress": 0,
+                "message": f"{model_type.upper()} training was cancelled",
+                "result": None,
+            })
+        training_events.publish(status_key, training_status.get(status_key, status))
 
 
-@app.post("/api/ml/train")
-async def train_model(request: TrainRequest, background_tasks: BackgroundTasks):
+@app.post("/api/ml/train", openapi_extra=_inline_body_schema(TrainRequest))
+async def train_model(http_request: Request, background_tasks: BackgroundTasks):
     """
     Train a model on historical data
     
     Training happens in the background. Use /api/ml/train/{symbol}/status
     to check progress.
     """
-    symbol = request.symbol.upper()
+    request, data = await _parse_ohlcv_request(http_request, TrainParams, _train_body)
+    symbol = request.symbol
     model_type = (request.model_type or settings.default_model_type).lower()
     if model_type not in ("lstm", "transformer"):
         if model_type == "ensemble":
@@ -470,23 +892,21 @@ async def train_model(request: TrainRequest, background_tasks: BackgroundTasks):
     
     # Validate data
     min_data_points = seq_length + fc_days + 50
-    if len(request.data) < min_data_points:
+    if len(data) < min_data_points:
         raise HTTPException(
             status_code=400,
             detail=f"Need at least {min_data_points} data points for training (sequence_length={seq_length}, forecast_days={fc_days})"
         )
     
     # Check if already training (check both symbol-only and symbol_type keys)
-    status_key = f"{symbol}_{model_type}" if model_type == "transformer" else symbol
-    if status_key in training_status and training_status[status_key].get("status") == "training":
+    status_key = _get_predictor_key(symbol, model_type)
+    # "starting" jobs may now sit in the queue for a training slot
+    if status_key in training_status and training_status[status_key].get("status") in ("starting", "training"):
         raise HTTPException(
             status_code=409,
             detail=f"{model_type.upper()} training already in progress for {symbol}"
         )
-    
-    # Convert to dict format
-    data = [d.model_dump() for d in request.data]
-    
+        
     # Determine CUDA usage
     use_cuda = request.use_cuda
     device_info = "cuda" if use_cuda else ("cpu" if use_cuda is False else "auto")
@@ -523,14 +943,17 @@ async def train_model(request: TrainRequest, background_tasks: BackgroundTasks):
     training_status[status_key] = {
         "status": "starting",
         "progress": 0,
+        "symbol": symbol,
         "model_type": model_type,
         "message": f"{model_type.upper()} training job queued (epochs={request.epochs or settings.epochs}, seq_len={seq_length}, forecast={fc_days}, device={device_info})"
     }
+    training_events.publish(status_key, training_status[status_key])
     
     return {
         "message": f"{model_type.upper()} training started for {symbol}",
         "model_type": model_type,
-        "status_url": f"/api/ml/train/{symbol}/status?model_type={model_type}"
+        "status_url": f"/api/ml/train/{symbol}/status?model_type={model_type}",
+        "events_url": f"/api/ml/train/{symbol}/events?model_type={model_type}"
     }
 
 
@@ -540,56 +963,83 @@ async def get_training_status(symbol: str, model_type: Optional[str] = None):
     symbol = symbol.upper()
     mt = (model_type or settings.default_model_type).lower()
     
-    # Try specific key first, then fallback to symbol-only key
-    status_key = f"{symbol}_{mt}" if mt == "transformer" else symbol
-    if status_key in training_status:
-        status = training_status[status_key]
-        return {"symbol": symbol, **status}
-    
-    # Fallback: try symbol-only key
-    if symbol in training_status:
-        status = training_status[symbol]
-        return {"symbol": symbol, **status}
+    # Polled every few seconds per job while training: a pure store read
+    # rendered straight to JSON, without a TrainStatusResponse round trip
+    status = training_status.get(_find_status_key(symbol, mt))
+    if status is not None:
+        return ORJSONResponse({"symbol": symbol, **status})
     
     raise HTTPException(status_code=404, detail=f"No training job found for {symbol}")
 
 
-@app.post("/api/ml/predict", response_model=PredictResponse)
-async def predict(request: PredictRequest):
+# Comment line sent on idle streams so proxies do not close the connection
+_SSE_KEEPALIVE_S = 15.0
+
+
+def _sse_event(symbol: str, status: dict) -> bytes:
+    return b"data: " + orjson.dumps({"symbol": symbol, **status}, option=_ORJSON_OPTIONS) + b"\n\n"
+
+
+async def _training_event_stream(symbol: str, status_key: str):
+    """Yield the current status, then every update until the job finishes."""
+    queue = training_events.subscribe(status_key)
+    try:
+        status = training_status.get(status_key)
+        while True:
+            if status is not None:
+                yield _sse_event(symbol, status)
+                if status.get("status") in TERMINAL_STATUSES:
+                    return
+            try:
+                status = await asyncio.wait_for(queue.get(), _SSE_KEEPALIVE_S)
+            except asyncio.TimeoutError:
+                status = None
+                yield b": keep-alive\n\n"
+    finally:
+        training_events.unsubscribe(status_key, queue)
+
+
+@app.get("/api/ml/train/{symbol}/events")
+async def stream_training_status(symbol: str, model_type: Optional[str] = None):
     """
-    Generate price predictions for a symbol.
-    
-    Supports both LSTM and Transformer models.
-    If model_type is not specified, auto-detects (prefers Transformer).
+    Stream training status as Server-Sent Events.
+
+    Emits the same payload as ``/api/ml/train/{symbol}/status`` on every
+    progress update and closes once the job has completed or failed, so
+    clients no longer need to poll.
     """
-    symbol = request.symbol.upper()
+    symbol = symbol.upper()
+    mt = (model_type or settings.default_model_type).lower()
+
+    status_key = _find_status_key(symbol, mt)
+    if status_key is None:
+        raise HTTPException(status_code=404, detail=f"No training job found for {symbol}")
+
+    return StreamingResponse(
+        _training_event_stream(symbol, status_key),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sequence_length(predictor, model_type: str) -> int:
+    """Input window of a predictor (for ensemble, from the LSTM sub-model metadata)."""
+    if model_type == "ensemble":
+        lstm_meta = predictor.model_metadata.get("lstm", {})
+        transformer_meta = predictor.model_metadata.get("transformer", {})
+        return lstm_meta.get("sequence_length") or transformer_meta.get("sequence_length") or settings.sequence_length
+    return predictor.model_metadata.get('sequence_length', settings.sequence_length)
+
+
+async def _predict_symbol(request: PredictParams, data: OHLCVInput) -> dict:
+    """Prediction for one symbol in the PredictResponse shape; raises HTTPException."""
+    symbol = request.symbol
     model_type = (request.model_type or "").lower() or None  # None = auto-detect
     
-    # Get or load predictor
-    predictor = None
-    detected_type = model_type
-    
-    # Check cache
-    if model_type:
-        key = _get_predictor_key(symbol, model_type)
-        if key in predictors and predictors[key].is_trained:
-            predictor = predictors[key]
-            detected_type = model_type
-    else:
-        # Auto-detect from cache (prefer ensemble if both are cached, then transformer, then lstm)
-        for mt in ["ensemble", "transformer", "lstm"]:
-            key = _get_predictor_key(symbol, mt)
-            if key in predictors and predictors[key].is_trained:
-                predictor = predictors[key]
-                detected_type = mt
-                break
-    
-    # If not cached, try loading from disk
-    if not predictor:
-        predictor, detected_type = _try_load_predictor(symbol, model_type)
-        if predictor:
-            key = _get_predictor_key(symbol, detected_type)
-            predictors[key] = predictor
+    # Get or load predictor (auto-detect prefers ensemble, then transformer, then lstm)
+    predictor, detected_type = await _get_or_load_predictor(
+        symbol, model_type, ["ensemble", "transformer", "lstm"]
+    )
     
     if not predictor:
         raise HTTPException(
@@ -606,26 +1056,27 @@ async def predict(request: PredictRequest):
             detail=f"Model mismatch: loaded model is for {predictor.model_metadata.get('symbol')}, not {symbol}"
         )
     
-    # Validate data (for ensemble, use sequence_length from lstm sub-model metadata)
-    if detected_type == "ensemble":
-        lstm_meta = predictor.model_metadata.get("lstm", {})
-        transformer_meta = predictor.model_metadata.get("transformer", {})
-        seq_len = lstm_meta.get("sequence_length") or transformer_meta.get("sequence_length") or settings.sequence_length
-    else:
-        seq_len = predictor.model_metadata.get('sequence_length', settings.sequence_length)
-
-    if len(request.data) < seq_len:
+    seq_len = _sequence_length(predictor, detected_type)
+    if len(data) < seq_len:
         raise HTTPException(
             status_code=400,
             detail=f"Need at least {seq_len} data points for prediction"
         )
-    
-    # Convert to dict format
-    data = [d.model_dump() for d in request.data]
-    
+        
+    cache_key = PredictionCache.key(symbol, model_type, data) if isinstance(data, np.ndarray) else None
     try:
-        result = predictor.predict(data)
-        result["model_type"] = detected_type
+        # Run the forward passes off the event loop. predict() toggles the model
+        # between train/eval for MC dropout, so calls on one symbol stay serialized.
+        async with predictors.inference_lock(symbol):
+            # Checked under the lock so identical concurrent polls compute once
+            cached = prediction_cache.get(cache_key, predictor) if cache_key else None
+            if cached is not None:
+                result = dict(cached)
+            else:
+                result = await asyncio.to_thread(predictor.predict, data)
+                result["model_type"] = detected_type
+                if cache_key:
+                    prediction_cache.put(cache_key, predictor, dict(result))
 
         # Check for concept drift and attach warning if detected
         drift_status = drift_detector.check_drift(symbol)
@@ -636,38 +1087,91 @@ async def predict(request: PredictRequest):
                 "metrics": drift_status["metrics"],
             }
 
+        # Predictors already emit the PredictResponse shape; rendering it
+        # directly skips re-validating every prediction row through pydantic.
+        result.setdefault("drift_warning", None)
+        result.setdefault("ensemble_weights", None)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/ml/predict", response_model=PredictResponse, openapi_extra=_inline_body_schema(PredictRequest))
+async def predict(http_request: Request):
+    """
+    Generate price predictions for a symbol.
+    
+    Supports both LSTM and Transformer models.
+    If model_type is not specified, auto-detects (prefers Transformer).
+    """
+    request, data = await _parse_ohlcv_request(http_request, PredictParams, _predict_body)
+    return ORJSONResponse(await _predict_symbol(request, data))
+
+
+@app.post("/api/ml/predict/batch", openapi_extra=_inline_body_schema(PredictBatchRequest))
+async def predict_batch(http_request: Request):
+    """
+    Generate price predictions for several symbols in one request.
+
+    Entries are predicted concurrently and returned in request order. Each
+    entry of ``results`` is either a ``PredictResponse`` or, when that symbol
+    failed, ``{"symbol", "status_code", "error"}``; one failing symbol does
+    not fail the batch.
+    """
+    request, data = await _parse_ohlcv_request(http_request, PredictBatchParams, _predict_batch_body)
+
+    async def predict_or_error(params: PredictParams, ohlcv: OHLCVInput) -> dict:
+        try:
+            return await _predict_symbol(params, ohlcv)
+        except HTTPException as exc:
+            return {"symbol": params.symbol, "status_code": exc.status_code, "error": exc.detail}
+
+    results = await asyncio.gather(*map(predict_or_error, request.requests, data))
+    return ORJSONResponse({"results": results})
+
+
+def _remove_file(path: str) -> bool:
+    """Delete *path* with a single syscall; False if it did not exist."""
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
 @app.delete("/api/ml/models/{symbol}")
 async def delete_model(symbol: str, model_type: Optional[str] = None):
     """Delete a model (LSTM, Transformer, or both)"""
     symbol = symbol.upper()
     
-    import os
     deleted = []
     
     types_to_delete = [model_type] if model_type else ["lstm", "transformer"]
-    
-    for mt in types_to_delete:
-        # Determine file path
-        if mt == "transformer":
-            model_path = os.path.join(settings.model_dir, f"{symbol}_transformer.pt")
-        else:
-            model_path = os.path.join(settings.model_dir, f"{symbol}_model.pt")
-        
-        # Remove from cache
-        key = _get_predictor_key(symbol, mt)
-        if key in predictors:
-            del predictors[key]
-            deleted.append(f"{mt} (cache)")
+    # Checkpoints are also written by training worker processes and other
+    # replicas sharing MODEL_DIR, so the directory itself is the only index;
+    # _remove_file's single unlink() doubles as the existence check.
+    model_paths = {
+        mt: _checkpoint_path(symbol, mt if mt == "transformer" else "lstm") for mt in types_to_delete
+    }
+
+    # Holding the load lock keeps a load that already read the checkpoint from
+    # caching it again after the file is gone
+    async with predictors.lock(symbol):
+        for mt in types_to_delete:
+            key = _get_predictor_key(symbol, mt)
+            if key in predictors:
+                del predictors[key]
+                deleted.append(f"{mt} (cache)")
+
+        # A cached ensemble still holds the deleted sub-model
+        ensemble_key = _get_predictor_key(symbol, "ensemble")
+        if ensemble_key in predictors:
+            del predictors[ensemble_key]
+            deleted.append("ensemble (cache)")
         
-        # Remove file
-        if os.path.exists(model_path):
-            os.remove(model_path)
-            deleted.append(f"{mt} (file)")
+        # Remove files in one worker-thread hop instead of blocking the event loop
+        removed = await asyncio.to_thread(lambda: [_remove_file(p) for p in model_paths.values()])
+    deleted.extend(f"{mt} (file)" for mt, ok in zip(model_paths, removed) if ok)
     
     if deleted:
         return {"message": f"Deleted for {symbol}: {', '.join(deleted)}"}
@@ -679,7 +1183,7 @@ async def delete_model(symbol: str, model_type: Optional[str] = None):
 
 class DriftRecordRequest(BaseModel):
     """Request to record a prediction-actual pair for drift monitoring"""
-    symbol: str = Field(..., description="Stock symbol")
+    symbol: Symbol = Field(..., description="Stock symbol")
     predicted_price: float = Field(..., description="Predicted price")
     actual_price: float = Field(..., description="Actual observed price")
     timestamp: Optional[str] = Field(None, description="ISO timestamp of the prediction (defaults to now)")
@@ -693,15 +1197,16 @@ async def record_drift_data(request: DriftRecordRequest):
     Call this endpoint when actual prices become known (e.g., from the RL service
     or backend) so the drift detector can track prediction accuracy over time.
     """
+    symbol = request.symbol
     drift_detector.record_prediction(
-        symbol=request.symbol,
+        symbol=symbol,
         predicted_price=request.predicted_price,
         actual_price=request.actual_price,
         timestamp=request.timestamp,
     )
     return {
-        "message": f"Drift data recorded for {request.symbol.upper()}",
-        "symbol": request.symbol.upper(),
+        "message": f"Drift data recorded for {symbol}",
+        "symbol": symbol,
     }
 
 
@@ -730,7 +1235,7 @@ async def get_sentiment_status():
 @app.post("/api/ml/sentiment/load")
 async def load_sentiment_model():
     """Explicitly load the FinBERT model"""
-    success = finbert.preload_model()
+    success = await asyncio.to_thread(finbert.preload_model)
     if success:
         return {"message": "FinBERT model loaded successfully", "status": finbert.get_model_status()}
     else:
@@ -746,28 +1251,36 @@ async def analyze_sentiment(request: SentimentRequest):
     
     Returns sentiment (positive/negative/neutral), score (-1 to 1), and confidence.
     """
-    if not request.text.strip():
+    if not request.text or request.text.isspace():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
     
-    result = finbert.analyze_sentiment(request.text)
+    # Concurrent single-text requests share one batched FinBERT forward pass
+    result = await finbert.analyze_sentiment_batched(request.text)
     
+    # Rendered directly like the batch endpoint: a returned dict would be
+    # validated against SentimentResponse and walked by jsonable_encoder
     if result is None:
         status = finbert.get_model_status()
-        return {
+        return ORJSONResponse({
             "success": False,
             "result": None,
             "error": status.get("error", "Failed to analyze sentiment")
-        }
+        })
     
-    return {
+    return ORJSONResponse({
         "success": True,
-        "result": {
-            "text": result.text,
-            "sentiment": result.sentiment,
-            "score": result.score,
-            "confidence": result.confidence,
-            "probabilities": result.probabilities
-        }
+        "result": _sentiment_result_dict(result)
+    })
+
+
+def _sentiment_result_dict(result: finbert.SentimentResult) -> dict:
+    """Wire format of a SentimentResult (fields of SentimentResultModel)."""
+    return {
+        "text": result.text,
+        "sentiment": result.sentiment,
+        "score": result.score,
+        "confidence": result.confidence,
+        "probabilities": result.probabilities
     }
 
 
@@ -778,6 +1291,10 @@ async def analyze_sentiment_batch(request: SentimentBatchRequest):
     
     More efficient than calling /analyze multiple times.
     Empty texts will return null in the results array.
+
+    The response is rendered directly instead of being re-validated against
+    SentimentBatchResponse: FinBERT results already have the declared shape,
+    and per-item model validation dominated the cost of 100-text batches.
     """
     if not request.texts:
         raise HTTPException(status_code=400, detail="Texts list cannot be empty")
@@ -785,40 +1302,153 @@ async def analyze_sentiment_batch(request: SentimentBatchRequest):
     if len(request.texts) > 100:
         raise HTTPException(status_code=400, detail="Maximum 100 texts per batch")
     
-    # Filter out empty texts and track indices
-    valid_indices = []
-    valid_texts = []
-    for i, text in enumerate(request.texts):
-        if text.strip():
-            valid_indices.append(i)
-            valid_texts.append(text)
+    # Filter out empty/whitespace-only texts and track indices; isspace() checks
+    # in place where strip() would copy every (possibly article-length) text
+    valid_indices = [i for i, text in enumerate(request.texts) if text and not text.isspace()]
+    valid_texts = [request.texts[i] for i in valid_indices]
     
     # Analyze valid texts
-    results_list = finbert.analyze_batch(valid_texts)
+    results_list = await asyncio.to_thread(finbert.analyze_batch, valid_texts)
     
     # Reconstruct full results list with None for empty texts
-    full_results: List[Optional[SentimentResultModel]] = [None] * len(request.texts)
+    full_results: List[Optional[dict]] = [None] * len(request.texts)
     failed_count = 0
     
-    for i, result in enumerate(results_list):
-        original_idx = valid_indices[i]
+    for original_idx, result in zip(valid_indices, results_list):
         if result is not None:
-            full_results[original_idx] = SentimentResultModel(
-                text=result.text,
-                sentiment=result.sentiment,
-                score=result.score,
-                confidence=result.confidence,
-                probabilities=result.probabilities
-            )
+            full_results[original_idx] = _sentiment_result_dict(result)
         else:
             failed_count += 1
     
-    return {
+    return ORJSONResponse({
         "success": True,
         "results": full_results,
         "processed": len(valid_texts) - failed_count,
         "failed": failed_count + (len(request.texts) - len(valid_texts))
-    }
+    })
+
+
+# Texts per FinBERT pass on the NDJSON stream endpoint
+_SENTIMENT_STREAM_BATCH = 32
+# Longest accepted NDJSON line; longer lines get an error result and are skipped
+_SENTIMENT_STREAM_MAX_LINE = 1024 ** 2
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that lets the body generator keep reading the request.
+
+    For ASGI servers below spec 2.4 (uvicorn), Starlette runs a disconnect
+    listener that would consume the request body messages the generator is
+    still reading. A gone client is noticed through the request stream instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+def _stream_line_result(index: int, item: dict, result=None, error: Optional[str] = None) -> bytes:
+    line: Dict[str, Any] = {"index": index}
+    if "id" in item:
+        line["id"] = item["id"]
+    line["result"] = _sentiment_result_dict(result) if result is not None else None
+    if error:
+        line["error"] = error
+    return orjson.dumps(line, option=_ORJSON_OPTIONS) + b"\n"
+
+
+async def _sentiment_ndjson(request: Request):
+    """Parse NDJSON input incrementally and yield one result line per input line."""
+    # (index, item, text, error) in input order; invalid lines wait here too so
+    # their error lines are not emitted ahead of earlier results
+    pending: List[tuple] = []
+    index = 0
+
+    async def flush() -> bytes:
+        texts = [text for _, _, text, _ in pending if text is not None]
+        results = iter(
+            await asyncio.to_thread(finbert.analyze_batch, texts, _SENTIMENT_STREAM_BATCH)
+            if texts else []
+        )
+        out = []
+        for i, item, text, error in pending:
+            if text is None:
+                out.append(_stream_line_result(i, item, error=error))
+            else:
+                result = next(results)
+                out.append(_stream_line_result(i, item, result, None if result else "Analysis failed"))
+        pending.clear()
+        return b"".join(out)
+
+    def parse(raw: bytes) -> None:
+        nonlocal index
+        if not raw.strip():
+            return
+        i, index = index, index + 1
+        try:
+            item = orjson.loads(raw)
+        except orjson.JSONDecodeError as exc:
+            pending.append((i, {}, None, f"Invalid JSON: {exc}"))
+            return
+        if not isinstance(item, dict) or not isinstance(item.get("text"), str):
+            pending.append((i, {}, None, 'Expected an object with a "text" string'))
+            return
+        text = item["text"]
+        if not text or text.isspace():
+            pending.append((i, item, None, "Empty text"))
+            return
+        pending.append((i, item, text, None))
+
+    def too_long() -> None:
+        nonlocal index
+        pending.append((index, {}, None, f"Line exceeds {_SENTIMENT_STREAM_MAX_LINE} bytes"))
+        index += 1
+
+    # Only each new chunk is scanned for newlines; a line longer than the cap
+    # is reported once and its remaining bytes are dropped up to the newline
+    buffer = bytearray()
+    skipping = False
+    async for chunk in request.stream():
+        start = 0
+        while (end := chunk.find(b"\n", start)) >= 0:
+            if skipping:
+                skipping = False
+            elif len(buffer) + end - start > _SENTIMENT_STREAM_MAX_LINE:
+                too_long()
+            else:
+                buffer += chunk[start:end]
+                parse(buffer)
+            buffer.clear()
+            start = end + 1
+            if len(pending) >= _SENTIMENT_STREAM_BATCH:
+                yield await flush()
+        if not skipping:
+            if len(buffer) + len(chunk) - start > _SENTIMENT_STREAM_MAX_LINE:
+                too_long()
+                buffer.clear()
+                skipping = True
+            else:
+                buffer += chunk[start:]
+    if not skipping:
+        parse(buffer)
+    if pending:
+        yield await flush()
+
+
+@app.post("/api/ml/sentiment/analyze/stream")
+async def analyze_sentiment_stream(request: Request):
+    """
+    Streaming bulk sentiment analysis.
+
+    The request body is NDJSON, one ``{"text": "...", "id": ...}`` object per
+    line (``id`` is optional and echoed back). Results are streamed back as
+    NDJSON in input order: ``{"index": n, "id": ..., "result": {...} | null,
+    "error": "..."}``. Texts are scored in FinBERT batches of 32 while the
+    body is still arriving, so memory stays bounded by the batch and there is
+    no 100-text limit as on ``/analyze/batch``. Lines over 1 MiB are answered
+    with an error result instead of being buffered.
+    """
+    return _DuplexStreamingResponse(_sentiment_ndjson(request), media_type="application/x-ndjson")
 
 
 class EmbedBatchRequest(BaseModel):
@@ -837,16 +1467,16 @@ async def embed_batch_endpoint(request: EmbedBatchRequest):
     if len(request.texts) > 64:
         raise HTTPException(status_code=400, detail="Maximum 64 texts per batch")
 
-    embeddings = finbert.embed_batch(request.texts)
+    embeddings = await asyncio.to_thread(finbert.embed_batch, request.texts)
     if embeddings is None:
         raise HTTPException(status_code=503, detail="FinBERT not loaded")
 
-    return {
+    return ORJSONResponse({
         "success": True,
         "embeddings": embeddings,
         "dim": 768,
         "count": len(embeddings),
-    }
+    })
 
 
 # ============== RAG: Embeddings + Vector Store ==============
@@ -863,7 +1493,9 @@ async def rag_embed(request: RagEmbedRequest):
     if len(request.texts) > 256:
         raise HTTPException(status_code=400, detail="max 256 texts per call")
     vectors = rag_embeddings.embed(request.texts)
-    return {"success": True, "vectors": vectors, "dim": rag_embeddings.EMBEDDING_DIM, "count": len(vectors)}
+    return ORJSONResponse(
+        {"success": True, "vectors": vectors, "dim": rag_embeddings.EMBEDDING_DIM, "count": len(vectors)}
+    )
 
 
 class RagIngestItem(BaseModel):
@@ -1012,8 +1644,6 @@ async def price_warrant_endpoint(request: WarrantPriceRequest):
     Calculate the fair price and Greeks for a warrant (Optionsschein)
     using the Black-Scholes model.
     """
-    from .warrant_pricing import price_warrant, to_dict
-
     try:
         result = price_warrant(
             S=request.underlying_price,
@@ -1029,14 +1659,36 @@ async def price_warrant_endpoint(request: WarrantPriceRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _chain_column(values: np.ndarray, format: str):
+    """
+    One flattened grid column. Columnar responses hand float arrays straight
+    to orjson (OPT_SERIALIZE_NUMPY), skipping a Python float object per cell;
+    string columns (moneyness) and row transposition need lists.
+    """
+    column = values.ravel()
+    if format == "columnar" and column.dtype.kind == "f":
+        return column
+    return column.tolist()
+
+
+def _columns_to_rows(columns: Dict[str, list]) -> List[dict]:
+    """Transpose a columnar chain side into the legacy list-of-dicts layout."""
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+
 @app.post("/warrant/chain", tags=["Warrant Pricing"])
-async def option_chain_endpoint(request: OptionChainRequest):
+async def option_chain_endpoint(request: OptionChainRequest, format: str = "rows"):
     """
     Generate a full option chain (Optionskette) with prices and Greeks
     for multiple strike × expiry combinations. Returns calls and puts.
+
+    With ``?format=columnar`` each side is returned as one array per field
+    (``{"strike": [...], "price": [...], ...}``) instead of one object per
+    row, which avoids repeating every key ~100 times per side.
     """
-    from .warrant_pricing import price_warrant, to_dict
-    import math
+    if format not in ("rows", "columnar"):
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}. Use 'rows' or 'columnar'.")
 
     try:
         S = request.underlying_price
@@ -1048,76 +1700,35 @@ async def option_chain_endpoint(request: OptionChainRequest):
         if request.strikes:
             strikes = sorted([k for k in request.strikes if k > 0])
         else:
-            # Determine step size based on price magnitude
-            if S >= 500:
-                step = 25
-            elif S >= 100:
-                step = 10
-            elif S >= 50:
-                step = 5
-            elif S >= 10:
-                step = 2
-            else:
-                step = 0.5
-
-            center = round(S / step) * step
-            strikes = []
-            for i in range(-8, 9):
-                k = round(center + i * step, 2)
-                if k > 0:
-                    strikes.append(k)
+            strikes = default_strikes(S)
 
         # Auto-generate expiry days if not provided
         if request.expiry_days:
             expiry_days = sorted([d for d in request.expiry_days if d > 0])
         else:
-            expiry_days = [14, 30, 60, 90, 180, 365]
-
-        # Build chain
-        calls = []
-        puts = []
-
-        for days in expiry_days:
-            for K in strikes:
-                try:
-                    call_result = price_warrant(S, K, days, sigma, r, 'call', ratio)
-                    put_result = price_warrant(S, K, days, sigma, r, 'put', ratio)
-
-                    call_entry = {
-                        "strike": K,
-                        "days": days,
-                        "price": call_result.warrant_price,
-                        "intrinsic": call_result.intrinsic_value,
-                        "timeValue": call_result.time_value,
-                        "delta": call_result.greeks.delta,
-                        "gamma": call_result.greeks.gamma,
-                        "theta": call_result.greeks.theta,
-                        "vega": call_result.greeks.vega,
-                        "moneyness": call_result.moneyness,
-                        "leverage": call_result.leverage_ratio,
-                        "breakEven": call_result.break_even,
-                    }
-                    put_entry = {
-                        "strike": K,
-                        "days": days,
-                        "price": put_result.warrant_price,
-                        "intrinsic": put_result.intrinsic_value,
-                        "timeValue": put_result.time_value,
-                        "delta": put_result.greeks.delta,
-                        "gamma": put_result.greeks.gamma,
-                        "theta": put_result.greeks.theta,
-                        "vega": put_result.greeks.vega,
-                        "moneyness": put_result.moneyness,
-                        "leverage": put_result.leverage_ratio,
-                        "breakEven": put_result.break_even,
-                    }
-                    calls.append(call_entry)
-                    puts.append(put_entry)
-                except Exception:
-                    # Skip invalid combinations
-                    pass
+            expiry_days = list(DEFAULT_EXPIRY_DAYS)
 
-        return {
+        # Price the whole strike × expiry grid for both sides in one vectorized pass
+        n_days, n_strikes = len(expiry_days), len(strikes)
+        strike_col = strikes * n_days
+        days_col = [d for d in expiry_days for _ in range(n_strikes)]
+        grids = price_warrant_grids(S, strikes, expiry_days, sigma, r, ratio)
+
+        def _chain_columns(option_type: str) -> Dict[str, list]:
+            grid = grids[option_type]
+            return {
+                "strike": strike_col,
+                "days": days_col,
+                **{key: _chain_column(grid[name], format) for key, name in CHAIN_FIELDS.items()},
+            }
+
+        calls = _chain_columns('call')
+        puts = _chain_columns('put')
+        if format == "rows":
+            calls = _columns_to_rows(calls)
+            puts = _columns_to_rows(puts)
+
+        return ORJSONResponse({
             "success": True,
             "underlying_price": S,
             "volatility": sigma,
@@ -1126,7 +1737,7 @@ async def option_chain_endpoint(request: OptionChainRequest):
             "expiry_days": expiry_days,
             "calls": calls,
             "puts": puts,
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1136,8 +1747,6 @@ async def implied_vol_endpoint(request: ImpliedVolRequest):
     """
     Calculate the implied volatility from a warrant's market price.
     """
-    from .warrant_pricing import implied_volatility
-
     try:
         # Adjust market price for ratio to get underlying option price
         option_price = request.market_price / request.ratio
@@ -1178,8 +1787,6 @@ async def real_option_chain_endpoint(request: RealOptionChainRequest):
     
     The `source` field in the response indicates which provider was used.
     """
-    from .options_provider import fetch_options_chain
-
     try:
         result = await fetch_options_chain(
             symbol=request.symbol,
@@ -1193,7 +1800,7 @@ async def real_option_chain_endpoint(request: RealOptionChainRequest):
         if not result or not result.get("success"):
             raise HTTPException(status_code=404, detail=f"No options data found for {request.symbol}")
 
-        return result
+        return ORJSONResponse(result)
     except HTTPException:
         raise
     except Exception as e:
@@ -1213,14 +1820,19 @@ async def get_activities():
 
     for key, status in training_status.items():
         if status.get("status") in ("starting", "training"):
+            model_type = status.get("model_type")
+            # Activity names predate per-type keys: LSTM jobs show the bare symbol
+            job = status.get("symbol", key)
+            if model_type and model_type != "lstm":
+                job = f"{job}_{model_type}"
             activities.append({
-                "id": f"ml-train-{key}",
+                "id": f"ml-train-{job}",
                 "type": "ml_training",
-                "name": f"ML Training: {key.upper()}",
+                "name": f"ML Training: {job.upper()}",
                 "status": status.get("status", "training"),
                 "progress": status.get("progress"),
                 "message": status.get("message", ""),
-                "model_type": status.get("model_type"),
+                "model_type": model_type,
                 "started_at": None,
                 "device": settings.device_info.get("device", "cpu"),
                 "device_info": device_info,
@@ -1236,4 +1848,7 @@ async def get_activities():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop/httptools ship with uvicorn[standard]; the access log would write a
+    # line for every /health probe. One worker only: training_status and the
+    # predictor cache are process-local.
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools", access_log=False)
@@ -22,19 +22,408 @@ import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 from typing import Tuple, List, Optional, Iterator
+import contextlib
+import functools
+import hashlib
 import os
 import json
 import logging
+import threading
+import uuid
+from collections import OrderedDict
 from datetime import datetime
 
 from .config import settings
 from .cross_asset_features import CrossAssetFeatureProvider
 from .feature_selector import FeatureSelector
+from .ohlcv import OHLCVInput, ohlcv_column, ohlcv_to_frame
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
 
+def stack_windows(
+    values: np.ndarray, start: int, length: int, count: int, dtype: Optional[np.dtype] = None
+) -> np.ndarray:
+    """
+    ``values[start + i : start + i + length]`` for ``i in range(count)``,
+    stacked along a new first axis. Built from one strided view and a single
+    copy instead of a Python loop collecting ``count`` slices; with *dtype*
+    that copy also does the conversion.
+    """
+    if count <= 0:
+        return np.array([], dtype=dtype)
+    view = np.lib.stride_tricks.sliding_window_view(
+        values[start:start + count + length - 1], length, axis=0
+    )
+    # sliding_window_view appends the window axis last
+    return np.ascontiguousarray(np.moveaxis(view, -1, 1), dtype=dtype)
+
+
+# An ensemble runs both of its predictors (train and predict) on the same
+# candles, and a retrained model's first forecasts see the candles its
+# predecessor just did, so indicator frames are memoized by content.
+_INDICATOR_CACHE_SIZE = settings.indicator_cache_size
+
+_indicator_cache: "OrderedDict[bytes, pd.DataFrame]" = OrderedDict()
+_indicator_cache_lock = threading.Lock()
+
+
+def _frame_key(df: pd.DataFrame) -> Optional[bytes]:
+    """Digest of *df*'s column names and values; None if a column is not numeric."""
+    h = hashlib.blake2b(digest_size=16)
+    for name in df.columns:
+        values = df[name].to_numpy()
+        if values.dtype == object:
+            return None
+        h.update(str(name).encode())
+        h.update(values.dtype.str.encode())
+        h.update(np.ascontiguousarray(values).view(np.uint8))
+    return h.digest()
+
+
+def technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    *df* with the technical indicator columns appended, memoized for
+    repeated candles. Callers get their own frame object but share its
+    column data, so it must not be modified in place.
+    """
+    key = _frame_key(df) if _INDICATOR_CACHE_SIZE > 0 else None
+    if key is not None:
+        with _indicator_cache_lock:
+            cached = _indicator_cache.get(key)
+            if cached is not None:
+                _indicator_cache.move_to_end(key)
+                return cached.copy(deep=False)
+    result = _technical_indicators(df)
+    if key is not None:
+        with _indicator_cache_lock:
+            _indicator_cache[key] = result
+            _indicator_cache.move_to_end(key)
+            while len(_indicator_cache) > _INDICATOR_CACHE_SIZE:
+                _indicator_cache.popitem(last=False)
+        return result.copy(deep=False)
+    return result
+
+
+def clear_indicator_cache() -> None:
+    """Drop all memoized indicator frames."""
+    with _indicator_cache_lock:
+        _indicator_cache.clear()
+
+
+def _technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    *df* with the technical indicator columns both predictors derive their
+    features from appended. Every rolling/EWM pass over a column runs once
+    (the Bollinger middle band is the SMA-20), elementwise arithmetic runs
+    on the underlying arrays, and the new columns are added as one block
+    rather than inserted one by one.
+    """
+    close_s = df["close"].astype(float)
+    close = close_s.to_numpy()
+    volume = df["volume"].to_numpy(dtype=float)
+
+    def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+        return pd.Series(values).rolling(window=window).mean().to_numpy()
+
+    def shifted(values: np.ndarray, periods: int) -> np.ndarray:
+        out = np.full_like(values, np.nan)
+        out[periods:] = values[:-periods]
+        return out
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prev_close = shifted(close, 1)
+        returns = close / prev_close - 1
+        cols = {
+            "returns": returns,
+            "log_returns": np.log(close / prev_close),
+        }
+
+        for window in (5, 10, 20, 50):
+            sma = rolling_mean(close, window)
+            cols[f"sma_{window}"] = sma
+            cols[f"sma_{window}_ratio"] = close / sma
+
+        delta = close - prev_close
+        gain = rolling_mean(np.where(delta > 0, delta, 0.0), 14)
+        loss = rolling_mean(np.where(delta < 0, -delta, 0.0), 14)
+        cols["rsi"] = 100 - (100 / (1 + gain / loss))
+
+        ema12 = close_s.ewm(span=12).mean().to_numpy()
+        ema26 = close_s.ewm(span=26).mean().to_numpy()
+        macd = ema12 - ema26
+        macd_signal = pd.Series(macd).ewm(span=9).mean().to_numpy()
+        cols["macd"] = macd
+        cols["macd_signal"] = macd_signal
+        cols["macd_hist"] = macd - macd_signal
+
+        bb_middle = cols["sma_20"]
+        bb_std = close_s.rolling(window=20).std().to_numpy()
+        bb_upper = bb_middle + (bb_std * 2)
+        bb_lower = bb_middle - (bb_std * 2)
+        cols["bb_middle"] = bb_middle
+        cols["bb_upper"] = bb_upper
+        cols["bb_lower"] = bb_lower
+        cols["bb_width"] = (bb_upper - bb_lower) / bb_middle
+        cols["bb_position"] = (close - bb_lower) / (bb_upper - bb_lower)
+
+        volume_sma = rolling_mean(volume, 20)
+        cols["volume_sma"] = volume_sma
+        cols["volume_ratio"] = volume / volume_sma
+
+        cols["volatility"] = pd.Series(returns).rolling(window=20).std().to_numpy()
+        cols["hl_range"] = (df["high"].to_numpy(dtype=float) - df["low"].to_numpy(dtype=float)) / close
+
+        for period in (5, 10, 20):
+            cols[f"momentum_{period}"] = close / shifted(close, period) - 1
+
+    return pd.concat([df, pd.DataFrame(cols, index=df.index)], axis=1)
+
+
+def feature_matrix(df: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The *columns* of *df* as one float64 matrix without the rows that have a
+    NaN in any of them (the rolling indicators' warm-up rows), plus the
+    boolean mask of the rows kept. The NaN rows are dropped with one mask on
+    the array instead of dropna() building another DataFrame first.
+    """
+    X = df[columns].to_numpy(dtype=np.float64)
+    keep = ~np.isnan(X).any(axis=1)
+    return X[keep], keep
+
+
+def add_feature_columns(
+    X: np.ndarray, feature_columns: List[str], extra: pd.DataFrame
+) -> np.ndarray:
+    """
+    *X* with the columns of *extra* appended row by row (or overwriting a
+    feature of the same name), truncated to the shorter of the two;
+    *feature_columns* is extended in place.
+    """
+    n = min(len(X), len(extra))
+    X = X[:n]
+    appended = []
+    for col in extra.columns:
+        values = extra[col].to_numpy(dtype=np.float64)[:n]
+        if col in feature_columns:
+            X[:, feature_columns.index(col)] = values
+        else:
+            feature_columns.append(col)
+            appended.append(values)
+    return np.column_stack([X, *appended]) if appended else X
+
+
+@functools.lru_cache(maxsize=1)
+def _cuda_autocast_dtype() -> torch.dtype:
+    # BF16 keeps FP32's exponent range, so unnormalized LSTM states cannot
+    # overflow as they can in FP16; GPUs before Ampere only have FP16 Tensor Cores.
+    return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+
+
+def save_checkpoint(obj: dict, path: str) -> None:
+    """
+    ``torch.save`` *obj* to *path* atomically: written to a temporary file in
+    the same directory, then renamed over *path*. A crash or a concurrent
+    load() mid-save sees the old checkpoint or the new one, never a torn file.
+    """
+    # Unique per save so concurrent saves of one symbol never share a file;
+    # plain open() keeps the umask-derived permissions of a normal save
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "xb") as f:
+            torch.save(obj, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+@functools.lru_cache(maxsize=1)
+def _tensorrt_available() -> bool:
+    try:
+        import torch_tensorrt  # noqa: F401  (registers the "tensorrt" compile backend)
+    except ImportError as exc:
+        logger.warning(f"torch-tensorrt unavailable ({exc}), compiling with inductor")
+        return False
+    return True
+
+
+def compile_for_inference(model: nn.Module, device) -> nn.Module:
+    """
+    *model* wrapped with ``torch.compile`` when predicting on CUDA (and
+    ML_TORCH_COMPILE is on), else *model* itself. Batch-1 forecasts are
+    dominated by kernel launches; compilation fuses the LSTM head's Linear /
+    activation / dropout ops and, in ``reduce-overhead`` mode, replays them
+    as CUDA graphs. The wrapper shares *model*'s parameters and train/eval
+    state, so ``state_dict()`` and checkpoints are unaffected. Compilation
+    happens on the first call per input shape and mode (ML_PRELOAD_MODELS
+    warm-ups pay for it); if compiling or running the compiled module fails,
+    the failure is logged and this model runs eagerly from then on. Dynamo's
+    process-wide error suppression is left alone, so other compiled models
+    still surface their own failures.
+    With ML_TORCH_COMPILE_BACKEND=tensorrt and torch-tensorrt installed,
+    the model is built into an FP16 TensorRT engine instead.
+    """
+    if not settings.torch_compile or torch.device(device).type != "cuda":
+        return model
+    if settings.torch_compile_backend.lower() == "tensorrt" and _tensorrt_available():
+        compiled = torch.compile(
+            model, backend="tensorrt", dynamic=False,
+            options={"enabled_precisions": {torch.float16}},
+        )
+    else:
+        compiled = torch.compile(model, mode="reduce-overhead", dynamic=False)
+    return _EagerFallback(compiled, model)
+
+
+class _EagerFallback(nn.Module):
+    """Runs *compiled*, switching to *eager* for good once a compiled call raises."""
+
+    def __init__(self, compiled: nn.Module, eager: nn.Module) -> None:
+        super().__init__()
+        self.compiled = compiled
+        self.eager = eager
+        self.failed = False
+
+    def forward(self, *args, **kwargs):
+        if not self.failed:
+            try:
+                return self.compiled(*args, **kwargs)
+            except Exception as exc:
+                self.failed = True
+                logger.warning(
+                    f"Compiled {type(self.eager).__name__} failed, running it eagerly: {exc}",
+                    exc_info=True,
+                )
+        return self.eager(*args, **kwargs)
+
+
+def inference_context(device) -> contextlib.ExitStack:
+    """
+    Context for prediction forward passes: inference_mode (no autograd
+    bookkeeping at all, cheaper than no_grad) plus BF16 (or, on pre-Ampere
+    GPUs, FP16) autocast on CUDA.
+    *device* is a torch.device or a device string such as ``"cuda"``.
+    """
+    stack = contextlib.ExitStack()
+    stack.enter_context(torch.inference_mode())
+    if torch.device(device).type == "cuda":
+        stack.enter_context(torch.autocast(device_type="cuda", dtype=_cuda_autocast_dtype()))
+    return stack
+
+
+def snapshot_state(model: nn.Module, into: Optional[dict] = None) -> dict:
+    """
+    A copy of *model*'s ``state_dict()`` in host memory (pinned for CUDA
+    models), for early stopping to restore the best epoch from. Passing the
+    previous snapshot of the same model as *into* overwrites it in place
+    instead of allocating, so improving epochs neither clone the weights on
+    the GPU nor allocate anew.
+    """
+    state = model.state_dict()
+    if into is None:
+        pin = any(t.is_cuda for t in state.values())
+        into = {k: torch.empty(v.shape, dtype=v.dtype, pin_memory=pin) for k, v in state.items()}
+    # Ordered on the current stream before later optimizer steps and before
+    # load_state_dict() copies the snapshot back
+    for k, v in state.items():
+        into[k].copy_(v, non_blocking=True)
+    return into
+
+
+def training_grad_scaler(device) -> torch.amp.GradScaler:
+    """
+    Loss scaler for train_epoch(). Only FP16 autocast (pre-Ampere GPUs)
+    needs loss scaling; elsewhere the scaler is a pass-through.
+    """
+    enabled = torch.device(device).type == "cuda" and _cuda_autocast_dtype() == torch.float16
+    return torch.amp.GradScaler("cuda", enabled=enabled)
+
+
+def train_epoch(
+    model: nn.Module,
+    optimizer: torch.optim.Optimizer,
+    criterion: nn.Module,
+    X: torch.Tensor,
+    y: torch.Tensor,
+    batch_size: int,
+    grad_scaler: torch.amp.GradScaler,
+) -> float:
+    """
+    One epoch of shuffled mini-batch steps over (*X*, *y*), which already
+    live on the training device; returns the mean training loss. On CUDA
+    the forward passes run under the same BF16/FP16 autocast as inference.
+    """
+    model.train()
+    cuda = X.device.type == "cuda"
+    order = torch.randperm(len(X), device=X.device)
+    total = torch.zeros((), device=X.device)
+    for batch in order.split(batch_size):
+        optimizer.zero_grad(set_to_none=True)
+        autocast = (
+            torch.autocast(device_type="cuda", dtype=_cuda_autocast_dtype())
+            if cuda else contextlib.nullcontext()
+        )
+        with autocast:
+            pred = model(X[batch])
+        loss = criterion(pred.float(), y[batch])
+        grad_scaler.scale(loss).backward()
+        grad_scaler.unscale_(optimizer)
+        torch.nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0)
+        grad_scaler.step(optimizer)
+        grad_scaler.update()
+        # Accumulated on the device: one host sync per epoch, not per step
+        total += loss.detach() * len(batch)
+    return (total / len(X)).item()
+
+
+def evaluate_loss(model: nn.Module, criterion: nn.Module, X: torch.Tensor, y: torch.Tensor) -> float:
+    """*criterion* of *model* in eval mode over all of (*X*, *y*)."""
+    model.eval()
+    with inference_context(X.device):
+        return criterion(model(X).float(), y).item()
+
+
+def scaled_window(scaler: MinMaxScaler, X: np.ndarray, seq_len: int) -> np.ndarray:
+    """
+    The last *seq_len* rows of *X* min-max scaled with a fitted scaler, equal
+    to ``scaler.transform(X)[-seq_len:]``. Min-max scaling is per column, so
+    the rest of the history never needs scaling, and applying ``scale_`` /
+    ``min_`` directly skips sklearn's per-call input validation.
+    """
+    if len(X) < seq_len:
+        raise ValueError(f"Need at least {seq_len} data points")
+    window = np.array(X[-seq_len:], dtype=np.float64)
+    window *= scaler.scale_
+    window += scaler.min_
+    if scaler.clip:
+        np.clip(window, scaler.feature_range[0], scaler.feature_range[1], out=window)
+    return window
+
+
+def device_tensor(array: np.ndarray, device) -> torch.Tensor:
+    """
+    *array* as a float32 tensor on *device*, sharing memory with float32
+    arrays on CPU. On CUDA the host side goes through pinned memory, so the
+    upload is an asynchronous DMA queued ahead of the next kernels on the
+    same stream instead of a synchronous pageable copy.
+    """
+    tensor = torch.from_numpy(np.asarray(array, dtype=np.float32))
+    if torch.device(device).type == "cuda":
+        return tensor.pin_memory().to(device, non_blocking=True)
+    return tensor
+
+
+def input_tensor(sequence: np.ndarray, device) -> torch.Tensor:
+    """
+    A single (seq_len, n_features) window as a (1, seq_len, n_features)
+    float32 model input on *device*, uploaded as by device_tensor().
+    """
+    return device_tensor(sequence, device).unsqueeze(0)
+
+
 class DirectionalTradingLoss(nn.Module):
     """
     Combined MSE + directional-accuracy loss for time-series price forecasting.
@@ -173,6 +562,9 @@ class StockPredictor:
         self.is_trained = False
         self.training_history: List[dict] = []
         self.model_metadata: dict = {}
+        # compile_for_inference() wrapper and the model instance it wraps
+        self._compiled_model: Optional[nn.Module] = None
+        self._compiled_for: Optional[nn.Module] = None
 
         # Optional enrichment / pruning flags
         self.use_cross_asset_features: bool = use_cross_asset_features
@@ -190,62 +582,13 @@ class StockPredictor:
         
         Features:
         - Price changes (returns)
-        - Moving averages (SMA, EMA)
+        - Moving averages (SMA)
         - RSI
         - MACD
         - Bollinger Bands
         - Volume indicators
         """
-        # Make a copy to avoid modifying original
-        df = df.copy()
-        
-        # Price returns
-        df['returns'] = df['close'].pct_change()
-        df['log_returns'] = np.log(df['close'] / df['close'].shift(1))
-        
-        # Moving averages
-        for window in [5, 10, 20, 50]:
-            df[f'sma_{window}'] = df['close'].rolling(window=window).mean()
-            df[f'ema_{window}'] = df['close'].ewm(span=window).mean()
-            df[f'sma_{window}_ratio'] = df['close'] / df[f'sma_{window}']
-        
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        
-        # MACD
-        ema12 = df['close'].ewm(span=12).mean()
-        ema26 = df['close'].ewm(span=26).mean()
-        df['macd'] = ema12 - ema26
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_hist'] = df['macd'] - df['macd_signal']
-        
-        # Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
-        df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-        df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
-        df['bb_width'] = (df['bb_upper'] - df['bb_lower']) / df['bb_middle']
-        df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
-        
-        # Volume indicators
-        df['volume_sma'] = df['volume'].rolling(window=20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_sma']
-        
-        # Volatility
-        df['volatility'] = df['returns'].rolling(window=20).std()
-        
-        # High-Low range
-        df['hl_range'] = (df['high'] - df['low']) / df['close']
-        
-        # Price momentum
-        for period in [5, 10, 20]:
-            df[f'momentum_{period}'] = df['close'] / df['close'].shift(period) - 1
-        
-        return df
+        return technical_indicators(df)
     
     def _prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
         """
@@ -272,36 +615,25 @@ class StockPredictor:
         feature_columns = [c for c in feature_columns if c in df.columns]
         
         # Drop NaN rows
-        df_clean = df[feature_columns].dropna()
+        X, keep = feature_matrix(df, feature_columns)
 
         # Optionally enrich with cross-asset features
         if self._cross_asset_provider is not None:
             try:
                 # Reconstruct a DatetimeIndex aligned to the cleaned rows
                 if 'timestamp' in df.columns:
-                    dates = pd.to_datetime(df['timestamp']).iloc[df_clean.index]
+                    dates = pd.to_datetime(df['timestamp'])[keep]
                 else:
-                    dates = df_clean.index
+                    dates = df.index[keep]
                 cross_df = self._cross_asset_provider.get_cross_asset_features(
                     self.symbol, pd.DatetimeIndex(dates)
                 )
                 if cross_df is not None and not cross_df.empty:
-                    # Reset to positional index for safe concatenation
-                    cross_df = cross_df.reset_index(drop=True)
-                    df_clean = df_clean.reset_index(drop=True)
-                    # Align lengths
-                    min_len = min(len(df_clean), len(cross_df))
-                    df_clean = df_clean.iloc[:min_len].copy()
-                    cross_vals = cross_df.iloc[:min_len]
-                    new_cols = {col: cross_vals[col].values for col in cross_df.columns}
-                    df_clean = df_clean.assign(**new_cols)
-                    for col in cross_df.columns:
-                        if col not in feature_columns:
-                            feature_columns.append(col)
+                    X = add_feature_columns(X, feature_columns, cross_df)
             except Exception as exc:
                 logger.warning(f"StockPredictor: cross-asset feature enrichment failed: {exc}")
 
-        return df_clean.values, [c for c in feature_columns if c in df_clean.columns]
+        return X, feature_columns
     
     def _create_sequences(
         self,
@@ -320,19 +652,18 @@ class StockPredictor:
             forecast_days: Number of days to forecast
             
         Returns:
-            Tuple of (X_sequences, y_sequences)
+            Tuple of (X_sequences, y_sequences) as contiguous float32 arrays,
+            ready for ``torch.from_numpy``
         """
-        X_seq, y_seq = [], []
-        
-        for i in range(len(X) - sequence_length - forecast_days + 1):
-            X_seq.append(X[i:i + sequence_length])
-            y_seq.append(y[i + sequence_length:i + sequence_length + forecast_days])
-        
-        return np.array(X_seq), np.array(y_seq)
+        n = len(X) - sequence_length - forecast_days + 1
+        return (
+            stack_windows(X, 0, sequence_length, n, dtype=np.float32),
+            stack_windows(y, sequence_length, forecast_days, n, dtype=np.float32),
+        )
     
     def prepare_data(
         self,
-        ohlcv_data: List[dict],
+        ohlcv_data: OHLCVInput,
         sequence_length: Optional[int] = None,
         forecast_days: Optional[int] = None
     ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
@@ -352,9 +683,7 @@ class StockPredictor:
         fc_days = forecast_days or settings.forecast_days
         
         # Convert to DataFrame
-        df = pd.DataFrame(ohlcv_data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        df = ohlcv_to_frame(ohlcv_data)
         
         # Prepare features
         X, self.feature_names = self._prepare_features(df)
@@ -418,10 +747,10 @@ class StockPredictor:
             X_val_prefixed, y_val_prefixed, seq_len, fc_days
         )
 
-        X_train = torch.FloatTensor(X_seq_train).to(self.device)
-        y_train = torch.FloatTensor(y_seq_train).to(self.device)
-        X_val = torch.FloatTensor(X_seq_val).to(self.device)
-        y_val = torch.FloatTensor(y_seq_val).to(self.device)
+        X_train = device_tensor(X_seq_train, self.device)
+        y_train = device_tensor(y_seq_train, self.device)
+        X_val = device_tensor(X_seq_val, self.device)
+        y_val = device_tensor(y_seq_val, self.device)
 
         return X_train, y_train, X_val, y_val
 
@@ -467,7 +796,7 @@ class StockPredictor:
 
     def _prepare_all_sequences(
         self,
-        ohlcv_data: List[dict],
+        ohlcv_data: OHLCVInput,
         sequence_length: Optional[int] = None,
         forecast_days: Optional[int] = None,
     ) -> Tuple[np.ndarray, np.ndarray]:
@@ -494,9 +823,7 @@ class StockPredictor:
         seq_len = sequence_length or settings.sequence_length
         fc_days = forecast_days or settings.forecast_days
 
-        df = pd.DataFrame(ohlcv_data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        df = ohlcv_to_frame(ohlcv_data)
 
         X, self.feature_names = self._prepare_features(df)
         close_idx = self.feature_names.index('close')
@@ -538,7 +865,7 @@ class StockPredictor:
 
     def train(
         self,
-        ohlcv_data: List[dict],
+        ohlcv_data: OHLCVInput,
         epochs: Optional[int] = None,
         learning_rate: Optional[float] = None,
         sequence_length: Optional[int] = None,
@@ -592,6 +919,8 @@ class StockPredictor:
                 forecast_days=self._train_forecast_days,
             )
             input_size = X_seq.shape[2]
+            # Uploaded once; every fold trains on device-side slices
+            X_all, y_all = device_tensor(X_seq, self.device), device_tensor(y_seq, self.device)
 
             best_overall_val_loss = float('inf')
             best_overall_model_state = None
@@ -600,10 +929,8 @@ class StockPredictor:
             for fold_idx, (train_sl, val_sl) in enumerate(
                 self.walk_forward_split(len(X_seq))
             ):
-                X_train_f = torch.FloatTensor(X_seq[train_sl]).to(self.device)
-                y_train_f = torch.FloatTensor(y_seq[train_sl]).to(self.device)
-                X_val_f = torch.FloatTensor(X_seq[val_sl]).to(self.device)
-                y_val_f = torch.FloatTensor(y_seq[val_sl]).to(self.device)
+                X_train_f, y_train_f = X_all[train_sl], y_all[train_sl]
+                X_val_f, y_val_f = X_all[val_sl], y_all[val_sl]
 
                 fold_model = LSTMModel(
                     input_size=input_size,
@@ -620,40 +947,33 @@ class StockPredictor:
                     fold_optimizer, mode='min', factor=0.5, patience=5
                 )
 
+                fold_grad_scaler = training_grad_scaler(self.device)
+
                 best_fold_loss = float('inf')
                 fold_patience = 0
                 best_fold_state = None
 
                 for epoch in range(epochs):
-                    fold_model.train()
-                    fold_optimizer.zero_grad()
-                    train_pred = fold_model(X_train_f)
-                    train_loss = criterion(train_pred, y_train_f)
-                    train_loss.backward()
-                    torch.nn.utils.clip_grad_norm_(
-                        fold_model.parameters(), max_norm=1.0
+                    train_loss = train_epoch(
+                        fold_model, fold_optimizer, criterion, X_train_f, y_train_f,
+                        settings.batch_size, fold_grad_scaler,
                     )
-                    fold_optimizer.step()
-
-                    fold_model.eval()
-                    with torch.no_grad():
-                        val_pred = fold_model(X_val_f)
-                        val_loss = criterion(val_pred, y_val_f)
+                    val_loss = evaluate_loss(fold_model, criterion, X_val_f, y_val_f)
 
                     fold_scheduler.step(val_loss)
 
                     self.training_history.append({
                         'fold': fold_idx + 1,
                         'epoch': epoch + 1,
-                        'train_loss': train_loss.item(),
-                        'val_loss': val_loss.item(),
+                        'train_loss': train_loss,
+                        'val_loss': val_loss,
                         'lr': fold_optimizer.param_groups[0]['lr'],
                     })
 
                     if val_loss < best_fold_loss:
-                        best_fold_loss = val_loss.item()
+                        best_fold_loss = val_loss
                         fold_patience = 0
-                        best_fold_state = fold_model.state_dict().copy()
+                        best_fold_state = snapshot_state(fold_model, best_fold_state)
                     else:
                         fold_patience += 1
 
@@ -712,27 +1032,18 @@ class StockPredictor:
                 optimizer, mode='min', factor=0.5, patience=5
             )
 
+            grad_scaler = training_grad_scaler(self.device)
+
             best_val_loss = float('inf')
             patience_counter = 0
             best_model_state = None
 
             for epoch in range(epochs):
-                # Training phase
-                self.model.train()
-                optimizer.zero_grad()
-
-                train_pred = self.model(X_train)
-                train_loss = criterion(train_pred, y_train)
-
-                train_loss.backward()
-                torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
-                optimizer.step()
-
-                # Validation phase
-                self.model.eval()
-                with torch.no_grad():
-                    val_pred = self.model(X_val)
-                    val_loss = criterion(val_pred, y_val)
+                train_loss = train_epoch(
+                    self.model, optimizer, criterion, X_train, y_train,
+                    settings.batch_size, grad_scaler,
+                )
+                val_loss = evaluate_loss(self.model, criterion, X_val, y_val)
 
                 # Learning rate scheduling
                 scheduler.step(val_loss)
@@ -740,23 +1051,23 @@ class StockPredictor:
                 # Record history
                 self.training_history.append({
                     'epoch': epoch + 1,
-                    'train_loss': train_loss.item(),
-                    'val_loss': val_loss.item(),
+                    'train_loss': train_loss,
+                    'val_loss': val_loss,
                     'lr': optimizer.param_groups[0]['lr'],
                 })
 
                 # Report progress via callback
                 if progress_callback:
                     try:
-                        progress_callback(epoch + 1, epochs, train_loss.item(), val_loss.item())
+                        progress_callback(epoch + 1, epochs, train_loss, val_loss)
                     except Exception:
                         pass  # Don't let callback errors break training
 
                 # Early stopping check
                 if val_loss < best_val_loss:
-                    best_val_loss = val_loss.item()
+                    best_val_loss = val_loss
                     patience_counter = 0
-                    best_model_state = self.model.state_dict().copy()
+                    best_model_state = snapshot_state(self.model, best_model_state)
                 else:
                     patience_counter += 1
 
@@ -800,7 +1111,14 @@ class StockPredictor:
             'history': self.training_history,
         }
     
-    def predict(self, ohlcv_data: List[dict], smooth_predictions: bool = False) -> dict:
+    def _inference_model(self) -> nn.Module:
+        """self.model as run by predict(), compiled once per model instance"""
+        if self._compiled_for is not self.model:
+            self._compiled_model = compile_for_inference(self.model, self.device)
+            self._compiled_for = self.model
+        return self._compiled_model
+
+    def predict(self, ohlcv_data: OHLCVInput, smooth_predictions: bool = False) -> dict:
         """
         Generate price predictions for the next N days.
 
@@ -819,9 +1137,7 @@ class StockPredictor:
             raise ValueError("Model not trained. Call train() first.")
 
         # Prepare features
-        df = pd.DataFrame(ohlcv_data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df = df.sort_values('timestamp').reset_index(drop=True)
+        df = ohlcv_to_frame(ohlcv_data)
 
         X, feature_names = self._prepare_features(df)
 
@@ -832,21 +1148,16 @@ class StockPredictor:
             except Exception as exc:
                 logger.warning(f"StockPredictor: feature selector transform failed in predict: {exc}")
 
-        # Scale using fitted scaler
-        X_scaled = self.scaler_X.transform(X)
-
-        # Get the last sequence
+        # Scale the last sequence using the fitted scaler
         seq_len = self.model_metadata.get('sequence_length', settings.sequence_length)
-        if len(X_scaled) < seq_len:
-            raise ValueError(f"Need at least {seq_len} data points")
-
-        last_sequence = X_scaled[-seq_len:]
-        X_input = torch.FloatTensor(last_sequence).unsqueeze(0).to(self.device)
+        last_sequence = scaled_window(self.scaler_X, X, seq_len)
+        X_input = input_tensor(last_sequence, self.device)
+        model = self._inference_model()
 
         # Deterministic forward pass for point estimates
         self.model.eval()
-        with torch.no_grad():
-            predictions_scaled = self.model(X_input).cpu().numpy()[0]
+        with inference_context(self.device):
+            predictions_scaled = model(X_input).float().cpu().numpy()[0]
 
         # Inverse transform to get actual prices
         predictions_raw = self.scaler_y.inverse_transform(
@@ -859,8 +1170,9 @@ class StockPredictor:
         # how far each day's forecast may deviate from current price.
         # Bound grows with sqrt(t) for multi-day horizons.
         # ----------------------------------------------------------------
-        current_price = ohlcv_data[-1]['close']
-        closes = pd.Series([d['close'] for d in ohlcv_data])
+        raw_closes = ohlcv_column(ohlcv_data, 'close')
+        current_price = float(raw_closes[-1])
+        closes = pd.Series(raw_closes)
         returns = closes.pct_change().dropna()
         if len(returns) > 5:
             # 60-day window matches the default sequence_length; shorter histories use all available data
@@ -900,19 +1212,19 @@ class StockPredictor:
         # measure prediction variance, replacing the previous heuristic.
         # 20 samples balance confidence accuracy vs. inference latency.
         # ----------------------------------------------------------------
-        mc_predictions = []
         self.model.train()  # Enable dropout
         n_mc_samples = 20  # Stochastic forward passes for uncertainty estimation
-        with torch.no_grad():
-            for _ in range(n_mc_samples):
-                mc_pred = self.model(X_input).cpu().numpy()[0]
-                mc_raw = self.scaler_y.inverse_transform(
-                    mc_pred.reshape(-1, 1)
-                ).flatten()
-                mc_predictions.append(mc_raw)
+        # All samples go through as one batch: dropout masks are drawn per
+        # batch element, so each row is an independent pass at the cost of one
+        with inference_context(self.device):
+            mc_scaled = model(
+                X_input.expand(n_mc_samples, -1, -1)
+            ).float().cpu().numpy()
         self.model.eval()
 
-        mc_preds = np.array(mc_predictions)  # (n_mc_samples, forecast_days)
+        mc_preds = self.scaler_y.inverse_transform(
+            mc_scaled.reshape(-1, 1)
+        ).reshape(mc_scaled.shape)  # (n_mc_samples, forecast_days)
         mc_std = mc_preds.std(axis=0)       # per-day std
 
         confidences = []
@@ -927,7 +1239,7 @@ class StockPredictor:
             confidences.append(confidence)
 
         # Generate dates for predictions
-        last_date = pd.to_datetime(ohlcv_data[-1]['timestamp'], unit='ms')
+        last_date = pd.to_datetime(ohlcv_column(ohlcv_data, 'timestamp')[-1], unit='ms')
         prediction_dates = [
             (last_date + pd.Timedelta(days=i + 1)).isoformat()
             for i in range(len(predictions))
@@ -960,8 +1272,14 @@ class StockPredictor:
         os.makedirs(settings.model_dir, exist_ok=True)
         path = path or os.path.join(settings.model_dir, f"{self.symbol}_model.pt")
         
+        model_state = self.model.state_dict()
+        if settings.checkpoint_fp16:
+            # Half the bytes to write, read and copy to the device; load()'s
+            # load_state_dict casts them back into the FP32 parameters
+            model_state = {k: v.half() if v.is_floating_point() else v for k, v in model_state.items()}
+        
         save_dict = {
-            'model_state': self.model.state_dict(),
+            'model_state': model_state,
             'scaler_X': self.scaler_X,
             'scaler_y': self.scaler_y,
             'feature_names': self.feature_names,
@@ -975,7 +1293,7 @@ class StockPredictor:
             'use_feature_selection': self.use_feature_selection,
         }
         
-        torch.save(save_dict, path)
+        save_checkpoint(save_dict, path)
         return path
 
     @staticmethod
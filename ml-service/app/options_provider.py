@@ -13,6 +13,10 @@ which data source was used.
 import logging
 from typing import Optional
 
+from .options_emittent import fetch_emittent_warrants
+from .options_yahoo import fetch_yahoo_options
+from .warrant_pricing import CHAIN_FIELDS, DEFAULT_EXPIRY_DAYS, default_strikes, price_warrant_grids
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,8 +54,6 @@ async def fetch_options_chain(
     # 1. Yahoo Finance (if not forcing another source)
     if force_source in (None, 'yahoo'):
         try:
-            from .options_yahoo import fetch_yahoo_options
-            
             logger.info(f"Trying Yahoo Finance for {symbol}...")
             sources_tried.append('yahoo')
             
@@ -69,8 +71,6 @@ async def fetch_options_chain(
     # 2. Emittenten-API / SocGen (if not forcing another source)
     if force_source in (None, 'emittent'):
         try:
-            from .options_emittent import fetch_emittent_warrants
-            
             logger.info(f"Trying Emittenten-API for {symbol}...")
             sources_tried.append('emittent')
             
@@ -111,94 +111,43 @@ def _generate_theoretical_chain(
     Generate a theoretical chain using Black-Scholes.
     This is the existing functionality, repackaged in unified format.
     """
-    from .warrant_pricing import price_warrant
-
     S = underlying_price
     sigma = volatility
     r = risk_free_rate
 
     # Auto-generate strikes: ±30% around ATM
-    if S >= 500:
-        step = 25
-    elif S >= 100:
-        step = 10
-    elif S >= 50:
-        step = 5
-    elif S >= 10:
-        step = 2
-    else:
-        step = 0.5
-
-    center = round(S / step) * step
-    strikes = []
-    for i in range(-8, 9):
-        k = round(center + i * step, 2)
-        if k > 0:
-            strikes.append(k)
-
-    expiry_days = [14, 30, 60, 90, 180, 365]
-
-    calls = []
-    puts = []
-
-    for days in expiry_days:
-        for K in strikes:
-            try:
-                call_result = price_warrant(S, K, days, sigma, r, 'call', ratio)
-                put_result = price_warrant(S, K, days, sigma, r, 'put', ratio)
-
-                call_entry = {
-                    "strike": K,
-                    "days": days,
-                    "optionType": "call",
-                    "expiryDate": "",
-                    "lastPrice": call_result.warrant_price,
-                    "bid": 0,
-                    "ask": 0,
-                    "volume": 0,
-                    "openInterest": 0,
-                    "impliedVolatility": sigma,
-                    "moneyness": call_result.moneyness,
-                    "inTheMoney": call_result.moneyness == 'ITM',
-                    "price": call_result.warrant_price,
-                    "intrinsic": call_result.intrinsic_value,
-                    "timeValue": call_result.time_value,
-                    "delta": call_result.greeks.delta,
-                    "gamma": call_result.greeks.gamma,
-                    "theta": call_result.greeks.theta,
-                    "vega": call_result.greeks.vega,
-                    "leverage": call_result.leverage_ratio,
-                    "breakEven": call_result.break_even,
-                    "source": "theoretical",
-                }
-                put_entry = {
-                    "strike": K,
-                    "days": days,
-                    "optionType": "put",
-                    "expiryDate": "",
-                    "lastPrice": put_result.warrant_price,
-                    "bid": 0,
-                    "ask": 0,
-                    "volume": 0,
-                    "openInterest": 0,
-                    "impliedVolatility": sigma,
-                    "moneyness": put_result.moneyness,
-                    "inTheMoney": put_result.moneyness == 'ITM',
-                    "price": put_result.warrant_price,
-                    "intrinsic": put_result.intrinsic_value,
-                    "timeValue": put_result.time_value,
-                    "delta": put_result.greeks.delta,
-                    "gamma": put_result.greeks.gamma,
-                    "theta": put_result.greeks.theta,
-                    "vega": put_result.greeks.vega,
-                    "leverage": put_result.leverage_ratio,
-                    "breakEven": put_result.break_even,
-                    "source": "theoretical",
-                }
-                calls.append(call_entry)
-                puts.append(put_entry)
-            except Exception:
-                pass
+    strikes = default_strikes(S)
+    expiry_days = list(DEFAULT_EXPIRY_DAYS)
+
+    grids = price_warrant_grids(S, strikes, expiry_days, sigma, r, ratio)
+    cells = [(days, K) for days in expiry_days for K in strikes]
+
+    def _entries(option_type: str) -> list:
+        grid = grids[option_type]
+        columns = {key: grid[name].ravel().tolist() for key, name in CHAIN_FIELDS.items()}
+        entries = []
+        for n, (days, K) in enumerate(cells):
+            price = columns["price"][n]
+            moneyness = columns["moneyness"][n]
+            entry = {
+                "strike": K,
+                "days": days,
+                "optionType": option_type,
+                "expiryDate": "",
+                "lastPrice": price,
+                "bid": 0,
+                "ask": 0,
+                "volume": 0,
+                "openInterest": 0,
+                "impliedVolatility": sigma,
+                "moneyness": moneyness,
+                "inTheMoney": moneyness == 'ITM',
+            }
+            for key, values in columns.items():
+                entry[key] = values[n]
+            entry["source"] = "theoretical"
+            entries.append(entry)
+        return entries
 
     return {
         "success": True,
@@ -209,6 +158,6 @@ def _generate_theoretical_chain(
         "ratio": ratio,
         "strikes": strikes,
         "expiry_days": expiry_days,
-        "calls": calls,
-        "puts": puts,
+        "calls": _entries('call'),
+        "puts": _entries('put'),
     }
@@ -0,0 +1,91 @@
+"""
+Prediction Result Cache
+
+Dashboards re-request the forecast for the same symbol and the same candle
+history every few seconds until a new candle arrives. This cache answers
+those repeats without running the forward passes again.
+
+The point forecast is a function of (model, candles), but the confidence
+values come from Monte Carlo dropout, which draws fresh dropout masks on
+every call. A cached result therefore freezes one MC sample: repeats within
+the TTL (ML_PREDICT_CACHE_TTL, 0 disables the cache) return the same
+confidences instead of a new draw.
+
+Entries are keyed by symbol, requested model type and a hash of the candle
+array, and only count as hits for the very predictor object that produced
+them: retraining, deleting or evicting a model never serves stale forecasts.
+They hold that predictor through a weak reference, so a cached forecast never
+keeps an evicted model's weights (or its VRAM) alive.
+"""
+
+import hashlib
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, Optional[str], bytes]
+
+
+class PredictionCache:
+    """
+    LRU mapping of (symbol, model type, candle hash) → predict() result with
+    a TTL. Accessed from the event loop only.
+
+    Args:
+        maxsize: Maximum number of cached results.
+        ttl: Seconds a result is served for; 0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[CacheKey, Tuple[weakref.ref, float, dict]]" = OrderedDict()
+
+    @staticmethod
+    def key(symbol: str, model_type: Optional[str], data: np.ndarray) -> CacheKey:
+        digest = hashlib.blake2b(np.ascontiguousarray(data).data, digest_size=16).digest()
+        return symbol, model_type, digest
+
+    def get(self, key: CacheKey, predictor: object) -> Optional[dict]:
+        """The cached result for ``key`` if ``predictor`` produced it and it is fresh."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        owner, expires_at, result = entry
+        if owner() is not predictor or time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: CacheKey, predictor: object, result: dict) -> None:
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        stale = [k for k, (owner, expires_at, _) in self._entries.items()
+                 if expires_at <= now or owner() is None]
+        for k in stale:
+            del self._entries[k]
+        self._entries[key] = (weakref.ref(predictor), now + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard_symbol(self, symbol: str) -> None:
+        """Drop every cached result for ``symbol``, e.g. when its models are evicted."""
+        for k in [k for k in self._entries if k[0] == symbol]:
+            del self._entries[k]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,197 @@
+"""
+Bounded Predictor Cache
+
+Keeps loaded predictors (LSTM / Transformer / Ensemble) in memory with
+least-recently-used eviction, so a long-running service that sees many
+symbols does not accumulate models until the GPU runs out of memory. The
+cache is capped by entry count and, optionally, by the bytes of model
+weights it holds.
+
+Each symbol also gets two ``asyncio.Lock`` objects: one so concurrent first
+requests for the same symbol load the checkpoint from disk only once, and one
+serializing predictions on that symbol's models. They are separate so a cold
+load never queues behind in-flight predictions, or vice versa. Locks are held
+weakly and disappear once no request holds or waits on them, so symbols from
+404 requests do not accumulate.
+"""
+
+import asyncio
+import logging
+import weakref
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# empty_cache() synchronizes the device and makes the next model load go back
+# to cudaMalloc, so cached-but-unused VRAM is only handed back to the driver
+# once there is enough of it to matter to other processes.
+_RELEASE_MIN_IDLE_BYTES = 256 * 1024 ** 2
+
+
+def _weight_modules(pred: object) -> List[torch.nn.Module]:
+    """torch modules holding ``pred``'s weights (an ensemble's are its sub-models')."""
+    module = getattr(pred, "model", None)
+    if isinstance(module, torch.nn.Module):
+        return [module]
+    modules = []
+    for attr in ("lstm_predictor", "transformer_predictor"):
+        sub = getattr(pred, attr, None)
+        if sub is not None:
+            modules.extend(_weight_modules(sub))
+    return modules
+
+
+def _module_nbytes(module: torch.nn.Module) -> int:
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class PredictorCache:
+    """
+    LRU mapping of cache key → predictor.
+
+    Supports the dict operations main.py relies on (``in``, ``[]``, ``get``,
+    ``del``, ``items``). Reads via ``[]`` / ``get`` mark an entry as recently
+    used; ``items()`` and ``in`` do not.
+
+    ``version`` changes whenever an entry is added, replaced, evicted or
+    removed, so callers can cache data derived from the cached set.
+
+    Args:
+        maxsize: Maximum number of predictors kept in memory.
+        max_bytes: Maximum bytes of model weights (parameters and buffers)
+            across all entries; weights shared between an ensemble and its
+            cached sub-models count once. 0 disables the byte limit. The most
+            recently added entry is always kept, even if it alone is larger.
+        on_discard: Called with the key of every entry that is evicted,
+            replaced or removed, so caches derived from a predictor can drop
+            their data with it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 16,
+        max_bytes: int = 0,
+        on_discard: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.on_discard = on_discard
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._inference_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._version = 0
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __getitem__(self, key: str) -> object:
+        pred = self._entries[key]
+        self._entries.move_to_end(key)
+        return pred
+
+    def get(self, key: str, default: Optional[object] = None) -> Optional[object]:
+        if key not in self._entries:
+            return default
+        return self[key]
+
+    def __setitem__(self, key: str, pred: object) -> None:
+        previous = self._entries.pop(key, None)
+        self._entries[key] = pred
+        self._version += 1
+        replaced = previous is not None and previous is not pred
+        del previous
+        dropped = [key] if replaced else []
+        while len(self._entries) > self.maxsize:
+            old_key, _ = self._entries.popitem(last=False)
+            logger.info(f"PredictorCache: evicting {old_key} (maxsize={self.maxsize})")
+            dropped.append(old_key)
+        if self.max_bytes:
+            while len(self._entries) > 1 and self.nbytes() > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                logger.info(f"PredictorCache: evicting {old_key} (max_bytes={self.max_bytes})")
+                dropped.append(old_key)
+        if dropped:
+            self._discarded(dropped)
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+        self._version += 1
+        self._discarded([key])
+
+    def nbytes(self) -> int:
+        """Bytes of model weights held by the cached predictors."""
+        modules = {id(m): m for pred in self._entries.values() for m in _weight_modules(pred)}
+        return sum(_module_nbytes(m) for m in modules.values())
+
+    def items(self) -> List[Tuple[str, object]]:
+        """Snapshot of (key, predictor) pairs, least recently used first."""
+        return list(self._entries.items())
+
+    def clear(self) -> None:
+        keys = list(self._entries)
+        self._entries.clear()
+        self._version += 1
+        self._discarded(keys)
+
+    # ------------------------------------------------------------------
+    # Concurrency
+    # ------------------------------------------------------------------
+
+    def lock(self, symbol: str) -> asyncio.Lock:
+        """Per-symbol lock guarding get-or-load sequences."""
+        lock = self._locks.get(symbol)
+        if lock is None:
+            lock = self._locks[symbol] = asyncio.Lock()
+        return lock
+
+    def inference_lock(self, symbol: str) -> asyncio.Lock:
+        """Per-symbol lock serializing predict() on the symbol's (shared) models."""
+        lock = self._inference_locks.get(symbol)
+        if lock is None:
+            lock = self._inference_locks[symbol] = asyncio.Lock()
+        return lock
+
+    # ------------------------------------------------------------------
+    # Memory release
+    # ------------------------------------------------------------------
+
+    def _discarded(self, keys: List[str]) -> None:
+        if self.on_discard is not None:
+            for key in keys:
+                self.on_discard(key)
+        self._release()
+
+    @staticmethod
+    def _release() -> None:
+        """Return VRAM held by dropped predictors to the CUDA driver."""
+        # Nothing to release if this process never touched CUDA
+        if not torch.cuda.is_initialized():
+            return
+        idle = torch.cuda.memory_reserved() - torch.cuda.memory_allocated()
+        if idle >= _RELEASE_MIN_IDLE_BYTES:
+            logger.debug(f"PredictorCache: releasing {idle / 1024 ** 2:.0f} MiB of cached VRAM")
+            torch.cuda.empty_cache()
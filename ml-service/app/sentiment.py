@@ -8,18 +8,36 @@ Model: ProsusAI/finbert (https://huggingface.co/ProsusAI/finbert)
 Labels: positive, negative, neutral
 """
 
+import asyncio
+import bisect
+import hashlib
 import torch
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import logging
+import os
+import re
+import threading
+
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
 # Lazy load transformers to avoid startup delay if not needed
 _tokenizer = None
 _model = None
+# INT8 ONNX Runtime session for FinBERT classification on CPU (FINBERT_ONNX);
+# when set it replaces _model's forward pass, _model still serves embed_batch
+_ort_session = None
 _model_loaded = False
 _load_error: Optional[str] = None
+# True while a load is in progress (reported so /health can show "warming up")
+_loading = False
+# Endpoints call into this module from worker threads; serialize the first load
+_load_lock = threading.Lock()
+# Status snapshot served to /health; rebuilt only when the load state changes
+_status_cache: Optional[Dict] = None
 
 
 @dataclass
@@ -37,7 +55,7 @@ def _load_model() -> Tuple[bool, Optional[str]]:
     Lazy load the FinBERT model and tokenizer.
     Returns (success, error_message)
     """
-    global _tokenizer, _model, _model_loaded, _load_error
+    global _tokenizer, _model, _model_loaded, _load_error, _status_cache, _loading, _ort_session
     
     if _model_loaded:
         return True, None
@@ -45,38 +63,140 @@ def _load_model() -> Tuple[bool, Optional[str]]:
     if _load_error:
         return False, _load_error
     
-    try:
-        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    with _load_lock:
+        if _model_loaded:
+            return True, None
+        if _load_error:
+            return False, _load_error
+
+        _loading = True
+        _status_cache = None
+        try:
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
         
-        logger.info("Loading FinBERT model (this may take a moment on first run)...")
+            logger.info("Loading FinBERT model (this may take a moment on first run)...")
         
-        model_name = "ProsusAI/finbert"
+            model_name = "ProsusAI/finbert"
         
-        # Load tokenizer and model
-        _tokenizer = AutoTokenizer.from_pretrained(model_name)
-        _model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            # Load tokenizer and model
+            _tokenizer = AutoTokenizer.from_pretrained(model_name)
+            _model = AutoModelForSequenceClassification.from_pretrained(model_name)
         
-        # Move to GPU if available
-        if torch.cuda.is_available():
-            _model = _model.cuda()
-            logger.info(f"FinBERT loaded on GPU: {torch.cuda.get_device_name(0)}")
-        else:
-            logger.info("FinBERT loaded on CPU")
+            # Move to GPU if available
+            if torch.cuda.is_available():
+                _model = _model.cuda()
+                logger.info(f"FinBERT loaded on GPU: {torch.cuda.get_device_name(0)}")
+            else:
+                logger.info("FinBERT loaded on CPU")
         
-        # Set to evaluation mode
-        _model.eval()
+            # Set to evaluation mode
+            _model.eval()
+            if settings.finbert_quantize:
+                _model = _reduce_precision(_model)
+            if settings.finbert_onnx and not next(_model.parameters()).is_cuda:
+                _ort_session = _load_onnx_session(model_name)
         
-        _model_loaded = True
-        return True, None
+            _model_loaded = True
+            return True, None
         
+        except ImportError as e:
+            _load_error = f"Transformers library not installed: {e}"
+            logger.error(_load_error)
+            return False, _load_error
+        except Exception as e:
+            _load_error = f"Failed to load FinBERT model: {e}"
+            logger.error(_load_error)
+            return False, _load_error
+        finally:
+            # Clear the flag before invalidating, or a status read in between
+            # would re-cache "loading" for good
+            _loading = False
+            _status_cache = None
+
+
+def _reduce_precision(model):
+    """
+    FP16 on CUDA; dynamic INT8 quantization of all Linear layers on CPU, where
+    inference is bound by moving FP32 weights. Falls back to the FP32 model if
+    quantization is unavailable in this torch build.
+    """
+    if next(model.parameters()).is_cuda:
+        logger.info("FinBERT running in FP16")
+        return model.half()
+    try:
+        quantized = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    except Exception as e:
+        logger.warning(f"FinBERT INT8 quantization failed, keeping FP32: {e}")
+        return model
+    logger.info("FinBERT Linear layers quantized to INT8")
+    return quantized
+
+
+def _load_onnx_session(model_name: str):
+    """
+    INT8 ONNX Runtime session for FinBERT, or None to keep the PyTorch path.
+
+    The model is exported, graph-optimized (attention/LayerNorm fusion) and
+    dynamically quantized once with optimum; the result is cached under
+    ``MODEL_DIR/finbert-onnx`` so later starts only load the file.
+    """
+    export_dir = os.path.join(settings.model_dir, "finbert-onnx")
+    quantized_path = os.path.join(export_dir, "model_optimized_quantized.onnx")
+    try:
+        import onnxruntime as ort
+
+        if not os.path.exists(quantized_path):
+            from optimum.onnxruntime import (
+                ORTModelForSequenceClassification,
+                ORTOptimizer,
+                ORTQuantizer,
+            )
+            from optimum.onnxruntime.configuration import (
+                AutoQuantizationConfig,
+                OptimizationConfig,
+            )
+
+            logger.info(f"Exporting FinBERT to ONNX in {export_dir} (one-time)...")
+            ort_model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+            ORTOptimizer.from_pretrained(ort_model).optimize(
+                save_dir=export_dir,
+                optimization_config=OptimizationConfig(optimization_level=2),
+            )
+            ORTQuantizer.from_pretrained(export_dir, file_name="model_optimized.onnx").quantize(
+                save_dir=export_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(
+                    is_static=False, per_channel=False
+                ),
+            )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Same CPU budget as torch (TORCH_NUM_THREADS)
+        options.intra_op_num_threads = torch.get_num_threads()
+        options.inter_op_num_threads = 1
+        session = ort.InferenceSession(
+            quantized_path, options, providers=["CPUExecutionProvider"]
+        )
     except ImportError as e:
-        _load_error = f"Transformers library not installed: {e}"
-        logger.error(_load_error)
-        return False, _load_error
+        logger.warning(f"FinBERT ONNX Runtime unavailable, using PyTorch: {e}")
+        return None
     except Exception as e:
-        _load_error = f"Failed to load FinBERT model: {e}"
-        logger.error(_load_error)
-        return False, _load_error
+        logger.warning(f"FinBERT ONNX export/load failed, using PyTorch: {e}")
+        return None
+    logger.info("FinBERT running on ONNX Runtime (INT8)")
+    return session
+
+
+def _forward_logits(inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+    """Classification logits for tokenized inputs (ONNX Runtime or PyTorch)."""
+    if _ort_session is not None:
+        feed = {i.name: inputs[i.name].numpy() for i in _ort_session.get_inputs()
+                if i.name in inputs}
+        return torch.from_numpy(_ort_session.run(["logits"], feed)[0])
+    with torch.no_grad():
+        return _model(**inputs).logits
 
 
 def is_model_available() -> bool:
@@ -85,13 +205,23 @@ def is_model_available() -> bool:
 
 
 def get_model_status() -> Dict:
-    """Get the status of the FinBERT model"""
-    return {
-        "loaded": _model_loaded,
-        "error": _load_error,
-        "device": "cuda" if _model_loaded and next(_model.parameters()).is_cuda else "cpu" if _model_loaded else None,
-        "model_name": "ProsusAI/finbert"
-    }
+    """
+    Get the status of the FinBERT model.
+
+    The snapshot is cached because /health is polled at high frequency and the
+    status only changes when _load_model() runs.
+    """
+    global _status_cache
+    if _status_cache is None:
+        _status_cache = {
+            "loaded": _model_loaded,
+            "loading": _loading,
+            "error": _load_error,
+            "device": "cuda" if _model_loaded and next(_model.parameters()).is_cuda else "cpu" if _model_loaded else None,
+            "backend": ("onnxruntime" if _ort_session is not None else "torch") if _model_loaded else None,
+            "model_name": "ProsusAI/finbert"
+        }
+    return dict(_status_cache)
 
 
 _FINBERT_LABELS = ['positive', 'negative', 'neutral']
@@ -113,6 +243,48 @@ def _result_from_probs(text: str, probs) -> SentimentResult:
     )
 
 
+def _to_model_device(inputs: Dict[str, torch.Tensor]) -> Dict[str, torch.Tensor]:
+    """
+    Move tokenized inputs to the model's device. On CUDA the host tensors are
+    pinned so the copies are queued asynchronously instead of blocking the
+    thread until the GPU has drained its work.
+    """
+    device = next(_model.parameters()).device
+    if device.type != "cuda":
+        return inputs
+    return {k: v.pin_memory().to(device, non_blocking=True) for k, v in inputs.items()}
+
+
+def _tokenize_batch(batch_texts: List[str]) -> Dict[str, torch.Tensor]:
+    inputs = _tokenizer(
+        batch_texts,
+        return_tensors="pt",
+        truncation=True,
+        max_length=_FINBERT_MAX_TOKENS,
+        padding=True,
+    )
+    return _to_model_device(dict(inputs))
+
+
+def _pad_batch(encodings: Dict[str, list], indices: List[int]) -> Dict[str, torch.Tensor]:
+    """
+    Right-pad already tokenized texts into model inputs, equivalent to
+    re-tokenizing them with ``padding=True`` but without a second tokenizer pass.
+    """
+    width = max(len(encodings["input_ids"][i]) for i in indices)
+    inputs = {}
+    for name, pad_value in (("input_ids", _tokenizer.pad_token_id),
+                            ("attention_mask", 0), ("token_type_ids", 0)):
+        if name not in encodings:
+            continue
+        column = encodings[name]
+        inputs[name] = torch.tensor(
+            [column[i] + [pad_value] * (width - len(column[i])) for i in indices],
+            dtype=torch.long,
+        )
+    return _to_model_device(inputs)
+
+
 def _predict_chunked(text: str):
     """
     Tokenize `text` with overlapping 512-token windows and return a single (3,)
@@ -130,14 +302,11 @@ def _predict_chunked(text: str):
         padding=True,
     )
     # Strip non-model fields produced by return_overflowing_tokens
-    model_inputs = {k: v for k, v in inputs.items()
-                    if k in ('input_ids', 'attention_mask', 'token_type_ids')}
-    if next(_model.parameters()).is_cuda:
-        model_inputs = {k: v.cuda() for k, v in model_inputs.items()}
+    model_inputs = _to_model_device({k: v for k, v in inputs.items()
+                                     if k in ('input_ids', 'attention_mask', 'token_type_ids')})
 
-    with torch.no_grad():
-        logits = _model(**model_inputs).logits
-        chunk_probs = torch.nn.functional.softmax(logits, dim=-1).cpu().numpy()
+    logits = _forward_logits(model_inputs)
+    chunk_probs = torch.nn.functional.softmax(logits.float(), dim=-1).cpu().numpy()
     # (n_chunks, 3) → confidence-weighted mean
     if chunk_probs.shape[0] == 1:
         return chunk_probs[0]
@@ -147,12 +316,57 @@ def _predict_chunked(text: str):
     return (chunk_probs * confidences[:, None]).sum(axis=0) / confidences.sum()
 
 
+# ============== Result cache ==============
+
+# The same headlines are scored over and over (every watchlist refresh), so
+# finished results are memoized. FinBERT's tokenizer is uncased and ignores
+# surrounding whitespace, which makes strip()+lower() a lossless normalization.
+_RESULT_CACHE_SIZE = settings.finbert_cache_size
+
+_result_cache: "OrderedDict[bytes, SentimentResult]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _cache_key(text: str) -> bytes:
+    # Hash instead of storing the text: article bodies can be many KB each
+    return hashlib.blake2b(text.strip().lower().encode("utf-8"), digest_size=16).digest()
+
+
+def _cache_get(key: bytes, text: str) -> Optional[SentimentResult]:
+    with _result_cache_lock:
+        cached = _result_cache.get(key)
+        if cached is None:
+            return None
+        _result_cache.move_to_end(key)
+    # Fresh object per caller, echoing the caller's own text
+    return replace(cached, text=text[:200], probabilities=dict(cached.probabilities))
+
+
+def _cache_put(key: bytes, result: SentimentResult) -> None:
+    with _result_cache_lock:
+        _result_cache[key] = result
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+
+def clear_result_cache() -> None:
+    """Drop all memoized sentiment results."""
+    with _result_cache_lock:
+        _result_cache.clear()
+
+
 def analyze_sentiment(text: str) -> Optional[SentimentResult]:
     """
     Analyze sentiment of a single text using FinBERT. Texts longer than 512
     tokens are split into overlapping windows and aggregated (confidence-
     weighted mean) instead of being silently truncated.
     """
+    key = _cache_key(text)
+    cached = _cache_get(key, text)
+    if cached is not None:
+        return cached
+
     success, error = _load_model()
     if not success:
         logger.warning(f"FinBERT not available: {error}")
@@ -160,15 +374,55 @@ def analyze_sentiment(text: str) -> Optional[SentimentResult]:
 
     try:
         agg_probs = _predict_chunked(text)
-        return _result_from_probs(text, agg_probs)
+        result = _result_from_probs(text, agg_probs)
     except Exception as e:
         logger.error(f"Error analyzing sentiment: {e}")
         return None
+    _cache_put(key, result)
+    return result
+
+
+# Neutral prefilter (FINBERT_NEUTRAL_PREFILTER): short texts without a single
+# polarity cue are answered as neutral without a FinBERT forward pass. Word
+# stems follow the finance sentiment lexicons FinBERT is usually compared to;
+# a hit on any of them, a percentage or a currency amount sends the text to
+# the model, so the filter only ever skips the model for boilerplate.
+_PREFILTER_MAX_CHARS = 160
+_POLARITY_CUES = re.compile(
+    r"%|[$€£¥]|\b(?:"
+    r"gain|rise|rising|rose|rall|surg|soar|jump|climb|beat|upgrad|outperform|"
+    r"bull|boost|strong|record|profit|growth|grow|grew|expan|recover|rebound|"
+    r"top|high|up|raise|buy|win|won|approv|success|exceed|surpass|optimis|"
+    r"fall|fell|drop|declin|slump|plung|tumbl|sink|sank|miss|downgrad|"
+    r"underperform|bear|weak|loss|lose|lost|cut|low|down|sell|crash|"
+    r"bankrupt|default|lawsuit|fraud|investigat|recall|layoff|warn|risk|"
+    r"concern|fear|pessimis|halt|delay|fine|penalt|debt"
+    r")",
+    re.IGNORECASE,
+)
+_PREFILTER_NEUTRAL_PROBS = {"positive": 0.05, "negative": 0.05, "neutral": 0.9}
+
+
+def _prefilter_neutral(text: str) -> Optional[SentimentResult]:
+    """Neutral result for cue-free boilerplate, None if FinBERT must decide."""
+    if len(text) > _PREFILTER_MAX_CHARS or _POLARITY_CUES.search(text):
+        return None
+    return SentimentResult(
+        text=text[:200],
+        sentiment="neutral",
+        score=0.0,
+        confidence=_PREFILTER_NEUTRAL_PROBS["neutral"],
+        probabilities=dict(_PREFILTER_NEUTRAL_PROBS),
+    )
 
 
 def analyze_batch(texts: List[str], batch_size: int = 8) -> List[Optional[SentimentResult]]:
     """
     Analyze sentiment of multiple texts in batches for efficiency.
+
+    Cached texts are answered without touching the model; only the misses
+    (deduplicated) go through FinBERT. With FINBERT_NEUTRAL_PREFILTER, short
+    texts without any polarity cue are answered as neutral as well.
     
     Args:
         texts: List of texts to analyze
@@ -177,6 +431,57 @@ def analyze_batch(texts: List[str], batch_size: int = 8) -> List[Optional[Sentim
     Returns:
         List of SentimentResult objects (None for failed analyses)
     """
+    keys = [_cache_key(t) for t in texts]
+    results: List[Optional[SentimentResult]] = [_cache_get(k, t) for k, t in zip(keys, texts)]
+
+    if settings.finbert_neutral_prefilter:
+        results = [r if r is not None else _prefilter_neutral(t) for r, t in zip(results, texts)]
+
+    miss_positions: Dict[bytes, List[int]] = {}
+    for i, result in enumerate(results):
+        if result is None:
+            miss_positions.setdefault(keys[i], []).append(i)
+    if not miss_positions:
+        return results
+
+    miss_texts = [texts[positions[0]] for positions in miss_positions.values()]
+    miss_results = _analyze_batch_uncached(miss_texts, batch_size)
+
+    for (key, positions), result in zip(miss_positions.items(), miss_results):
+        if result is None:
+            continue
+        _cache_put(key, result)
+        results[positions[0]] = result
+        for i in positions[1:]:
+            results[i] = replace(result, text=texts[i][:200],
+                                 probabilities=dict(result.probabilities))
+    return results
+
+
+# Batches never straddle one of these token lengths, so one long text cannot
+# make a batch of short ones pay its padded sequence length in every MatMul
+_LENGTH_BUCKETS = (32, 64, 128, 256, _FINBERT_MAX_TOKENS)
+
+
+def _length_batches(sorted_indices: List[int], lengths: List[int], batch_size: int) -> List[List[int]]:
+    """Split length-sorted text indices into batches of at most ``batch_size`` within one bucket."""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_bucket = None
+    for i in sorted_indices:
+        bucket = bisect.bisect_left(_LENGTH_BUCKETS, lengths[i])
+        if current and (len(current) == batch_size or bucket != current_bucket):
+            batches.append(current)
+            current = []
+        current_bucket = bucket
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _analyze_batch_uncached(texts: List[str], batch_size: int) -> List[Optional[SentimentResult]]:
+    """Run FinBERT on every text (no cache lookup)."""
     success, error = _load_model()
     if not success:
         logger.warning(f"FinBERT not available: {error}")
@@ -184,34 +489,42 @@ def analyze_batch(texts: List[str], batch_size: int = 8) -> List[Optional[Sentim
     
     # Pre-classify each text by token length. Short texts use the fast batched
     # path; long ones go through _predict_chunked individually so chunks stay
-    # contiguous to their source text.
-    lengths = [len(_tokenizer.encode(t, add_special_tokens=True, truncation=False))
-               for t in texts]
+    # contiguous to their source text. The short texts' batches are padded
+    # from these encodings, so every text is tokenized once.
+    encodings = _tokenizer(texts, add_special_tokens=True, truncation=False)
+    lengths = [len(ids) for ids in encodings["input_ids"]]
 
     results: List[Optional[SentimentResult]] = [None] * len(texts)
     short_indices = [i for i, n in enumerate(lengths) if n <= _FINBERT_MAX_TOKENS]
     long_indices = [i for i, n in enumerate(lengths) if n > _FINBERT_MAX_TOKENS]
+    # Length-sorted batches need less padding and keep headline-sized texts
+    # together so they fit the fixed-shape CUDA graphs
+    short_indices.sort(key=lengths.__getitem__)
 
     # Fast batched path for texts that fit
-    for i in range(0, len(short_indices), batch_size):
-        idx_slice = short_indices[i:i + batch_size]
-        batch_texts = [texts[j] for j in idx_slice]
+    batches = _length_batches(short_indices, lengths, batch_size)
+    inputs = None
+    for b, idx_slice in enumerate(batches):
         try:
-            inputs = _tokenizer(
-                batch_texts,
-                return_tensors="pt",
-                truncation=True,
-                max_length=_FINBERT_MAX_TOKENS,
-                padding=True,
-            )
-            if next(_model.parameters()).is_cuda:
-                inputs = {k: v.cuda() for k, v in inputs.items()}
-            with torch.no_grad():
-                logits = _model(**inputs).logits
-                probs = torch.nn.functional.softmax(logits, dim=-1).cpu().numpy()
+            if inputs is None:
+                inputs = _pad_batch(encodings, idx_slice)
+            logits = _graph_logits(inputs)
+            if logits is None:
+                logits = _forward_logits(inputs)
+            probs = torch.nn.functional.softmax(logits.float(), dim=-1)
+            # CUDA kernels run asynchronously: pad and upload the next batch
+            # while this one is still computing, before .cpu() waits
+            inputs = None
+            if b + 1 < len(batches):
+                try:
+                    inputs = _pad_batch(encodings, batches[b + 1])
+                except Exception:
+                    pass  # retried (and logged) in the next iteration
+            probs = probs.cpu().numpy()
             for k, text_idx in enumerate(idx_slice):
                 results[text_idx] = _result_from_probs(texts[text_idx], probs[k])
         except Exception as e:
+            inputs = None
             logger.error(f"Error analyzing batch: {e}")
             # leave as None for failed slots
 
@@ -226,6 +539,217 @@ def analyze_batch(texts: List[str], batch_size: int = 8) -> List[Optional[Sentim
     return results
 
 
+# ============== CUDA graphs for short batches ==============
+
+# Headline-sized batches are padded to one of a few fixed shapes and run by
+# replaying a captured CUDA graph, which removes per-kernel launch overhead.
+# Batch sizes match analyze_batch's default and the micro-batcher's maximum.
+_CUDA_GRAPH_SEQ_LEN = 128
+_CUDA_GRAPH_BATCH_SIZES = (1, 8, 32)
+_CUDA_GRAPH_INPUTS = ("input_ids", "attention_mask", "token_type_ids")
+
+_cuda_graphs: Dict[int, "_FinBERTGraph"] = {}
+# Static buffers are shared, so replays are serialized
+_cuda_graph_lock = threading.Lock()
+# Only one preload captures at a time
+_cuda_graph_capture_lock = threading.Lock()
+_cuda_graphs_failed = False
+
+
+class _FinBERTGraph:
+    """FinBERT forward pass captured for a fixed (batch_size, 128) input shape."""
+
+    def __init__(self, model, batch_size: int) -> None:
+        device = next(model.parameters()).device
+        shape = (batch_size, _CUDA_GRAPH_SEQ_LEN)
+        self.inputs = {name: torch.zeros(shape, dtype=torch.long, device=device)
+                       for name in _CUDA_GRAPH_INPUTS}
+
+        with torch.no_grad():
+            # Warm up on a side stream so lazy cuBLAS/allocator init is not captured
+            stream = torch.cuda.Stream()
+            stream.wait_stream(torch.cuda.current_stream())
+            with torch.cuda.stream(stream):
+                for _ in range(3):
+                    model(**self.inputs)
+            torch.cuda.current_stream().wait_stream(stream)
+
+            self.graph = torch.cuda.CUDAGraph()
+            # Request threads keep running FinBERT eagerly while a preload
+            # captures; only this thread's calls may invalidate the capture
+            with torch.cuda.graph(self.graph, capture_error_mode="thread_local"):
+                self.logits = model(**self.inputs).logits
+
+    def run(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        n, seq_len = inputs["input_ids"].shape
+        for name, buf in self.inputs.items():
+            buf.zero_()
+            if name in inputs:
+                buf[:n, :seq_len].copy_(inputs[name])
+        self.graph.replay()
+        return self.logits[:n].clone()
+
+
+def _cuda_graphs_enabled() -> bool:
+    return (settings.finbert_cuda_graphs and not _cuda_graphs_failed
+            and _model is not None and next(_model.parameters()).is_cuda)
+
+
+def _graph_logits(inputs: Dict[str, torch.Tensor]) -> Optional[torch.Tensor]:
+    """
+    Logits for a tokenized batch via a captured CUDA graph, or None when the
+    batch does not fit a graph shape (or its graph has not been captured by
+    preload_model() yet) and the caller should run the model eagerly.
+    Request threads never capture.
+    """
+    global _cuda_graphs_failed
+    if not _cuda_graphs_enabled():
+        return None
+    n, seq_len = inputs["input_ids"].shape
+    batch_size = next((b for b in _CUDA_GRAPH_BATCH_SIZES if b >= n), None)
+    if seq_len > _CUDA_GRAPH_SEQ_LEN or batch_size is None:
+        return None
+
+    with _cuda_graph_lock:
+        graph = _cuda_graphs.get(batch_size)
+        if graph is None or _cuda_graphs_failed:
+            return None
+        try:
+            return graph.run(inputs)
+        except Exception as e:
+            _cuda_graphs_failed = True
+            _cuda_graphs.clear()
+            logger.warning(f"FinBERT CUDA graphs disabled, running eagerly: {e}")
+            return None
+
+
+def _warm_cuda_graphs() -> None:
+    """
+    Capture all graph shapes; the only place graphs are captured. Replays of
+    already captured shapes are not blocked while the next one is captured.
+    """
+    global _cuda_graphs_failed
+    if not _cuda_graphs_enabled():
+        return
+    with _cuda_graph_capture_lock:
+        try:
+            for batch_size in _CUDA_GRAPH_BATCH_SIZES:
+                if batch_size not in _cuda_graphs:
+                    graph = _FinBERTGraph(_model, batch_size)
+                    with _cuda_graph_lock:
+                        _cuda_graphs[batch_size] = graph
+            logger.info(f"FinBERT CUDA graphs captured for batch sizes {_CUDA_GRAPH_BATCH_SIZES}")
+        except Exception as e:
+            with _cuda_graph_lock:
+                _cuda_graphs_failed = True
+                _cuda_graphs.clear()
+            logger.warning(f"FinBERT CUDA graphs disabled, running eagerly: {e}")
+
+
+# ============== Micro-batching for single-text requests ==============
+
+# Concurrent /analyze calls are coalesced into one analyze_batch() forward pass.
+# An idle worker waits at most _MICROBATCH_MAX_WAIT_S after the first text
+# arrives or until _MICROBATCH_MAX_SIZE texts are queued, whichever comes first.
+# Texts that queued up during the previous forward pass have already waited
+# that long, so a busy worker dispatches them without opening a new window.
+_MICROBATCH_MAX_SIZE = settings.finbert_microbatch_size
+_MICROBATCH_MAX_WAIT_S = settings.finbert_microbatch_wait_ms / 1000
+
+_microbatch_queue: Optional[asyncio.Queue] = None
+_microbatch_worker: Optional[asyncio.Task] = None
+
+
+def _drain_queued(queue: asyncio.Queue, items: list) -> None:
+    while len(items) < _MICROBATCH_MAX_SIZE and not queue.empty():
+        items.append(queue.get_nowait())
+
+
+async def _microbatch_loop(queue: asyncio.Queue) -> None:
+    """Drain the queue in batches and resolve each caller's future."""
+    loop = asyncio.get_running_loop()
+    while True:
+        idle = queue.empty()
+        items = [await queue.get()]
+        try:
+            _drain_queued(queue, items)
+            if idle:
+                deadline = loop.time() + _MICROBATCH_MAX_WAIT_S
+                while len(items) < _MICROBATCH_MAX_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        items.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                    _drain_queued(queue, items)
+
+            texts = [text for text, _ in items]
+            try:
+                results = await asyncio.to_thread(analyze_batch, texts, _MICROBATCH_MAX_SIZE)
+            except Exception as e:
+                logger.error(f"Error in sentiment micro-batch: {e}")
+                results = [None] * len(items)
+
+            for (_, fut), result in zip(items, results):
+                if not fut.done():  # caller may have gone away
+                    fut.set_result(result)
+        finally:
+            # Cancelled with a batch in hand (shutdown): its callers get None
+            # like still-queued ones instead of waiting forever
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_result(None)
+
+
+def start_microbatching() -> None:
+    """
+    Start the batching worker on the running event loop (called from the
+    application lifespan; restarted on demand if it is gone).
+    """
+    global _microbatch_queue, _microbatch_worker
+    loop = asyncio.get_running_loop()
+    if (_microbatch_worker is None or _microbatch_worker.done()
+            or _microbatch_worker.get_loop() is not loop):
+        _microbatch_queue = asyncio.Queue()
+        _microbatch_worker = loop.create_task(_microbatch_loop(_microbatch_queue))
+
+
+async def analyze_sentiment_batched(text: str) -> Optional[SentimentResult]:
+    """
+    Async variant of :func:`analyze_sentiment` that shares a FinBERT forward
+    pass with other concurrent callers. Cached texts are answered directly
+    instead of waiting for the batching window.
+    """
+    cached = _cache_get(_cache_key(text), text)
+    if cached is not None:
+        return cached
+
+    start_microbatching()
+    fut = asyncio.get_running_loop().create_future()
+    await _microbatch_queue.put((text, fut))
+    return await fut
+
+
+async def stop_microbatching() -> None:
+    """Cancel the batching worker (called on application shutdown)."""
+    global _microbatch_queue, _microbatch_worker
+    if _microbatch_worker is not None and not _microbatch_worker.done():
+        _microbatch_worker.cancel()
+        try:
+            await _microbatch_worker
+        except asyncio.CancelledError:
+            pass
+    # Do not leave callers of still-queued texts waiting forever
+    while _microbatch_queue is not None and not _microbatch_queue.empty():
+        _, fut = _microbatch_queue.get_nowait()
+        if not fut.done():
+            fut.set_result(None)
+    _microbatch_queue = None
+    _microbatch_worker = None
+
+
 def embed_batch(texts: List[str], batch_size: int = 16) -> Optional[List[List[float]]]:
     """
     Return CLS-token embeddings (768-dim) from FinBERT's BERT backbone for each
@@ -244,15 +768,7 @@ def embed_batch(texts: List[str], batch_size: int = 16) -> Optional[List[List[fl
     for i in range(0, len(texts), batch_size):
         batch = texts[i:i + batch_size]
         try:
-            inputs = _tokenizer(
-                batch,
-                return_tensors="pt",
-                truncation=True,
-                max_length=_FINBERT_MAX_TOKENS,
-                padding=True,
-            )
-            if next(_model.parameters()).is_cuda:
-                inputs = {k: v.cuda() for k, v in inputs.items()}
+            inputs = _tokenize_batch(batch)
             with torch.no_grad():
                 # BertForSequenceClassification → backbone is .bert
                 outputs = _model.bert(
@@ -260,7 +776,7 @@ def embed_batch(texts: List[str], batch_size: int = 16) -> Optional[List[List[fl
                     attention_mask=inputs.get("attention_mask"),
                     token_type_ids=inputs.get("token_type_ids"),
                 )
-                cls = outputs.last_hidden_state[:, 0, :].cpu().numpy()
+                cls = outputs.last_hidden_state[:, 0, :].float().cpu().numpy()
             for vec in cls:
                 embeddings.append(vec.tolist())
         except Exception as e:
@@ -271,8 +787,10 @@ def embed_batch(texts: List[str], batch_size: int = 16) -> Optional[List[List[fl
 
 def preload_model() -> bool:
     """
-    Preload the model (useful for startup).
+    Preload the model (useful for startup) and capture its CUDA graphs.
     Returns True if successful.
     """
     success, _ = _load_model()
+    if success:
+        _warm_cuda_graphs()
     return success
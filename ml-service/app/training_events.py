@@ -0,0 +1,76 @@
+"""
+Training Progress Broadcasting
+
+Fans training-status updates out to Server-Sent-Events subscribers so
+clients can follow a training job without polling
+``/api/ml/train/{symbol}/status``.
+
+Updates may be published from the training worker thread; delivery to the
+subscriber queues always happens on the event loop.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which a training job emits no further updates
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class TrainingEventBroker:
+    """
+    Per-status-key publish/subscribe of training status snapshots.
+
+    Each subscriber gets a bounded queue. Every snapshot is a full status, so
+    when a slow client falls behind, the oldest pending snapshot is dropped
+    rather than blocking the publisher.
+
+    Args:
+        queue_size: Maximum number of undelivered snapshots per subscriber.
+    """
+
+    def __init__(self, queue_size: int = 32) -> None:
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, key: str) -> asyncio.Queue:
+        """Register a subscriber for ``key``; must be called on the event loop."""
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(key, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, key: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(key)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[key]
+
+    def subscriber_count(self, key: str) -> int:
+        return len(self._subscribers.get(key, ()))
+
+    def publish(self, key: str, status: dict) -> None:
+        """Send a copy of ``status`` to all subscribers of ``key`` (thread-safe)."""
+        loop = self._loop
+        if loop is None or key not in self._subscribers:
+            return
+        snapshot = dict(status)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(key, snapshot)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, key, snapshot)
+
+    def _deliver(self, key: str, snapshot: dict) -> None:
+        for queue in list(self._subscribers.get(key, ())):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
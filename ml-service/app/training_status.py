@@ -0,0 +1,106 @@
+"""
+Bounded Training Status Store
+
+Holds the status dict of every training job (keyed ``SYMBOL_modeltype``,
+e.g. ``AAPL_lstm`` or ``AAPL_transformer``). Finished jobs expire after a TTL
+and the store is capped in size, so a long-running service does not keep the
+status of every job it ever ran. Jobs that are still starting or training are never dropped.
+"""
+
+import logging
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .training_events import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingStatusStore:
+    """
+    Mapping of status key → status dict with TTL expiry and a size cap.
+
+    Supports the dict operations main.py relies on (``in``, ``[]``, ``get``,
+    ``items``). Status dicts are stored by reference, so in-place progress
+    updates (``store[key]["progress"] = 50``) keep working.
+
+    Args:
+        maxsize: Maximum number of finished jobs kept.
+        ttl: Seconds a job stays visible after its status was last set.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 86400.0) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Insertion order == order of last write, oldest first
+        self._entries: Dict[str, Tuple[dict, float]] = {}
+
+    @staticmethod
+    def _is_active(status: dict) -> bool:
+        return status.get("status") not in TERMINAL_STATUSES
+
+    def _expired(self, status: dict, written_at: float, now: float) -> bool:
+        return not self._is_active(status) and now - written_at > self.ttl
+
+    def _prune(self, now: float) -> None:
+        for key, (status, written_at) in list(self._entries.items()):
+            if self._expired(status, written_at, now):
+                del self._entries[key]
+        finished = [k for k, (status, _) in self._entries.items() if not self._is_active(status)]
+        for key in finished[:max(0, len(finished) - self.maxsize)]:
+            logger.debug(f"TrainingStatusStore: evicting {key} (maxsize={self.maxsize})")
+            del self._entries[key]
+
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+
+    def __setitem__(self, key: str, status: dict) -> None:
+        now = time.monotonic()
+        self._entries.pop(key, None)
+        self._entries[key] = (status, now)
+        self._prune(now)
+
+    def update(self, key: str, fields: dict) -> dict:
+        """
+        Merge ``fields`` into the status of ``key`` in place and restamp it.
+
+        Readers holding the status dict see the change as one ``dict.update``
+        rather than a swap to a new object, and the TTL of a job that just
+        finished counts from now. Returns the (possibly new) status dict.
+        """
+        status = self.get(key)
+        if status is None:
+            status = {}
+        status.update(fields)
+        self[key] = status
+        return status
+
+    def __getitem__(self, key: str) -> dict:
+        status, written_at = self._entries[key]
+        if self._expired(status, written_at, time.monotonic()):
+            del self._entries[key]
+            raise KeyError(key)
+        return status
+
+    def get(self, key: str, default: Optional[dict] = None) -> Optional[dict]:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self.items())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([key for key, _ in self.items()])
+
+    def items(self) -> List[Tuple[str, dict]]:
+        """Snapshot of non-expired (key, status) pairs, oldest first."""
+        self._prune(time.monotonic())
+        return [(key, status) for key, (status, _) in self._entries.items()]
@@ -0,0 +1,144 @@
+"""
+Out-of-Process Training
+
+With ``ML_TRAINING_SUBPROCESS=true`` training jobs run in dedicated,
+spawned worker processes instead of threads of the API process. A worker
+builds the predictor, trains it and saves the checkpoint; the API process
+then loads the checkpoint like any other. Training's Python-level work no
+longer competes with request handling for the GIL, and on GPU hosts it gets
+its own CUDA context.
+
+Epoch progress comes back over a multiprocessing queue and is handed to the
+job's ``progress_callback`` on a drain thread, the same thread-side contract
+as in-process training.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+import torch.multiprocessing as mp
+
+from .ohlcv import OHLCVInput
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int, float, float], None]
+
+# Set in the worker process by _init_worker
+_progress_queue = None
+
+
+def _init_worker(queue) -> None:
+    global _progress_queue
+    _progress_queue = queue
+
+
+def _report_progress(
+    status_key: str, epoch: int, total_epochs: int, train_loss: float, val_loss: float
+) -> None:
+    _progress_queue.put((status_key, epoch, total_epochs, float(train_loss), float(val_loss)))
+
+
+def train_and_save(
+    status_key: str,
+    model_type: str,
+    symbol: str,
+    data: OHLCVInput,
+    predictor_kwargs: dict,
+    train_kwargs: dict,
+) -> dict:
+    """Train and save one model; runs in the worker process."""
+    if model_type == "transformer":
+        from .transformer_model import TransformerStockPredictor as predictor_cls
+    else:
+        from .model import StockPredictor as predictor_cls
+    predictor = predictor_cls(symbol, **predictor_kwargs)
+    result = predictor.train(
+        data, progress_callback=functools.partial(_report_progress, status_key), **train_kwargs
+    )
+    predictor.save()
+    return result
+
+
+class TrainingProcess:
+    """
+    Process pool for training jobs, started on first use.
+
+    A worker that dies (e.g. killed for running out of memory) fails the jobs
+    in the pool; the next job starts a fresh pool.
+
+    Args:
+        max_workers: Worker processes, i.e. trainings that can run at once.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._queue = None
+        self._callbacks: Dict[str, ProgressCallback] = {}
+
+    def _ensure_started(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # CUDA cannot be re-initialized in a forked child
+            ctx = mp.get_context("spawn")
+            self._queue = ctx.Queue()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=ctx, initializer=_init_worker, initargs=(self._queue,)
+            )
+            threading.Thread(
+                target=self._drain, args=(self._queue,), name="training-progress", daemon=True
+            ).start()
+            logger.info("TrainingProcess: started training worker pool")
+        return self._pool
+
+    def _drain(self, queue) -> None:
+        while True:
+            item = queue.get()
+            if item is None:
+                return
+            status_key, *progress = item
+            callback = self._callbacks.get(status_key)
+            if callback is None:
+                continue
+            try:
+                callback(*progress)
+            except Exception as exc:
+                logger.warning(f"TrainingProcess: progress callback for {status_key} failed: {exc}")
+
+    async def run(
+        self,
+        status_key: str,
+        model_type: str,
+        symbol: str,
+        data: OHLCVInput,
+        predictor_kwargs: dict,
+        train_kwargs: dict,
+        progress_callback: ProgressCallback,
+    ) -> dict:
+        """Train and save a model in the worker process; returns the training result."""
+        pool = self._ensure_started()
+        self._callbacks[status_key] = progress_callback
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                pool, train_and_save, status_key, model_type, symbol, data,
+                predictor_kwargs, train_kwargs,
+            )
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+        finally:
+            self._callbacks.pop(status_key, None)
+
+    def shutdown(self) -> None:
+        """Stop the worker (cancelling queued jobs) and the progress drain thread."""
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._queue.put(None)
+        self._pool = None
+        self._queue = None
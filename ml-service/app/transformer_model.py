@@ -22,6 +22,7 @@ CUDA Support:
 - Falls back to CPU for inference if needed
 """
 
+import functools
 import math
 import torch
 import torch.nn as nn
@@ -38,6 +39,12 @@ from datetime import datetime
 from .config import settings
 from .cross_asset_features import CrossAssetFeatureProvider
 from .feature_selector import FeatureSelector
+from .model import (
+    add_feature_columns, compile_for_inference, device_tensor, evaluate_loss, feature_matrix,
+    inference_context, input_tensor, save_checkpoint, scaled_window, snapshot_state,
+    stack_windows, technical_indicators, train_epoch, training_grad_scaler,
+)
+from .ohlcv import OHLCVInput, ohlcv_column, ohlcv_to_frame
 
 logger = logging.getLogger(__name__)
 
@@ -110,6 +117,20 @@ class MultiScaleCNN(nn.Module):
         return out
 
 
+@functools.lru_cache(maxsize=None)
+def _tensor_core_width(name: str, width: int, multiple: int = 8) -> int:
+    """
+    Round a configured layer width up to a multiple of ``multiple``. FP16/BF16
+    GEMMs only run on Tensor Cores when their dimensions are multiples of 8;
+    otherwise cuBLAS silently falls back to much slower CUDA-core kernels.
+    Cached so the warning is logged once, not for every predictor.
+    """
+    rounded = -(-width // multiple) * multiple
+    if rounded != width:
+        logger.warning(f"Transformer {name}={width} rounded up to {rounded} (multiple of {multiple})")
+    return rounded
+
+
 class TransformerPricePredictionModel(nn.Module):
     """
     Transformer model for stock price prediction.
@@ -341,12 +362,18 @@ class TransformerStockPredictor:
         self.is_trained = False
         self.training_history: List[dict] = []
         self.model_metadata: dict = {}
+        # compile_for_inference() wrapper and the model instance it wraps
+        self._compiled_model: Optional[nn.Module] = None
+        self._compiled_for: Optional[nn.Module] = None
 
         # Transformer hyperparameters (configurable via env or train() call)
-        self.d_model = int(os.getenv("ML_TRANSFORMER_D_MODEL", "128"))
         self.n_heads = int(os.getenv("ML_TRANSFORMER_N_HEADS", "4"))
+        # d_model must also split evenly across the attention heads
+        self.d_model = _tensor_core_width(
+            "d_model", int(os.getenv("ML_TRANSFORMER_D_MODEL", "128")), math.lcm(8, self.n_heads)
+        )
         self.n_layers = int(os.getenv("ML_TRANSFORMER_N_LAYERS", "3"))
-        self.d_ff = int(os.getenv("ML_TRANSFORMER_D_FF", "256"))
+        self.d_ff = _tensor_core_width("d_ff", int(os.getenv("ML_TRANSFORMER_D_FF", "256")))
         self.transformer_dropout = float(
             os.getenv("ML_TRANSFORMER_DROPOUT", "0.1")
         )
@@ -363,60 +390,10 @@ class TransformerStockPredictor:
 
     def _calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Calculate technical indicators — identical to LSTM version for
+        Calculate technical indicators — shared with the LSTM version for
         consistent feature engineering across model types.
         """
-        df = df.copy()
-
-        # Price returns
-        df["returns"] = df["close"].pct_change()
-        df["log_returns"] = np.log(df["close"] / df["close"].shift(1))
-
-        # Moving averages
-        for window in [5, 10, 20, 50]:
-            df[f"sma_{window}"] = df["close"].rolling(window=window).mean()
-            df[f"ema_{window}"] = df["close"].ewm(span=window).mean()
-            df[f"sma_{window}_ratio"] = df["close"] / df[f"sma_{window}"]
-
-        # RSI
-        delta = df["close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df["rsi"] = 100 - (100 / (1 + rs))
-
-        # MACD
-        ema12 = df["close"].ewm(span=12).mean()
-        ema26 = df["close"].ewm(span=26).mean()
-        df["macd"] = ema12 - ema26
-        df["macd_signal"] = df["macd"].ewm(span=9).mean()
-        df["macd_hist"] = df["macd"] - df["macd_signal"]
-
-        # Bollinger Bands
-        df["bb_middle"] = df["close"].rolling(window=20).mean()
-        bb_std = df["close"].rolling(window=20).std()
-        df["bb_upper"] = df["bb_middle"] + (bb_std * 2)
-        df["bb_lower"] = df["bb_middle"] - (bb_std * 2)
-        df["bb_width"] = (df["bb_upper"] - df["bb_lower"]) / df["bb_middle"]
-        df["bb_position"] = (df["close"] - df["bb_lower"]) / (
-            df["bb_upper"] - df["bb_lower"]
-        )
-
-        # Volume indicators
-        df["volume_sma"] = df["volume"].rolling(window=20).mean()
-        df["volume_ratio"] = df["volume"] / df["volume_sma"]
-
-        # Volatility
-        df["volatility"] = df["returns"].rolling(window=20).std()
-
-        # High-Low range
-        df["hl_range"] = (df["high"] - df["low"]) / df["close"]
-
-        # Price momentum
-        for period in [5, 10, 20]:
-            df[f"momentum_{period}"] = df["close"] / df["close"].shift(period) - 1
-
-        return df
+        return technical_indicators(df)
 
     def _prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
         """Prepare feature matrix from dataframe."""
@@ -433,35 +410,26 @@ class TransformerStockPredictor:
         ]
 
         feature_columns = [c for c in feature_columns if c in df.columns]
-        df_clean = df[feature_columns].dropna()
+        X, keep = feature_matrix(df, feature_columns)
 
         # Optionally enrich with cross-asset features
         if self._cross_asset_provider is not None:
             try:
                 if "timestamp" in df.columns:
-                    dates = pd.to_datetime(df["timestamp"]).iloc[df_clean.index]
+                    dates = pd.to_datetime(df["timestamp"])[keep]
                 else:
-                    dates = df_clean.index
+                    dates = df.index[keep]
                 cross_df = self._cross_asset_provider.get_cross_asset_features(
                     self.symbol, pd.DatetimeIndex(dates)
                 )
                 if cross_df is not None and not cross_df.empty:
-                    cross_df = cross_df.reset_index(drop=True)
-                    df_clean = df_clean.reset_index(drop=True)
-                    min_len = min(len(df_clean), len(cross_df))
-                    df_clean = df_clean.iloc[:min_len].copy()
-                    cross_vals = cross_df.iloc[:min_len]
-                    new_cols = {col: cross_vals[col].values for col in cross_df.columns}
-                    df_clean = df_clean.assign(**new_cols)
-                    for col in cross_df.columns:
-                        if col not in feature_columns:
-                            feature_columns.append(col)
+                    X = add_feature_columns(X, feature_columns, cross_df)
             except Exception as exc:
                 logger.warning(
                     f"TransformerStockPredictor: cross-asset enrichment failed: {exc}"
                 )
 
-        return df_clean.values, [c for c in feature_columns if c in df_clean.columns]
+        return X, feature_columns
 
     def _create_sequences(
         self,
@@ -471,11 +439,11 @@ class TransformerStockPredictor:
         forecast_days: int,
     ) -> Tuple[np.ndarray, np.ndarray]:
         """Create sequences for training."""
-        X_seq, y_seq = [], []
-        for i in range(len(X) - sequence_length - forecast_days + 1):
-            X_seq.append(X[i : i + sequence_length])
-            y_seq.append(y[i + sequence_length : i + sequence_length + forecast_days])
-        return np.array(X_seq), np.array(y_seq)
+        n = len(X) - sequence_length - forecast_days + 1
+        return (
+            stack_windows(X, 0, sequence_length, n, dtype=np.float32),
+            stack_windows(y, sequence_length, forecast_days, n, dtype=np.float32),
+        )
 
     @staticmethod
     def walk_forward_split(
@@ -501,7 +469,7 @@ class TransformerStockPredictor:
 
     def _prepare_all_sequences(
         self,
-        ohlcv_data: List[dict],
+        ohlcv_data: OHLCVInput,
         sequence_length: Optional[int] = None,
         forecast_days: Optional[int] = None,
     ) -> Tuple[np.ndarray, np.ndarray]:
@@ -514,9 +482,7 @@ class TransformerStockPredictor:
         seq_len = sequence_length or settings.sequence_length
         fc_days = forecast_days or settings.forecast_days
 
-        df = pd.DataFrame(ohlcv_data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df = df.sort_values("timestamp").reset_index(drop=True)
+        df = ohlcv_to_frame(ohlcv_data)
 
         X, self.feature_names = self._prepare_features(df)
         close_idx = self.feature_names.index("close")
@@ -558,13 +524,13 @@ class TransformerStockPredictor:
             raise ValueError(
                 f"Not enough samples for seq_len={seq_len}, fc_days={fc_days}; need > {seq_len + fc_days}, got {len(X_scaled)}"
             )
-        X_seq = np.stack([X_scaled[i : i + seq_len] for i in range(n)], axis=0)
-        y_seq = np.stack([y_scaled[i + seq_len : i + seq_len + fc_days] for i in range(n)], axis=0)
+        X_seq = stack_windows(X_scaled, 0, seq_len, n, dtype=np.float32)
+        y_seq = stack_windows(y_scaled, seq_len, fc_days, n, dtype=np.float32)
         return X_seq, y_seq
 
     def prepare_data(
         self,
-        ohlcv_data: List[dict],
+        ohlcv_data: OHLCVInput,
         sequence_length: Optional[int] = None,
         forecast_days: Optional[int] = None,
     ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
@@ -572,9 +538,7 @@ class TransformerStockPredictor:
         seq_len = sequence_length or settings.sequence_length
         fc_days = forecast_days or settings.forecast_days
 
-        df = pd.DataFrame(ohlcv_data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df = df.sort_values("timestamp").reset_index(drop=True)
+        df = ohlcv_to_frame(ohlcv_data)
 
         X, self.feature_names = self._prepare_features(df)
 
@@ -621,35 +585,19 @@ class TransformerStockPredictor:
         y_train_scaled = self.scaler_y.transform(y_train_raw.reshape(-1, 1)).flatten()
         y_val_scaled = self.scaler_y.transform(y_val_raw.reshape(-1, 1)).flatten()
 
-        X_seq_train, _ = self._create_sequences(X_train_scaled, y_train_scaled, seq_len, fc_days)
-        X_seq_val, _ = self._create_sequences(X_val_scaled, y_val_scaled, seq_len, fc_days)
-
-        def _build_targets(y_vals, seq_l, fc_d):
-            targets = []
-            for i in range(len(y_vals) - seq_l - fc_d + 1):
-                targets.append(y_vals[seq_l + i: seq_l + i + fc_d])
-            return np.array(targets)
-
-        y_seq_train = _build_targets(y_train_scaled, seq_len, fc_days)
-        y_seq_val = _build_targets(y_val_scaled, seq_len, fc_days)
+        X_seq_train, y_seq_train = self._create_sequences(X_train_scaled, y_train_scaled, seq_len, fc_days)
+        X_seq_val, y_seq_val = self._create_sequences(X_val_scaled, y_val_scaled, seq_len, fc_days)
 
-        min_train = min(len(X_seq_train), len(y_seq_train))
-        min_val = min(len(X_seq_val), len(y_seq_val))
-        X_seq_train = X_seq_train[:min_train]
-        y_seq_train = y_seq_train[:min_train]
-        X_seq_val = X_seq_val[:min_val]
-        y_seq_val = y_seq_val[:min_val]
-
-        X_train = torch.FloatTensor(X_seq_train).to(self.device)
-        y_train = torch.FloatTensor(y_seq_train).to(self.device)
-        X_val = torch.FloatTensor(X_seq_val).to(self.device)
-        y_val = torch.FloatTensor(y_seq_val).to(self.device)
+        X_train = device_tensor(X_seq_train, self.device)
+        y_train = device_tensor(y_seq_train, self.device)
+        X_val = device_tensor(X_seq_val, self.device)
+        y_val = device_tensor(y_seq_val, self.device)
 
         return X_train, y_train, X_val, y_val
 
     def train(
         self,
-        ohlcv_data: List[dict],
+        ohlcv_data: OHLCVInput,
         epochs: Optional[int] = None,
         learning_rate: Optional[float] = None,
         sequence_length: Optional[int] = None,
@@ -701,6 +649,8 @@ class TransformerStockPredictor:
                 forecast_days=self._train_forecast_days,
             )
             input_size = X_seq.shape[2]
+            # Uploaded once; every fold trains on device-side slices
+            X_all, y_all = device_tensor(X_seq, self.device), device_tensor(y_seq, self.device)
 
             best_overall_val_loss = float("inf")
             best_overall_model_state = None
@@ -708,10 +658,8 @@ class TransformerStockPredictor:
             for fold_idx, (train_sl, val_sl) in enumerate(
                 self.walk_forward_split(len(X_seq))
             ):
-                X_train_f = torch.FloatTensor(X_seq[train_sl]).to(self.device)
-                y_train_f = torch.FloatTensor(y_seq[train_sl]).to(self.device)
-                X_val_f = torch.FloatTensor(X_seq[val_sl]).to(self.device)
-                y_val_f = torch.FloatTensor(y_seq[val_sl]).to(self.device)
+                X_train_f, y_train_f = X_all[train_sl], y_all[train_sl]
+                X_val_f, y_val_f = X_all[val_sl], y_all[val_sl]
 
                 fold_model = TransformerPricePredictionModel(
                     input_size=input_size,
@@ -731,42 +679,37 @@ class TransformerStockPredictor:
                     fold_optimizer, T_0=20, T_mult=2, eta_min=learning_rate * 0.01,
                 )
 
+                fold_grad_scaler = training_grad_scaler(self.device)
+
                 best_fold_loss = float("inf")
                 fold_patience = 0
                 best_fold_state = None
 
                 for epoch in range(epochs):
-                    fold_model.train()
-                    fold_optimizer.zero_grad()
-                    train_pred = fold_model(X_train_f)
-                    train_loss = criterion(train_pred, y_train_f)
-                    train_loss.backward()
-                    torch.nn.utils.clip_grad_norm_(fold_model.parameters(), max_norm=1.0)
-                    fold_optimizer.step()
-                    fold_scheduler.step(epoch + train_loss.item())
-
-                    fold_model.eval()
-                    with torch.no_grad():
-                        val_pred = fold_model(X_val_f)
-                        val_loss = criterion(val_pred, y_val_f)
+                    train_loss = train_epoch(
+                        fold_model, fold_optimizer, criterion, X_train_f, y_train_f,
+                        settings.batch_size, fold_grad_scaler,
+                    )
+                    fold_scheduler.step(epoch + train_loss)
+                    val_loss = evaluate_loss(fold_model, criterion, X_val_f, y_val_f)
 
                     self.training_history.append({
                         "fold": fold_idx + 1,
                         "epoch": epoch + 1,
-                        "train_loss": train_loss.item(),
-                        "val_loss": val_loss.item(),
+                        "train_loss": train_loss,
+                        "val_loss": val_loss,
                         "lr": fold_optimizer.param_groups[0]["lr"],
                     })
                     if progress_callback:
                         try:
-                            progress_callback(epoch + 1, epochs, train_loss.item(), val_loss.item())
+                            progress_callback(epoch + 1, epochs, train_loss, val_loss)
                         except Exception:
                             pass
 
-                    if val_loss.item() < best_fold_loss:
-                        best_fold_loss = val_loss.item()
+                    if val_loss < best_fold_loss:
+                        best_fold_loss = val_loss
                         fold_patience = 0
-                        best_fold_state = {k: v.clone() for k, v in fold_model.state_dict().items()}
+                        best_fold_state = snapshot_state(fold_model, best_fold_state)
                     else:
                         fold_patience += 1
                     if fold_patience >= early_stopping_patience:
@@ -877,34 +820,25 @@ class TransformerStockPredictor:
             optimizer, T_0=20, T_mult=2, eta_min=learning_rate * 0.01
         )
 
+        grad_scaler = training_grad_scaler(self.device)
+
         best_val_loss = float("inf")
         patience_counter = 0
         best_model_state = None
 
         for epoch in range(epochs):
-            # Training phase
-            self.model.train()
-            optimizer.zero_grad()
-
-            train_pred = self.model(X_train)
-            train_loss = criterion(train_pred, y_train)
-
-            train_loss.backward()
-            torch.nn.utils.clip_grad_norm_(self.model.parameters(), max_norm=1.0)
-            optimizer.step()
-            scheduler.step(epoch + train_loss.item())
-
-            # Validation phase
-            self.model.eval()
-            with torch.no_grad():
-                val_pred = self.model(X_val)
-                val_loss = criterion(val_pred, y_val)
+            train_loss = train_epoch(
+                self.model, optimizer, criterion, X_train, y_train,
+                settings.batch_size, grad_scaler,
+            )
+            scheduler.step(epoch + train_loss)
+            val_loss = evaluate_loss(self.model, criterion, X_val, y_val)
 
             self.training_history.append(
                 {
                     "epoch": epoch + 1,
-                    "train_loss": train_loss.item(),
-                    "val_loss": val_loss.item(),
+                    "train_loss": train_loss,
+                    "val_loss": val_loss,
                     "lr": optimizer.param_groups[0]["lr"],
                 }
             )
@@ -912,17 +846,15 @@ class TransformerStockPredictor:
             # Report progress via callback
             if progress_callback:
                 try:
-                    progress_callback(epoch + 1, epochs, train_loss.item(), val_loss.item())
+                    progress_callback(epoch + 1, epochs, train_loss, val_loss)
                 except Exception:
                     pass  # Don't let callback errors break training
 
             # Early stopping
             if val_loss < best_val_loss:
-                best_val_loss = val_loss.item()
+                best_val_loss = val_loss
                 patience_counter = 0
-                best_model_state = {
-                    k: v.clone() for k, v in self.model.state_dict().items()
-                }
+                best_model_state = snapshot_state(self.model, best_model_state)
             else:
                 patience_counter += 1
 
@@ -974,7 +906,14 @@ class TransformerStockPredictor:
             "history": self.training_history,
         }
 
-    def predict(self, ohlcv_data: List[dict]) -> dict:
+    def _inference_model(self) -> nn.Module:
+        """self.model as run by predict(), compiled once per model instance"""
+        if self._compiled_for is not self.model:
+            self._compiled_model = compile_for_inference(self.model, self.device)
+            self._compiled_for = self.model
+        return self._compiled_model
+
+    def predict(self, ohlcv_data: OHLCVInput) -> dict:
         """
         Generate price predictions — same interface as LSTM version.
         Output includes type='transformer' in model_info.
@@ -982,9 +921,7 @@ class TransformerStockPredictor:
         if not self.is_trained or self.model is None:
             raise ValueError("Model not trained. Call train() first.")
 
-        df = pd.DataFrame(ohlcv_data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
-        df = df.sort_values("timestamp").reset_index(drop=True)
+        df = ohlcv_to_frame(ohlcv_data)
 
         X, feature_names = self._prepare_features(df)
 
@@ -997,25 +934,21 @@ class TransformerStockPredictor:
                     f"TransformerStockPredictor: feature selector transform failed in predict: {exc}"
                 )
 
-        X_scaled = self.scaler_X.transform(X)
-
         seq_len = self.model_metadata.get("sequence_length", settings.sequence_length)
-        if len(X_scaled) < seq_len:
-            raise ValueError(f"Need at least {seq_len} data points")
-
-        last_sequence = X_scaled[-seq_len:]
-        X_input = torch.FloatTensor(last_sequence).unsqueeze(0).to(self.device)
+        last_sequence = scaled_window(self.scaler_X, X, seq_len)
+        X_input = input_tensor(last_sequence, self.device)
+        model = self._inference_model()
 
         self.model.eval()
-        with torch.no_grad():
-            predictions_scaled = self.model(X_input).cpu().numpy()[0]
+        with inference_context(self.device):
+            predictions_scaled = model(X_input).float().cpu().numpy()[0]
 
         # Inverse transform
         predictions_raw = self.scaler_y.inverse_transform(
             predictions_scaled.reshape(-1, 1)
         ).flatten()
 
-        current_price = ohlcv_data[-1]["close"]
+        current_price = float(ohlcv_column(ohlcv_data, "close")[-1])
 
         # Progressive sanity-clamp: allow larger moves for longer horizons
         # Day 1: ±3%, Day 7: ±10%, Day 14: ±15%
@@ -1042,19 +975,19 @@ class TransformerStockPredictor:
 
         # Monte Carlo Dropout for confidence estimation
         # Run multiple forward passes with dropout enabled to estimate uncertainty
-        mc_predictions = []
         self.model.train()  # Enable dropout
         n_mc_samples = 10
-        with torch.no_grad():
-            for _ in range(n_mc_samples):
-                mc_pred = self.model(X_input).cpu().numpy()[0]
-                mc_raw = self.scaler_y.inverse_transform(
-                    mc_pred.reshape(-1, 1)
-                ).flatten()
-                mc_predictions.append(mc_raw)
+        # One batched pass: dropout masks are independent per batch row, and
+        # identical rows leave the BatchNorm batch statistics unchanged
+        with inference_context(self.device):
+            mc_scaled = model(
+                X_input.expand(n_mc_samples, -1, -1)
+            ).float().cpu().numpy()
         self.model.eval()  # Disable dropout again
 
-        mc_predictions = np.array(mc_predictions)  # [n_mc, forecast_days]
+        mc_predictions = self.scaler_y.inverse_transform(
+            mc_scaled.reshape(-1, 1)
+        ).reshape(mc_scaled.shape)  # [n_mc, forecast_days]
         mc_std = mc_predictions.std(axis=0)  # Std per day
 
         # Confidence based on MC uncertainty + horizon decay
@@ -1071,7 +1004,7 @@ class TransformerStockPredictor:
             confidence = max(0.3, min(0.95, (mc_confidence * horizon_decay) ** 0.5))
             confidences.append(confidence)
 
-        last_date = pd.to_datetime(ohlcv_data[-1]["timestamp"], unit="ms")
+        last_date = pd.to_datetime(ohlcv_column(ohlcv_data, "timestamp")[-1], unit="ms")
         prediction_dates = [
             (last_date + pd.Timedelta(days=i + 1)).isoformat()
             for i in range(len(predictions))
@@ -1132,7 +1065,7 @@ class TransformerStockPredictor:
             "use_feature_selection": self.use_feature_selection,
         }
 
-        torch.save(save_dict, path)
+        save_checkpoint(save_dict, path)
         logger.info(f"Transformer model saved to {path}")
         return path
 
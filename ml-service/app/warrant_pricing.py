@@ -6,15 +6,20 @@ Provides:
 - Greeks calculation (Delta, Gamma, Theta, Vega, Rho)
 - Implied volatility solver
 - Warrant pricing with ratio adjustment
+- Vectorized strike × expiry grid pricing for option chains
+- Default strike/expiry grids for auto-generated chains
 """
 
+import bisect
 import math
 import numpy as np
 from dataclasses import dataclass, asdict
-from typing import Optional
+from functools import lru_cache
+from scipy.special import ndtr
+from typing import Dict, List, Optional, Sequence
 
 
-# Standard normal CDF & PDF — use math.erf to avoid scipy dependency
+# Scalar standard normal CDF & PDF — math.erf beats a scipy ufunc call per value
 def _norm_cdf(x: float) -> float:
     """Standard normal cumulative distribution function."""
     return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
@@ -156,22 +161,32 @@ def implied_volatility(
     
     Returns None if convergence fails.
     """
-    if T <= 0 or market_price <= 0:
+    if T <= 0 or market_price <= 0 or S <= 0 or K <= 0:
         return None
     
+    # Same arithmetic as black_scholes_price, with the sigma-independent terms
+    # computed once and d1 shared between the price and the vega
+    is_call = option_type == 'call'
+    log_moneyness = math.log(S / K)
+    sqrt_T = math.sqrt(T)
+    disc_K = K * math.exp(-r * T)
+    
     # Initial guess
     sigma = 0.30
     
     for _ in range(max_iterations):
-        price = black_scholes_price(S, K, T, r, sigma, option_type)
-        diff = price - market_price
+        d1 = (log_moneyness + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+        d2 = d1 - sigma * sqrt_T
+        if is_call:
+            price = S * _norm_cdf(d1) - disc_K * _norm_cdf(d2)
+        else:
+            price = disc_K * _norm_cdf(-d2) - S * _norm_cdf(-d1)
+        diff = max(0.0, price) - market_price
         
         if abs(diff) < tolerance:
             return round(sigma, 6)
         
         # Vega for Newton step
-        sqrt_T = math.sqrt(T)
-        d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
         vega = S * sqrt_T * _norm_pdf(d1)
         
         if vega < 1e-10:
@@ -271,6 +286,168 @@ def price_warrant(
     )
 
 
+# Chain response key → price_warrant_grids() array, in response column order.
+# Shared by /warrant/chain and the theoretical options-chain fallback.
+CHAIN_FIELDS = {
+    "price": "warrant_price",
+    "intrinsic": "intrinsic_value",
+    "timeValue": "time_value",
+    "delta": "delta",
+    "gamma": "gamma",
+    "theta": "theta",
+    "vega": "vega",
+    "moneyness": "moneyness",
+    "leverage": "leverage_ratio",
+    "breakEven": "break_even",
+}
+
+
+def price_warrant_grid(
+    S: float,
+    strikes: Sequence[float],
+    days: Sequence[float],
+    sigma: float = 0.30,
+    r: float = 0.03,
+    option_type: str = 'call',
+    ratio: float = 0.1,
+) -> Dict[str, np.ndarray]:
+    """
+    Price a full strike × expiry grid of warrants in one NumPy pass.
+
+    Numerically equivalent to calling :func:`price_warrant` per cell (same
+    rounding), but without per-cell interpreter overhead. Every returned
+    array has shape ``(len(days), len(strikes))``.
+    """
+    return price_warrant_grids(S, strikes, days, sigma, r, ratio, (option_type,))[option_type]
+
+
+def price_warrant_grids(
+    S: float,
+    strikes: Sequence[float],
+    days: Sequence[float],
+    sigma: float = 0.30,
+    r: float = 0.03,
+    ratio: float = 0.1,
+    option_types: Sequence[str] = ('call', 'put'),
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    :func:`price_warrant_grid` for several option types at once, keyed by
+    option type. d1/d2, discounting and the normal CDF/PDF evaluations are
+    shared, so a full call + put chain costs little more than one side.
+    """
+    K = np.asarray(strikes, dtype=np.float64)[None, :]
+    T = np.maximum(np.asarray(days, dtype=np.float64) / 365.0, 0.0)[:, None]
+    K, T = np.broadcast_arrays(K, T)
+    live = (T > 0) & (sigma > 0) & (S > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrt_T = np.sqrt(T)
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+        d2 = d1 - sigma * sqrt_T
+        disc_K = K * np.exp(-r * T)
+        nd1 = np.exp(-0.5 * d1 * d1) / math.sqrt(2.0 * math.pi)
+        cdf_d1 = ndtr(d1)
+        gamma = np.round(np.where(live, nd1 / (S * sigma * sqrt_T), 0.0), 6)
+        vega = np.round(np.where(live, S * sqrt_T * nd1 / 100.0, 0.0), 6)
+        theta_decay = -(S * nd1 * sigma) / (2.0 * sqrt_T)
+
+    return {
+        option_type: _price_grid_side(
+            S, K, T, sigma, r, ratio, option_type == 'call', live,
+            d1, d2, disc_K, cdf_d1, gamma, vega, theta_decay,
+        )
+        for option_type in option_types
+    }
+
+
+def _price_grid_side(S, K, T, sigma, r, ratio, is_call, live,
+                     d1, d2, disc_K, cdf_d1, gamma, vega, theta_decay) -> Dict[str, np.ndarray]:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if is_call:
+            cdf_d2 = ndtr(d2)
+            bs = S * cdf_d1 - disc_K * cdf_d2
+            delta = cdf_d1
+            theta_rate = -r * disc_K * cdf_d2
+            rho = T * disc_K * cdf_d2 / 100.0
+            expiry_price = np.maximum(0.0, S - K)
+            expiry_delta = np.where(S > K, 1.0, 0.0)
+        else:
+            cdf_neg_d2 = ndtr(-d2)
+            bs = disc_K * cdf_neg_d2 - S * ndtr(-d1)
+            delta = cdf_d1 - 1.0
+            theta_rate = r * disc_K * cdf_neg_d2
+            rho = -T * disc_K * cdf_neg_d2 / 100.0
+            expiry_price = np.maximum(0.0, K - S)
+            expiry_delta = np.where(S < K, -1.0, 0.0)
+
+        theta = (theta_decay + theta_rate) / 365.0
+
+    # Mirror black_scholes_price/calculate_greeks edge handling
+    if S > 0:
+        bs = np.where(T > 0, np.where(live, np.maximum(0.0, bs), 0.0), expiry_price)
+    else:
+        bs = np.where(T > 0, 0.0, expiry_price)
+    delta = np.round(np.where(live, delta, expiry_delta), 6)
+    theta = np.round(np.where(live, theta, 0.0), 6)
+    rho = np.round(np.where(live, rho, 0.0), 6)
+
+    warrant_price = bs * ratio
+    intrinsic = (np.maximum(0.0, S - K) if is_call else np.maximum(0.0, K - S)) * ratio
+    time_value = np.maximum(0.0, warrant_price - intrinsic)
+
+    if is_call:
+        moneyness = np.where(S > K * 1.02, 'ITM', np.where(S < K * 0.98, 'OTM', 'ATM'))
+        break_even = K + warrant_price / ratio
+    else:
+        moneyness = np.where(S < K * 0.98, 'ITM', np.where(S > K * 1.02, 'OTM', 'ATM'))
+        break_even = K - warrant_price / ratio
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        leverage = np.where(
+            warrant_price > 0, np.abs(delta) * S * ratio / warrant_price, 0.0
+        )
+        annual_cost = np.where(
+            (intrinsic > 0) & (T > 0), (time_value / intrinsic) * (1.0 / T) * 100.0, 0.0
+        )
+
+    return {
+        'warrant_price': np.round(warrant_price, 4),
+        'intrinsic_value': np.round(intrinsic, 4),
+        'time_value': np.round(time_value, 4),
+        'delta': np.round(delta * ratio, 6),
+        'gamma': np.round(gamma * ratio, 6),
+        'theta': np.round(theta * ratio, 6),
+        'vega': np.round(vega * ratio, 6),
+        'rho': np.round(rho * ratio, 6),
+        'moneyness': moneyness,
+        'leverage_ratio': np.round(leverage, 2),
+        'break_even': np.round(break_even, 4),
+        'implied_annual_cost': np.round(annual_cost, 2),
+    }
+
+
+# Auto-generated chain strike spacing by underlying price: below 10 → 0.5,
+# from 10 → 2, from 50 → 5, from 100 → 10, from 500 → 25
+_STRIKE_STEP_THRESHOLDS = (10, 50, 100, 500)
+_STRIKE_STEPS = (0.5, 2, 5, 10, 25)
+# ±8 steps around the at-the-money strike (about ±30%)
+_STRIKE_OFFSETS = {step: np.arange(-8, 9) * step for step in _STRIKE_STEPS}
+
+DEFAULT_EXPIRY_DAYS = (14, 30, 60, 90, 180, 365)
+
+
+@lru_cache(maxsize=256)
+def _default_strikes(center: float, step: float) -> tuple:
+    strikes = np.round(center + _STRIKE_OFFSETS[step], 2)
+    return tuple(strikes[strikes > 0].tolist())
+
+
+def default_strikes(S: float) -> List[float]:
+    """17 strikes (±8 steps) around ``S``, dropping non-positive ones."""
+    step = _STRIKE_STEPS[bisect.bisect_right(_STRIKE_STEP_THRESHOLDS, S)]
+    return list(_default_strikes(round(S / step) * step, step))
+
+
 def to_dict(result: WarrantPriceResult) -> dict:
     """Convert WarrantPriceResult to JSON-serializable dict."""
     d = asdict(result)
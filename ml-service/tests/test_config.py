@@ -33,3 +33,72 @@ class TestMLServiceConfig:
         assert settings.transformer_n_layers == 3
         assert settings.transformer_d_ff == 256
         assert settings.transformer_dropout == 0.1
+
+    def test_finbert_quantize_default(self):
+        settings = Settings()
+        assert settings.finbert_quantize is True
+
+    def test_cors_origins_parsed_from_comma_list(self):
+        assert Settings(cors_origin="*").cors_origins == {"*"}
+        settings = Settings(cors_origin="https://a.example, https://b.example,")
+        assert settings.cors_origins == {"https://a.example", "https://b.example"}
+
+    def test_preload_symbols_parsed_from_comma_list(self):
+        assert Settings(preload_models="").preload_symbols == []
+        assert Settings(preload_models="aapl, MSFT,").preload_symbols == ["AAPL", "MSFT"]
+
+    def test_device_info_cpu_mode(self):
+        settings = Settings(use_cuda="false")
+        info = settings.device_info
+        assert info["device"] == "cpu"
+        assert info["cuda_enabled"] is False
+        assert info["cuda_mode"] == "false"
+
+    def test_device_is_memoized(self):
+        settings = Settings(use_cuda="false")
+        assert settings.device is settings.device
+
+    def test_cuda_not_probed_when_disabled(self, monkeypatch):
+        import torch
+        from app import config
+
+        def fail():
+            raise AssertionError("CUDA probed despite USE_CUDA=false")
+
+        config._cuda_available.cache_clear()
+        monkeypatch.setattr(torch.cuda, "is_available", fail)
+        try:
+            settings = Settings(use_cuda="false")
+            assert settings.device.type == "cpu"
+            assert settings.device_info["cuda_available"] is False
+        finally:
+            config._cuda_available.cache_clear()
+
+    def test_cuda_device_properties_queried_once(self, monkeypatch):
+        import torch
+        from app import config
+
+        calls = []
+
+        class Props:
+            total_memory = 8e9
+
+        def props(idx):
+            calls.append(idx)
+            return Props()
+
+        monkeypatch.setattr(torch.cuda, "get_device_properties", props)
+        monkeypatch.setattr(torch.cuda, "get_device_name", lambda idx: "Fake GPU")
+        monkeypatch.setattr(torch.cuda, "device_count", lambda: 1)
+        monkeypatch.setattr(config, "_cuda_available", lambda: True)
+        config._cuda_device_properties.cache_clear()
+        try:
+            settings = Settings(use_cuda="auto")
+            first = settings.device_info
+            second = settings.device_info
+        finally:
+            config._cuda_device_properties.cache_clear()
+
+        assert first["cuda_memory_total"] == "8.00 GB"
+        assert second["cuda_device_name"] == "Fake GPU"
+        assert calls == [0]
@@ -0,0 +1,82 @@
+"""Tests for keeping a cached ensemble in use across sub-model retraining."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from app import main  # noqa: E402
+from app.predictor_cache import PredictorCache  # noqa: E402
+
+AUTO_ORDER = ["ensemble", "transformer", "lstm"]
+
+
+class _FakePredictor:
+    device = "cpu"
+
+    def __init__(self, symbol, **kwargs):
+        self.symbol = symbol
+        self.is_trained = False
+        self.model_metadata = {"symbol": symbol}
+
+    def train(self, data, progress_callback=None, **kwargs):
+        self.is_trained = True
+        return {"success": True}
+
+    def save(self):
+        pass
+
+
+class _FakeLSTM(_FakePredictor):
+    pass
+
+
+class _FakeTransformer(_FakePredictor):
+    pass
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = PredictorCache(maxsize=8)
+    monkeypatch.setattr(main, "predictors", cache)
+    monkeypatch.setattr(main, "_lstm_cls", lambda: _FakeLSTM)
+    monkeypatch.setattr(main, "_transformer_cls", lambda: _FakeTransformer)
+    monkeypatch.setattr(main.settings, "training_subprocess", False)
+    monkeypatch.setattr(main.settings, "model_dir", str(tmp_path))
+    return cache
+
+
+def _trained(cls):
+    pred = cls("AAPL")
+    pred.is_trained = True
+    return pred
+
+
+def _retrain_lstm():
+    return main._run_training(
+        "AAPL_lstm", "AAPL", None, 1, 0.001, 10, 5, False, "lstm", False, False, False,
+    )
+
+
+class TestEnsembleRefresh:
+    def test_retrained_lstm_keeps_auto_detect_on_ensemble(self, cache):
+        old_lstm, transformer = _trained(_FakeLSTM), _trained(_FakeTransformer)
+        ens = main._ensemble_cls()("AAPL")
+        ens.lstm_predictor, ens.transformer_predictor = old_lstm, transformer
+        cache["AAPL_ensemble"] = ens
+
+        async def scenario():
+            await _retrain_lstm()
+            return await main._get_or_load_predictor("AAPL", None, AUTO_ORDER)
+
+        pred, model_type = asyncio.run(scenario())
+
+        assert model_type == "ensemble"
+        assert pred.lstm_predictor is cache["AAPL_lstm"] is not old_lstm
+        assert pred.transformer_predictor is transformer
+
+    def test_no_ensemble_without_cache_entry_or_both_checkpoints(self, cache):
+        asyncio.run(_retrain_lstm())
+        assert "AAPL_ensemble" not in cache
+        assert main._lookup_cached_predictor("AAPL", None, AUTO_ORDER)[1] == "lstm"
@@ -1,8 +1,17 @@
-"""Tests for resilient model checkpoint loading helpers."""
+"""Tests for resilient model checkpoint loading and data preparation helpers."""
 
+import numpy as np
+import pandas as pd
+import pytest
 import torch
 
-from app.model import StockPredictor
+from sklearn.preprocessing import MinMaxScaler
+
+from app.model import (
+    LSTMModel, StockPredictor, add_feature_columns, clear_indicator_cache, compile_for_inference,
+    evaluate_loss, feature_matrix, input_tensor, save_checkpoint, scaled_window, snapshot_state,
+    stack_windows, technical_indicators, train_epoch, training_grad_scaler,
+)
 from app.config import settings
 
 
@@ -39,3 +48,217 @@ class TestModelLoadingHelpers:
         result = StockPredictor._resolve_forecast_days(save_dict)
 
         assert result == settings.forecast_days
+
+
+class TestCheckpointPrecision:
+    def test_fp16_checkpoint_loads_into_fp32_model(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "checkpoint_fp16", True)
+        predictor = StockPredictor("TEST", use_cuda=False)
+        predictor.model = LSTMModel(input_size=3, output_size=14)
+        predictor.feature_names = ["a", "b", "c"]
+        predictor.scaler_X, predictor.scaler_y = MinMaxScaler(), MinMaxScaler()
+        predictor.model_metadata = {"forecast_days": 14}
+        predictor.is_trained = True
+        path = predictor.save(str(tmp_path / "TEST_model.pt"))
+
+        stored = torch.load(path, weights_only=False)["model_state"]
+        assert all(v.dtype == torch.float16 for v in stored.values())
+
+        loaded = StockPredictor("TEST", use_cuda=False)
+        assert loaded.load(path)
+        for name, param in loaded.model.state_dict().items():
+            assert param.dtype == torch.float32
+            torch.testing.assert_close(param, predictor.model.state_dict()[name], rtol=1e-3, atol=1e-3)
+
+
+class TestStackWindows:
+    def test_matches_python_slicing(self):
+        X = np.arange(40.0).reshape(20, 2)
+        y = np.arange(20.0)
+        n = len(X) - 5 - 3 + 1
+
+        X_seq = stack_windows(X, 0, 5, n)
+        y_seq = stack_windows(y, 5, 3, n)
+
+        np.testing.assert_array_equal(X_seq, np.array([X[i:i + 5] for i in range(n)]))
+        np.testing.assert_array_equal(y_seq, np.array([y[i + 5:i + 8] for i in range(n)]))
+        assert X_seq.flags["C_CONTIGUOUS"]
+
+    def test_too_short_input_gives_empty_array(self):
+        assert stack_windows(np.zeros((4, 2)), 0, 5, 0).shape == (0,)
+
+    def test_dtype_converts_in_the_window_copy(self):
+        X = np.linspace(0.0, 1.0, 40).reshape(20, 2)
+        X_seq = stack_windows(X, 0, 5, 16, dtype=np.float32)
+        assert X_seq.dtype == np.float32 and X_seq.flags["C_CONTIGUOUS"]
+        np.testing.assert_array_equal(X_seq, stack_windows(X, 0, 5, 16).astype(np.float32))
+
+
+class TestTechnicalIndicators:
+    def test_matches_pandas_reference(self):
+        rng = np.random.default_rng(0)
+        close = pd.Series(100 * np.cumprod(1 + rng.normal(0, 0.01, 120)))
+        df = pd.DataFrame({
+            "open": close, "high": close * 1.01, "low": close * 0.99, "close": close,
+            "volume": rng.integers(1_000, 2_000, 120),
+        })
+        out = technical_indicators(df)
+
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        bb_std = close.rolling(window=20).std()
+        expected = {
+            "log_returns": np.log(close / close.shift(1)),
+            "sma_50_ratio": close / close.rolling(window=50).mean(),
+            "rsi": 100 - (100 / (1 + gain / loss)),
+            "macd_signal": (close.ewm(span=12).mean() - close.ewm(span=26).mean()).ewm(span=9).mean(),
+            "bb_position": (close - (close.rolling(window=20).mean() - 2 * bb_std)) / (4 * bb_std),
+            "volatility": close.pct_change().rolling(window=20).std(),
+            "momentum_20": close / close.shift(20) - 1,
+        }
+        for name, values in expected.items():
+            pd.testing.assert_series_equal(out[name], values, check_names=False)
+        assert list(out.columns[:5]) == list(df.columns)
+
+    def test_repeated_candles_are_served_from_cache(self, monkeypatch):
+        import app.model as model_module
+
+        clear_indicator_cache()
+        calls = []
+        compute = model_module._technical_indicators
+        monkeypatch.setattr(
+            model_module, "_technical_indicators", lambda df: calls.append(1) or compute(df)
+        )
+        close = np.linspace(100.0, 110.0, 80)
+        df = pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close,
+                           "volume": np.full(80, 1e6)})
+
+        first = technical_indicators(df)
+        first["extra"] = 1.0
+        second = technical_indicators(df.copy())
+        assert len(calls) == 1
+        assert "extra" not in second.columns
+        pd.testing.assert_frame_equal(second, first.drop(columns="extra"))
+
+        df.loc[79, "close"] = 111.0
+        technical_indicators(df)
+        assert len(calls) == 2
+
+
+class TestFeatureMatrix:
+    def test_matches_dropna_values(self):
+        df = pd.DataFrame({"a": [np.nan, 1.0, 2.0, 3.0], "b": [0.0, np.nan, 5.0, 6.0], "c": [9, 9, 9, 9]})
+        X, keep = feature_matrix(df, ["a", "b"])
+        np.testing.assert_array_equal(X, df[["a", "b"]].dropna().values)
+        np.testing.assert_array_equal(keep, [False, False, True, True])
+
+    def test_add_feature_columns_appends_and_overwrites(self):
+        X = np.arange(6.0).reshape(3, 2)
+        names = ["a", "b"]
+        extra = pd.DataFrame({"b": [10.0, 11.0], "z": [20.0, 21.0]})
+        out = add_feature_columns(X, names, extra)
+        assert names == ["a", "b", "z"]
+        np.testing.assert_array_equal(out, [[0.0, 10.0, 20.0], [2.0, 11.0, 21.0]])
+
+
+class TestTrainEpoch:
+    def test_mini_batches_reduce_loss(self):
+        torch.manual_seed(0)
+        X = torch.randn(100, 4)
+        y = X @ torch.tensor([[1.0], [-2.0], [0.5], [3.0]])
+        model = torch.nn.Linear(4, 1)
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.05)
+        criterion = torch.nn.MSELoss()
+        scaler = training_grad_scaler("cpu")
+        assert not scaler.is_enabled()
+
+        before = evaluate_loss(model, criterion, X, y)
+        for _ in range(5):
+            train_loss = train_epoch(model, optimizer, criterion, X, y, 16, scaler)
+        assert isinstance(train_loss, float)
+        assert evaluate_loss(model, criterion, X, y) < before / 2
+        assert not model.training
+
+
+class TestSnapshotState:
+    def test_snapshot_is_detached_from_later_updates(self):
+        model = torch.nn.Linear(3, 2)
+        best = snapshot_state(model)
+        expected = {k: v.clone() for k, v in best.items()}
+        with torch.no_grad():
+            model.weight.add_(1.0)
+        for name, value in expected.items():
+            torch.testing.assert_close(best[name], value)
+
+        again = snapshot_state(model, best)
+        assert again is best
+        torch.testing.assert_close(best["weight"], model.weight.detach())
+        model.load_state_dict(expected)
+        torch.testing.assert_close(model.weight.detach(), expected["weight"])
+
+
+class TestCompileForInference:
+    def test_failed_compile_falls_back_to_eager_without_global_suppression(self, monkeypatch):
+        import torch._dynamo
+
+        class Broken(torch.nn.Module):
+            def forward(self, x):
+                raise RuntimeError("backend failed")
+
+        monkeypatch.setattr(settings, "torch_compile", True)
+        monkeypatch.setattr(settings, "torch_compile_backend", "inductor")
+        monkeypatch.setattr(torch, "compile", lambda model, **kwargs: Broken())
+        suppress = torch._dynamo.config.suppress_errors
+        model = torch.nn.Linear(3, 2)
+        wrapped = compile_for_inference(model, "cuda")
+
+        x = torch.ones(1, 3)
+        torch.testing.assert_close(wrapped(x), model(x))
+        assert wrapped.failed
+        torch.testing.assert_close(wrapped(x), model(x))
+        assert torch._dynamo.config.suppress_errors == suppress
+
+    def test_cpu_model_is_returned_unchanged(self):
+        model = torch.nn.Linear(3, 2)
+        assert compile_for_inference(model, "cpu") is model
+
+
+class TestInputTensor:
+    def test_cpu_window_becomes_float32_batch_of_one(self):
+        window = np.arange(12.0).reshape(4, 3)
+        tensor = input_tensor(window, "cpu")
+        assert tensor.shape == (1, 4, 3)
+        assert tensor.dtype == torch.float32
+        np.testing.assert_array_equal(tensor[0].numpy(), window)
+
+
+class TestScaledWindow:
+    def test_matches_scaler_transform_of_full_history(self):
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(100, 5))
+        for scaler in (MinMaxScaler(), MinMaxScaler(clip=True)):
+            scaler.fit(X[:60])
+            np.testing.assert_array_equal(scaled_window(scaler, X, 30), scaler.transform(X)[-30:])
+
+    def test_short_history_raises(self):
+        scaler = MinMaxScaler().fit(np.zeros((10, 2)))
+        with pytest.raises(ValueError, match="Need at least 20"):
+            scaled_window(scaler, np.zeros((10, 2)), 20)
+
+
+class TestSaveCheckpoint:
+    def test_replaces_file_and_leaves_no_temporaries(self, tmp_path):
+        path = str(tmp_path / "TEST_model.pt")
+        save_checkpoint({"v": 1}, path)
+        save_checkpoint({"v": 2}, path)
+        assert torch.load(path)["v"] == 2
+        assert [p.name for p in tmp_path.iterdir()] == ["TEST_model.pt"]
+
+    def test_failed_save_keeps_previous_checkpoint(self, tmp_path):
+        path = str(tmp_path / "TEST_model.pt")
+        save_checkpoint({"v": 1}, path)
+        with pytest.raises(Exception):
+            save_checkpoint({"v": lambda: None}, path)  # not picklable
+        assert torch.load(path)["v"] == 1
+        assert [p.name for p in tmp_path.iterdir()] == ["TEST_model.pt"]
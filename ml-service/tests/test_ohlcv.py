@@ -0,0 +1,130 @@
+"""Tests for OHLCV input conversion helpers."""
+
+from types import SimpleNamespace
+
+import msgspec
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ohlcv import (
+    OHLCV_COLUMNS,
+    OHLCVBatchBodyDecoder,
+    OHLCVBodyDecoder,
+    ohlcv_array,
+    ohlcv_column,
+    ohlcv_to_frame,
+    synthetic_ohlcv,
+)
+
+
+def decode_ohlcv_body(body):
+    return OHLCVBodyDecoder().decode(body)[1]
+
+
+def _rows():
+    return [
+        {"timestamp": 1_700_086_400_001, "open": 2.0, "high": 2.5, "low": 1.5, "close": 2.2, "volume": 20.0},
+        {"timestamp": 1_700_000_000_000, "open": 1.0, "high": 1.5, "low": 0.5, "close": 1.2, "volume": 10.0},
+    ]
+
+
+class TestOhlcvHelpers:
+    def test_array_keeps_millisecond_timestamps_exact(self):
+        points = [SimpleNamespace(**row) for row in _rows()]
+        arr = ohlcv_array(points)
+        assert arr.shape == (2, len(OHLCV_COLUMNS))
+        assert arr.dtype == np.float64
+        assert int(arr[0, 0]) == 1_700_086_400_001
+
+    def test_frame_matches_list_of_dicts(self):
+        rows = _rows()
+        arr = ohlcv_array([SimpleNamespace(**row) for row in rows])
+        from_dicts = ohlcv_to_frame(rows)
+        from_array = ohlcv_to_frame(arr)
+        pd.testing.assert_frame_equal(from_dicts, from_array, check_dtype=False)
+        assert from_array["timestamp"].is_monotonic_increasing
+
+    def test_frame_of_sorted_input_keeps_row_order(self):
+        rows = list(reversed(_rows()))
+        df = ohlcv_to_frame(ohlcv_array([SimpleNamespace(**row) for row in rows]))
+        assert list(df["close"]) == [1.2, 2.2]
+        assert isinstance(df.index, pd.RangeIndex)
+
+    def test_column_preserves_input_order(self):
+        rows = _rows()
+        arr = ohlcv_array([SimpleNamespace(**row) for row in rows])
+        np.testing.assert_array_equal(ohlcv_column(rows, "close"), [2.2, 1.2])
+        np.testing.assert_array_equal(ohlcv_column(arr, "close"), [2.2, 1.2])
+
+    def test_decode_body_reads_only_data_field(self):
+        body = (
+            b'{"symbol": "AAPL", "epochs": 5, "data": ['
+            b'{"timestamp": 1700000000000, "open": 1, "high": 2, "low": 0.5, "close": "1.5", "volume": 10}]}'
+        )
+        arr = decode_ohlcv_body(body)
+        assert arr.shape == (1, len(OHLCV_COLUMNS))
+        assert arr[0, OHLCV_COLUMNS.index("close")] == 1.5
+
+    def test_decode_body_rejects_missing_fields(self):
+        with pytest.raises(msgspec.DecodeError):
+            decode_ohlcv_body(b'{"data": [{"timestamp": 1}]}')
+
+    def test_decode_batch_body_keeps_request_order(self):
+        candle = b'{"timestamp": 1700000000000, "open": 1, "high": 2, "low": 0.5, "close": %d, "volume": 10}'
+        body = (
+            b'{"requests": [{"symbol": "AAPL", "data": [' + candle % 1 + b", " + candle % 2 + b"]}, "
+            b'{"symbol": "MSFT", "model_type": "lstm", "data": [' + candle % 3 + b"]}]}"
+        )
+        params, arrays = OHLCVBatchBodyDecoder(["symbol", "model_type"]).decode(body)
+        close = OHLCV_COLUMNS.index("close")
+        assert params == {"requests": [{"symbol": "AAPL"}, {"symbol": "MSFT", "model_type": "lstm"}]}
+        assert [a.shape[0] for a in arrays] == [2, 1]
+        assert arrays[0][:, close].tolist() == [1.0, 2.0]
+        assert arrays[1][0, close] == 3.0
+
+    def test_decode_body_accepts_compact_rows(self):
+        body = (
+            b'{"data": [[1700000000001, 1, 2, 0.5, 1.5, 10], '
+            b'{"timestamp": 1700000000002, "open": 2, "high": 3, "low": 1, "close": 2.5, "volume": 20}]}'
+        )
+        arr = decode_ohlcv_body(body)
+        assert arr.shape == (2, len(OHLCV_COLUMNS))
+        assert arr[:, 0].tolist() == [1700000000001, 1700000000002]
+        assert arr[:, OHLCV_COLUMNS.index("close")].tolist() == [1.5, 2.5]
+
+    def test_decode_body_returns_present_scalar_fields(self):
+        body = b'{"symbol": "AAPL", "epochs": 5, "extra": [1, 2], "data": [[1700000000000, 1, 2, 0.5, 1.5, 10]]}'
+        fields, arr = OHLCVBodyDecoder(["symbol", "epochs", "model_type", "data"]).decode(body)
+        assert fields == {"symbol": "AAPL", "epochs": 5}
+        assert arr.shape == (1, len(OHLCV_COLUMNS))
+
+    def test_decode_body_rejects_short_rows(self):
+        with pytest.raises(msgspec.DecodeError):
+            decode_ohlcv_body(b'{"data": [[1700000000000, 1, 2, 0.5, 1.5]]}')
+
+    def test_decode_msgpack_body_accepts_rows_and_packed_data(self):
+        packed = np.array([[1_700_000_000_001, 1, 2, 0.5, 1.5, 10]], dtype="<f8")
+        decoder = OHLCVBatchBodyDecoder(["symbol"])
+        body = msgspec.msgpack.encode({"requests": [
+            {"symbol": "AAPL", "data": [[1_700_000_000_000, 1, 2, 0.5, 1.5, 10]]},
+            {"symbol": "MSFT", "data": packed.tobytes()},
+        ]})
+        params, arrays = decoder.decode(body, msgpack=True)
+        assert params == {"requests": [{"symbol": "AAPL"}, {"symbol": "MSFT"}]}
+        assert arrays[0][0, 0] == 1_700_000_000_000
+        np.testing.assert_array_equal(arrays[1], packed)
+        assert arrays[1].flags.writeable
+
+    def test_decode_rejects_truncated_packed_data(self):
+        body = msgspec.msgpack.encode({"data": np.zeros(7).tobytes()})
+        with pytest.raises(msgspec.DecodeError):
+            OHLCVBodyDecoder().decode(body, msgpack=True)
+
+    def test_synthetic_history_is_deterministic_and_consistent(self):
+        arr = synthetic_ohlcv(120)
+        assert arr.shape == (120, len(OHLCV_COLUMNS))
+        np.testing.assert_array_equal(arr, synthetic_ohlcv(120))
+        _, o, h, l, c, _ = arr.T
+        assert (h >= np.maximum(o, c)).all() and (l <= np.minimum(o, c)).all()
+        assert ohlcv_to_frame(arr)["timestamp"].is_monotonic_increasing
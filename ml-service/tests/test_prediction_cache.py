@@ -0,0 +1,79 @@
+"""Tests for the prediction result cache."""
+
+import gc
+import weakref
+
+import numpy as np
+
+from app import prediction_cache as module
+from app.prediction_cache import PredictionCache
+from app.predictor_cache import PredictorCache
+
+
+class _Predictor:
+    pass
+
+
+def _key(close: float = 1.0, symbol: str = "AAPL"):
+    data = np.array([[1_700_000_000_000, 1.0, 2.0, 0.5, close, 10.0]])
+    return PredictionCache.key(symbol, None, data)
+
+
+class TestPredictionCache:
+    def test_hit_requires_same_candles_and_predictor(self):
+        cache = PredictionCache()
+        predictor = _Predictor()
+        cache.put(_key(), predictor, {"current_price": 1.0})
+        assert cache.get(_key(), predictor) == {"current_price": 1.0}
+        assert cache.get(_key(close=1.5), predictor) is None
+        assert cache.get(_key(symbol="MSFT"), predictor) is None
+        # A retrained model is a new predictor object
+        assert cache.get(_key(), _Predictor()) is None
+        assert len(cache) == 0
+
+    def test_entries_expire(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+        cache = PredictionCache(ttl=60)
+        predictor = _Predictor()
+        cache.put(_key(), predictor, {})
+        now[0] += 60
+        assert cache.get(_key(), predictor) is None
+
+    def test_size_cap_and_zero_ttl(self):
+        cache = PredictionCache(maxsize=2)
+        predictor = _Predictor()
+        for close in (1.0, 2.0, 3.0):
+            cache.put(_key(close), predictor, {})
+        assert cache.get(_key(1.0), predictor) is None
+        assert len(cache) == 2
+
+        disabled = PredictionCache(ttl=0)
+        disabled.put(_key(), predictor, {})
+        assert len(disabled) == 0
+
+    def test_put_purges_expired_entries(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+        cache = PredictionCache(ttl=60)
+        predictor = _Predictor()
+        cache.put(_key(1.0), predictor, {})
+        now[0] += 60
+        cache.put(_key(2.0), predictor, {})
+        assert len(cache) == 1
+
+    def test_evicted_predictor_is_garbage_collected(self):
+        cache = PredictionCache()
+        predictors = PredictorCache(
+            maxsize=1, on_discard=lambda key: cache.discard_symbol(key.rsplit("_", 1)[0])
+        )
+        predictors["AAPL_lstm"] = _Predictor()
+        cache.put(_key(), predictors["AAPL_lstm"], {"current_price": 1.0})
+        cache.put(_key(symbol="MSFT"), _Predictor(), {})
+        ref = weakref.ref(predictors["AAPL_lstm"])
+
+        predictors["TSLA_lstm"] = _Predictor()  # evicts AAPL_lstm
+        gc.collect()
+        assert ref() is None
+        assert cache.get(_key(), None) is None
+        assert [k[0] for k in cache._entries] == ["MSFT"]
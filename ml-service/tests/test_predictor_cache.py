@@ -0,0 +1,162 @@
+"""Tests for the bounded LRU predictor cache."""
+
+import asyncio
+
+import pytest
+
+from app.predictor_cache import PredictorCache
+
+
+class TestPredictorCache:
+    def test_evicts_least_recently_used(self):
+        cache = PredictorCache(maxsize=2)
+        cache["AAPL"] = "a"
+        cache["MSFT"] = "m"
+        _ = cache["AAPL"]  # touch → MSFT becomes LRU
+        cache["TSLA"] = "t"
+        assert "AAPL" in cache
+        assert "TSLA" in cache
+        assert "MSFT" not in cache
+        assert len(cache) == 2
+
+    def test_version_tracks_changes_not_reads(self):
+        cache = PredictorCache(maxsize=1)
+        v0 = cache.version
+        cache["AAPL"] = "a"
+        v1 = cache.version
+        _ = cache["AAPL"]
+        assert cache.version == v1 > v0
+        cache["MSFT"] = "m"  # evicts AAPL
+        v2 = cache.version
+        del cache["MSFT"]
+        assert cache.version > v2 > v1
+
+    def test_on_discard_reports_dropped_keys(self):
+        dropped = []
+        cache = PredictorCache(maxsize=2, on_discard=dropped.append)
+        cache["AAPL_lstm"] = "a"
+        cache["AAPL_lstm"] = "a"  # same object: not a replacement
+        cache["AAPL_lstm"] = "b"
+        cache["MSFT_lstm"] = "m"
+        cache["TSLA_lstm"] = "t"
+        del cache["MSFT_lstm"]
+        assert dropped == ["AAPL_lstm", "AAPL_lstm", "MSFT_lstm"]
+
+    def test_get_returns_default_on_miss(self):
+        cache = PredictorCache(maxsize=2)
+        assert cache.get("NOPE") is None
+        assert cache.get("NOPE", "fallback") == "fallback"
+
+    def test_delete_and_items_snapshot(self):
+        cache = PredictorCache(maxsize=4)
+        cache["AAPL"] = "a"
+        cache["AAPL_transformer"] = "t"
+        for key, _ in cache.items():
+            del cache[key]
+        assert len(cache) == 0
+
+    def test_overwrite_keeps_size(self):
+        cache = PredictorCache(maxsize=2)
+        cache["AAPL"] = "old"
+        cache["AAPL"] = "new"
+        assert len(cache) == 1
+        assert cache["AAPL"] == "new"
+
+    def test_lock_is_shared_per_symbol(self):
+        cache = PredictorCache()
+
+        async def locks():
+            return cache.lock("AAPL"), cache.lock("AAPL"), cache.lock("MSFT")
+
+        a1, a2, m = asyncio.run(locks())
+        assert a1 is a2
+        assert a1 is not m
+
+    def test_inference_lock_is_separate_from_load_lock(self):
+        cache = PredictorCache()
+
+        async def locks():
+            return cache.inference_lock("AAPL"), cache.inference_lock("AAPL"), cache.lock("AAPL")
+
+        i1, i2, load = asyncio.run(locks())
+        assert i1 is i2
+        assert i1 is not load
+
+    def test_unused_locks_are_dropped(self):
+        cache = PredictorCache()
+
+        async def use_locks():
+            for i in range(100):
+                async with cache.lock(f"NOPE{i}"):
+                    async with cache.inference_lock(f"NOPE{i}"):
+                        pass
+            held = cache.lock("AAPL")
+            async with held:
+                assert cache.lock("AAPL") is held
+                assert len(cache._locks) == 1
+
+        asyncio.run(use_locks())
+        assert len(cache._locks) == len(cache._inference_locks) == 0
+
+    def test_rejects_non_positive_maxsize(self):
+        with pytest.raises(ValueError):
+            PredictorCache(maxsize=0)
+
+
+class TestRelease:
+    @pytest.fixture
+    def cuda(self, monkeypatch):
+        import torch
+        state = {"reserved": 0, "allocated": 0, "emptied": 0}
+        monkeypatch.setattr(torch.cuda, "is_initialized", lambda: True)
+        monkeypatch.setattr(torch.cuda, "memory_reserved", lambda: state["reserved"])
+        monkeypatch.setattr(torch.cuda, "memory_allocated", lambda: state["allocated"])
+        monkeypatch.setattr(torch.cuda, "empty_cache",
+                            lambda: state.__setitem__("emptied", state["emptied"] + 1))
+        return state
+
+    def test_small_idle_pool_is_kept(self, cuda):
+        cuda.update(reserved=300 << 20, allocated=200 << 20)
+        cache = PredictorCache(maxsize=1)
+        cache["AAPL"] = "a"
+        cache["MSFT"] = "m"
+        del cache["MSFT"]
+        assert cuda["emptied"] == 0
+
+    def test_large_idle_pool_is_released_on_eviction(self, cuda):
+        cuda.update(reserved=1 << 30, allocated=100 << 20)
+        cache = PredictorCache(maxsize=1)
+        cache["AAPL"] = "a"
+        assert cuda["emptied"] == 0
+        cache["MSFT"] = "m"
+        assert cuda["emptied"] == 1
+
+
+class _Pred:
+    def __init__(self, n_params):
+        import torch
+        self.model = torch.nn.Linear(n_params - 1, 1)  # (n-1) weights + 1 bias
+
+
+class TestByteBudget:
+    def test_evicts_lru_until_under_budget(self):
+        cache = PredictorCache(maxsize=10, max_bytes=250 * 4)
+        cache["A"] = _Pred(100)
+        cache["B"] = _Pred(100)
+        assert cache.nbytes() == 200 * 4
+        cache["C"] = _Pred(100)
+        assert "A" not in cache
+        assert list(cache) == ["B", "C"]
+
+    def test_shared_sub_models_count_once(self):
+        from types import SimpleNamespace
+        cache = PredictorCache(maxsize=10)
+        lstm = _Pred(100)
+        cache["A"] = lstm
+        cache["A_ensemble"] = SimpleNamespace(lstm_predictor=lstm, transformer_predictor=None)
+        assert cache.nbytes() == 100 * 4
+
+    def test_oversized_entry_is_kept(self):
+        cache = PredictorCache(maxsize=10, max_bytes=10)
+        cache["A"] = _Pred(100)
+        assert "A" in cache
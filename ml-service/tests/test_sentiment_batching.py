@@ -0,0 +1,144 @@
+"""Tests for FinBERT micro-batching of concurrent single-text requests."""
+
+import asyncio
+import threading
+
+import torch
+
+from app import sentiment
+
+
+class TestSentimentMicroBatching:
+    def test_concurrent_calls_share_one_batch(self, monkeypatch):
+        calls = []
+
+        def fake_analyze_batch(texts, batch_size=8):
+            calls.append(list(texts))
+            return [f"result:{t}" for t in texts]
+
+        monkeypatch.setattr(sentiment, "analyze_batch", fake_analyze_batch)
+
+        async def run():
+            try:
+                return await asyncio.gather(
+                    *(sentiment.analyze_sentiment_batched(f"headline {i}") for i in range(5))
+                )
+            finally:
+                await sentiment.stop_microbatching()
+
+        results = asyncio.run(run())
+
+        assert results == [f"result:headline {i}" for i in range(5)]
+        assert len(calls) == 1
+        assert len(calls[0]) == 5
+
+    def test_texts_queued_during_a_batch_skip_the_window(self, monkeypatch):
+        calls = []
+        started, release = threading.Event(), threading.Event()
+
+        def fake_analyze_batch(texts, batch_size=8):
+            calls.append(list(texts))
+            started.set()
+            release.wait(5)
+            return list(texts)
+
+        monkeypatch.setattr(sentiment, "analyze_batch", fake_analyze_batch)
+        monkeypatch.setattr(sentiment, "_MICROBATCH_MAX_SIZE", 4)
+        monkeypatch.setattr(sentiment, "_MICROBATCH_MAX_WAIT_S", 30.0)
+
+        async def run():
+            try:
+                first = [asyncio.ensure_future(sentiment.analyze_sentiment_batched(f"a{i}"))
+                         for i in range(4)]
+                await asyncio.to_thread(started.wait, 5)
+                second = [asyncio.ensure_future(sentiment.analyze_sentiment_batched(f"b{i}"))
+                          for i in range(2)]
+                await asyncio.sleep(0.01)
+                release.set()
+                return await asyncio.wait_for(asyncio.gather(*first, *second), 5)
+            finally:
+                await sentiment.stop_microbatching()
+
+        assert asyncio.run(run()) == ["a0", "a1", "a2", "a3", "b0", "b1"]
+        assert calls == [["a0", "a1", "a2", "a3"], ["b0", "b1"]]
+
+    def test_batch_failure_resolves_to_none(self, monkeypatch):
+        def failing_analyze_batch(texts, batch_size=8):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(sentiment, "analyze_batch", failing_analyze_batch)
+
+        async def run():
+            try:
+                return await sentiment.analyze_sentiment_batched("headline")
+            finally:
+                await sentiment.stop_microbatching()
+
+        assert asyncio.run(run()) is None
+
+    def test_shutdown_resolves_in_flight_batch(self, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_analyze_batch(texts, batch_size=8):
+            started.set()
+            release.wait(5)
+            return list(texts)
+
+        monkeypatch.setattr(sentiment, "analyze_batch", blocking_analyze_batch)
+
+        async def run():
+            try:
+                pending = asyncio.ensure_future(sentiment.analyze_sentiment_batched("headline"))
+                await asyncio.to_thread(started.wait, 5)
+                await sentiment.stop_microbatching()
+                return await asyncio.wait_for(pending, 5)
+            finally:
+                release.set()
+
+        assert asyncio.run(run()) is None
+
+    def test_cached_text_skips_queue(self, monkeypatch):
+        calls = []
+
+        def fake_analyze_batch(texts, batch_size=8):
+            calls.append(list(texts))
+            return [None] * len(texts)
+
+        monkeypatch.setattr(sentiment, "analyze_batch", fake_analyze_batch)
+        cached = sentiment.SentimentResult("Cached", "neutral", 0.0, 0.9, {})
+        monkeypatch.setattr(sentiment, "_cache_get", lambda key, text: cached)
+
+        async def run():
+            try:
+                return await sentiment.analyze_sentiment_batched("Cached")
+            finally:
+                await sentiment.stop_microbatching()
+
+        assert asyncio.run(run()) is cached
+        assert calls == []
+
+
+class TestLengthBatches:
+    def test_batches_do_not_straddle_length_buckets(self):
+        lengths = [10, 20, 30, 33, 60, 70, 300, 12]
+        order = sorted(range(len(lengths)), key=lengths.__getitem__)
+        batches = sentiment._length_batches(order, lengths, batch_size=8)
+        assert [[lengths[i] for i in b] for b in batches] == [[10, 12, 20, 30], [33, 60], [70], [300]]
+
+    def test_batches_respect_batch_size(self):
+        lengths = [5] * 5
+        batches = sentiment._length_batches(list(range(5)), lengths, batch_size=2)
+        assert batches == [[0, 1], [2, 3], [4]]
+
+
+class TestCudaGraphCapture:
+    def test_requests_never_capture_graphs(self, monkeypatch):
+        def capture(model, batch_size):
+            raise AssertionError("captured outside preload")
+
+        monkeypatch.setattr(sentiment, "_cuda_graphs_enabled", lambda: True)
+        monkeypatch.setattr(sentiment, "_FinBERTGraph", capture)
+        monkeypatch.setattr(sentiment, "_cuda_graphs", {})
+        inputs = {"input_ids": torch.zeros((3, 16), dtype=torch.long)}
+        assert sentiment._graph_logits(inputs) is None
+        assert sentiment._cuda_graphs == {}
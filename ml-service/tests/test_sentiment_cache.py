@@ -0,0 +1,79 @@
+"""Tests for the FinBERT result cache."""
+
+import numpy as np
+
+from app import sentiment
+
+
+def _fake_uncached(calls):
+    def run(texts, batch_size=8):
+        calls.append(list(texts))
+        return [sentiment._result_from_probs(t, np.array([0.7, 0.1, 0.2])) for t in texts]
+    return run
+
+
+class TestSentimentResultCache:
+    def setup_method(self):
+        sentiment.clear_result_cache()
+
+    def teardown_method(self):
+        sentiment.clear_result_cache()
+
+    def test_batch_runs_only_misses(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(sentiment, "_analyze_batch_uncached", _fake_uncached(calls))
+
+        sentiment.analyze_batch(["Stocks rally", "Bonds slip"])
+        results = sentiment.analyze_batch(["  stocks RALLY ", "Oil jumps", "Oil jumps"])
+
+        assert calls == [["Stocks rally", "Bonds slip"], ["Oil jumps"]]
+        assert [r.text for r in results] == ["  stocks RALLY ", "Oil jumps", "Oil jumps"]
+        assert all(r.sentiment == "positive" for r in results)
+        assert results[1] is not results[2]
+
+    def test_failed_results_are_not_cached(self, monkeypatch):
+        calls = []
+
+        def failing(texts, batch_size=8):
+            calls.append(list(texts))
+            return [None] * len(texts)
+
+        monkeypatch.setattr(sentiment, "_analyze_batch_uncached", failing)
+
+        assert sentiment.analyze_batch(["x"]) == [None]
+        assert sentiment.analyze_batch(["x"]) == [None]
+        assert len(calls) == 2
+
+    def test_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(sentiment, "_RESULT_CACHE_SIZE", 2)
+        monkeypatch.setattr(sentiment, "_analyze_batch_uncached", _fake_uncached([]))
+
+        sentiment.analyze_batch(["a", "b", "c"])
+
+        assert len(sentiment._result_cache) == 2
+
+
+class TestNeutralPrefilter:
+    def test_only_texts_with_polarity_cues_reach_the_model(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(sentiment, "_analyze_batch_uncached", _fake_uncached(calls))
+        monkeypatch.setattr(sentiment.settings, "finbert_neutral_prefilter", True)
+        sentiment.clear_result_cache()
+
+        results = sentiment.analyze_batch(
+            ["Market opens Monday", "Shares rise 3% after earnings", "Board meeting on Thursday"]
+        )
+
+        assert calls == [["Shares rise 3% after earnings"]]
+        assert [r.sentiment for r in results] == ["neutral", "positive", "neutral"]
+        assert results[0].score == 0.0
+
+    def test_disabled_sends_every_miss_to_the_model(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(sentiment, "_analyze_batch_uncached", _fake_uncached(calls))
+        monkeypatch.setattr(sentiment.settings, "finbert_neutral_prefilter", False)
+        sentiment.clear_result_cache()
+
+        sentiment.analyze_batch(["Market opens Monday"])
+
+        assert calls == [["Market opens Monday"]]
@@ -0,0 +1,78 @@
+"""Tests for the NDJSON streaming sentiment endpoint."""
+
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import main, sentiment  # noqa: E402
+from app.main import app  # noqa: E402
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    calls = []
+
+    def fake_analyze_batch(texts, batch_size=8):
+        calls.append(len(texts))
+        return [
+            None if t == "fail" else sentiment._result_from_probs(t, np.array([0.6, 0.3, 0.1]))
+            for t in texts
+        ]
+
+    monkeypatch.setattr(sentiment, "analyze_batch", fake_analyze_batch)
+    return calls
+
+
+def _post(lines):
+    resp = client.post("/api/ml/sentiment/analyze/stream", content=b"\n".join(lines))
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+class TestSentimentStream:
+    def test_results_in_input_order_across_batches(self, batches):
+        lines = [json.dumps({"text": f"t{i}", "id": i}).encode() for i in range(40)]
+        out = _post(lines)
+        assert batches == [32, 8]
+        assert [r["index"] for r in out] == list(range(40))
+        assert [r["id"] for r in out] == list(range(40))
+        assert out[5]["result"]["text"] == "t5"
+        assert out[5]["result"]["sentiment"] == "positive"
+
+    def test_invalid_lines_report_errors_in_place(self, batches):
+        out = _post([b'{"text": "a"}', b"nope", b"", b'{"text": "  "}', b"[1]",
+                     b'{"text": "fail"}', b'{"text": "b"}'])
+        assert [r["index"] for r in out] == list(range(6))
+        assert out[0]["result"]["text"] == "a"
+        assert out[1]["error"].startswith("Invalid JSON")
+        assert out[2]["error"] == "Empty text"
+        assert "text" in out[3]["error"]
+        assert out[4]["error"] == "Analysis failed"
+        assert out[5]["result"]["text"] == "b"
+        assert batches == [3]
+
+    def test_lines_split_across_chunks(self, batches):
+        chunks = [b'{"text": "a"', b'}\n{"te', b'xt": "b"}\n', b'{"text": "c"}']
+        resp = client.post("/api/ml/sentiment/analyze/stream", content=iter(chunks))
+        out = [json.loads(line) for line in resp.text.splitlines()]
+        assert [r["result"]["text"] for r in out] == ["a", "b", "c"]
+
+    def test_overlong_line_is_reported_and_skipped(self, batches, monkeypatch):
+        monkeypatch.setattr(main, "_SENTIMENT_STREAM_MAX_LINE", 32)
+        long_text = json.dumps({"text": "x" * 100}).encode()
+        chunks = [b'{"text": "a"}\n', long_text[:20], long_text[20:60], long_text[60:] + b"\n",
+                  long_text + b'\n{"text": "b"}\n', b"y" * 40]
+        resp = client.post("/api/ml/sentiment/analyze/stream", content=iter(chunks))
+        out = [json.loads(line) for line in resp.text.splitlines()]
+        assert [r["index"] for r in out] == list(range(5))
+        assert out[0]["result"]["text"] == "a"
+        assert out[1]["error"] == out[2]["error"] == out[4]["error"] == "Line exceeds 32 bytes"
+        assert out[3]["result"]["text"] == "b"
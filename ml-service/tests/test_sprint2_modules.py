@@ -214,3 +214,37 @@ class TestConfigNewFields:
         assert s.use_feature_selection is False
         assert s.feature_selection_max_features == 0
         assert s.feature_selection_correlation_threshold == 0.95
+
+
+# ===========================================================================
+# EnsemblePredictor metadata tests
+# ===========================================================================
+
+class _StubPredictor:
+    def __init__(self, val_loss):
+        self.is_trained = True
+        self.model_metadata = {"best_val_loss": val_loss}
+
+
+class TestEnsembleMetadata:
+    def test_weights_follow_inverse_val_loss(self):
+        from app.ensemble_model import EnsemblePredictor
+        ens = EnsemblePredictor("aapl", use_cuda=False)
+        ens.lstm_predictor = _StubPredictor(0.1)
+        ens.transformer_predictor = _StubPredictor(0.3)
+        meta = ens.model_metadata
+        assert meta["symbol"] == "AAPL"
+        assert meta["ensemble_weights"] == {"lstm": 0.75, "transformer": 0.25}
+
+    def test_metadata_rebuilt_when_sub_model_reloads(self):
+        from app.ensemble_model import EnsemblePredictor
+        ens = EnsemblePredictor("AAPL", use_cuda=False)
+        ens.lstm_predictor = _StubPredictor(0.1)
+        first = ens.model_metadata
+        first["symbol"] = "mutated"
+        assert ens.model_metadata["symbol"] == "AAPL"
+
+        ens.transformer_predictor = _StubPredictor(0.1)
+        assert ens.model_metadata["ensemble_weights"] == {"lstm": 0.5, "transformer": 0.5}
+        ens.lstm_predictor.model_metadata = {"best_val_loss": 0.3}
+        assert ens.model_metadata["ensemble_weights"] == {"lstm": 0.25, "transformer": 0.75}
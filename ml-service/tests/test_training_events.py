@@ -0,0 +1,55 @@
+"""Tests for the training-status SSE broker."""
+
+import asyncio
+import threading
+
+from app.training_events import TrainingEventBroker
+
+
+class TestTrainingEventBroker:
+    def test_publish_reaches_subscribers_of_key_only(self):
+        async def run():
+            broker = TrainingEventBroker()
+            aapl = broker.subscribe("AAPL")
+            msft = broker.subscribe("MSFT")
+            status = {"status": "training", "progress": 10}
+            broker.publish("AAPL", status)
+            status["progress"] = 50  # later mutation must not leak into the snapshot
+            return aapl.get_nowait(), msft.empty()
+
+        snapshot, msft_empty = asyncio.run(run())
+        assert snapshot == {"status": "training", "progress": 10}
+        assert msft_empty
+
+    def test_publish_from_worker_thread(self):
+        async def run():
+            broker = TrainingEventBroker()
+            queue = broker.subscribe("AAPL")
+            thread = threading.Thread(
+                target=broker.publish, args=("AAPL", {"status": "completed"})
+            )
+            thread.start()
+            thread.join()
+            return await asyncio.wait_for(queue.get(), 1.0)
+
+        assert asyncio.run(run()) == {"status": "completed"}
+
+    def test_slow_subscriber_keeps_latest(self):
+        async def run():
+            broker = TrainingEventBroker(queue_size=2)
+            queue = broker.subscribe("AAPL")
+            for progress in (10, 20, 30):
+                broker.publish("AAPL", {"progress": progress})
+            return [queue.get_nowait()["progress"] for _ in range(queue.qsize())]
+
+        assert asyncio.run(run()) == [20, 30]
+
+    def test_unsubscribe(self):
+        async def run():
+            broker = TrainingEventBroker()
+            queue = broker.subscribe("AAPL")
+            broker.unsubscribe("AAPL", queue)
+            broker.publish("AAPL", {"status": "training"})
+            return broker.subscriber_count("AAPL"), queue.empty()
+
+        assert asyncio.run(run()) == (0, True)
@@ -0,0 +1,44 @@
+"""Tests for the bounded training status store."""
+
+from app import training_status as module
+from app.training_status import TrainingStatusStore
+
+
+class TestTrainingStatusStore:
+    def test_in_place_updates_are_visible(self):
+        store = TrainingStatusStore()
+        store["AAPL"] = {"status": "training", "progress": 0}
+        store["AAPL"]["progress"] = 50
+        assert store.get("AAPL")["progress"] == 50
+
+    def test_finished_jobs_expire_active_jobs_do_not(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+        store = TrainingStatusStore(ttl=60)
+        store["AAPL"] = {"status": "completed"}
+        store["MSFT"] = {"status": "training"}
+
+        now[0] += 61
+        assert "AAPL" not in store
+        assert store.get("AAPL") is None
+        assert "MSFT" in store
+        assert [key for key, _ in store.items()] == ["MSFT"]
+
+    def test_size_cap_keeps_active_and_newest_finished(self):
+        store = TrainingStatusStore(maxsize=2)
+        store["RUNNING"] = {"status": "training"}
+        for key in ("A", "B", "C"):
+            store[key] = {"status": "failed"}
+        assert [key for key, _ in store.items()] == ["RUNNING", "B", "C"]
+
+    def test_update_merges_in_place_and_restamps(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+        store = TrainingStatusStore(ttl=60)
+        status = store.update("AAPL", {"status": "training", "progress": 0, "model_type": "lstm"})
+        now[0] += 3600
+        assert store.update("AAPL", {"status": "completed", "progress": 100}) is status
+        assert status == {"status": "completed", "progress": 100, "model_type": "lstm"}
+
+        now[0] += 59
+        assert "AAPL" in store
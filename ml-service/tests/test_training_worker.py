@@ -0,0 +1,37 @@
+"""Tests for out-of-process training progress dispatch."""
+
+import queue
+
+from app.training_worker import TrainingProcess
+
+
+class TestTrainingProcess:
+    def test_drain_routes_progress_to_running_jobs_only(self):
+        process = TrainingProcess()
+        seen = []
+        process._callbacks["AAPL_lstm"] = lambda *progress: seen.append(progress)
+        progress = queue.Queue()
+        progress.put(("MSFT_lstm", 1, 10, 0.5, 0.6))  # job already finished
+        progress.put(("AAPL_lstm", 2, 10, 0.4, 0.5))
+        progress.put(None)
+        process._drain(progress)
+        assert seen == [(2, 10, 0.4, 0.5)]
+
+    def test_drain_survives_failing_callback(self):
+        process = TrainingProcess()
+        seen = []
+
+        def fail(*progress):
+            raise RuntimeError("boom")
+
+        process._callbacks["AAPL_lstm"] = fail
+        process._callbacks["MSFT_lstm"] = lambda *progress: seen.append(progress)
+        progress = queue.Queue()
+        progress.put(("AAPL_lstm", 1, 10, 0.5, 0.6))
+        progress.put(("MSFT_lstm", 1, 10, 0.5, 0.6))
+        progress.put(None)
+        process._drain(progress)
+        assert seen == [(1, 10, 0.5, 0.6)]
+
+    def test_shutdown_before_start_is_noop(self):
+        TrainingProcess().shutdown()
@@ -0,0 +1,42 @@
+"""Tests for the /warrant/chain endpoint built on the vectorized grid pricer."""
+
+import pytest
+
+pytest.importorskip("qdrant_client")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.warrant_pricing import price_warrant  # noqa: E402
+
+client = TestClient(app)
+
+
+class TestWarrantChain:
+    def test_rows_match_scalar_pricing(self):
+        body = {"underlying_price": 101.3, "volatility": 0.3, "strikes": [90, 100, 110],
+                "expiry_days": [30, 90]}
+        resp = client.post("/warrant/chain", json=body)
+        assert resp.status_code == 200
+        data = resp.json()
+
+        cells = [(d, K) for d in [30, 90] for K in [90, 100, 110]]
+        for side, option_type in (("calls", "call"), ("puts", "put")):
+            rows = data[side]
+            assert [(r["days"], r["strike"]) for r in rows] == cells
+            for row in rows:
+                ref = price_warrant(101.3, row["strike"], row["days"], 0.3, 0.03, option_type, 0.1)
+                assert row["price"] == pytest.approx(ref.warrant_price, abs=1e-4)
+                assert row["delta"] == pytest.approx(ref.greeks.delta, abs=2e-6)
+                assert row["moneyness"] == ref.moneyness
+
+    def test_columnar_is_transposed_rows(self):
+        body = {"underlying_price": 42.0}
+        rows = client.post("/warrant/chain", json=body).json()["calls"]
+        columns = client.post("/warrant/chain?format=columnar", json=body).json()["calls"]
+        assert [dict(zip(columns, values)) for values in zip(*columns.values())] == rows
+
+    def test_auto_strikes_around_price(self):
+        data = client.post("/warrant/chain", json={"underlying_price": 3.2}).json()
+        assert data["strikes"] == [k for k in (3.0 + i * 0.5 for i in range(-8, 9)) if k > 0]
+        assert data["expiry_days"] == [14, 30, 60, 90, 180, 365]
@@ -0,0 +1,78 @@
+"""Tests for the vectorized warrant grid pricer and implied volatility."""
+
+import numpy as np
+import pytest
+
+from app.warrant_pricing import (
+    black_scholes_price,
+    default_strikes,
+    implied_volatility,
+    price_warrant,
+    price_warrant_grid,
+    price_warrant_grids,
+)
+
+
+class TestPriceWarrantGrid:
+    """The grid pricer must agree with the scalar price_warrant per cell."""
+
+    @pytest.mark.parametrize("option_type", ["call", "put"])
+    def test_matches_scalar_pricing(self, option_type):
+        S, sigma, r, ratio = 123.4, 0.35, 0.03, 0.1
+        strikes = [80.0, 100.0, 120.0, 125.0, 150.0, 200.0]
+        days = [0, 14, 90, 365]
+
+        grid = price_warrant_grid(S, strikes, days, sigma, r, option_type, ratio)
+
+        for i, d in enumerate(days):
+            for j, K in enumerate(strikes):
+                ref = price_warrant(S, K, d, sigma, r, option_type, ratio)
+                assert grid["moneyness"][i, j] == ref.moneyness
+                assert grid["warrant_price"][i, j] == pytest.approx(ref.warrant_price, abs=1e-4)
+                assert grid["intrinsic_value"][i, j] == pytest.approx(ref.intrinsic_value, abs=1e-4)
+                assert grid["time_value"][i, j] == pytest.approx(ref.time_value, abs=1e-4)
+                assert grid["delta"][i, j] == pytest.approx(ref.greeks.delta, abs=2e-6)
+                assert grid["gamma"][i, j] == pytest.approx(ref.greeks.gamma, abs=2e-6)
+                assert grid["theta"][i, j] == pytest.approx(ref.greeks.theta, abs=2e-6)
+                assert grid["vega"][i, j] == pytest.approx(ref.greeks.vega, abs=2e-6)
+                assert grid["leverage_ratio"][i, j] == pytest.approx(ref.leverage_ratio, abs=1e-2)
+                assert grid["break_even"][i, j] == pytest.approx(ref.break_even, abs=1e-4)
+
+    def test_grid_shape_is_days_by_strikes(self):
+        grid = price_warrant_grid(50.0, [40.0, 50.0, 60.0], [30, 60])
+        assert grid["warrant_price"].shape == (2, 3)
+
+    def test_combined_grids_match_single_side(self):
+        args = (101.3, [90.0, 100.0, 110.0], [0, 30, 90], 0.3, 0.03)
+        grids = price_warrant_grids(*args, ratio=0.1)
+        assert set(grids) == {"call", "put"}
+        for option_type, grid in grids.items():
+            single = price_warrant_grid(*args, option_type, 0.1)
+            for name, values in single.items():
+                np.testing.assert_array_equal(grid[name], values)
+
+
+class TestDefaultStrikes:
+    @pytest.mark.parametrize("S, step", [(3.2, 0.5), (10, 2), (72.5, 5), (101.3, 10), (500, 25)])
+    def test_seventeen_strikes_around_atm(self, S, step):
+        strikes = default_strikes(S)
+        center = round(S / step) * step
+        assert strikes == [round(center + i * step, 2) for i in range(-8, 9) if center + i * step > 0]
+
+    def test_drops_non_positive_strikes(self):
+        strikes = default_strikes(1.2)
+        assert min(strikes) > 0
+        assert len(strikes) < 17
+
+
+class TestImpliedVolatility:
+    @pytest.mark.parametrize("option_type", ["call", "put"])
+    @pytest.mark.parametrize("K,T,sigma", [(80.0, 0.25, 0.3), (100.0, 1.0, 0.8), (130.0, 0.5, 0.2)])
+    def test_recovers_pricing_volatility(self, option_type, K, T, sigma):
+        price = black_scholes_price(100.0, K, T, 0.03, sigma, option_type)
+        assert implied_volatility(price, 100.0, K, T, 0.03, option_type) == pytest.approx(sigma, abs=1e-4)
+
+    def test_invalid_inputs_return_none(self):
+        assert implied_volatility(0.0, 100.0, 100.0, 1.0, 0.03) is None
+        assert implied_volatility(5.0, 100.0, 100.0, 0.0, 0.03) is None
+        assert implied_volatility(5.0, 0.0, 100.0, 1.0, 0.03) is None